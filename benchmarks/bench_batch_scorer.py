@@ -0,0 +1,87 @@
+"""Benchmark BatchScorer against select_relevant_chunks run document by document.
+
+The script chunks a corpus of job descriptions, checks that the k best chunks
+``BatchScorer.top_k`` selects for every document are the ones the sequential
+``select_relevant_chunks`` keeps, then times both: the first scoring (which
+builds the chunk x keyword matrix) and rescoring with other category weights,
+where the sequential loop has to scan every chunk again.
+
+Usage:
+    PYTHONPATH=src:benchmarks python benchmarks/bench_batch_scorer.py --jds 100 500 2000 --k 5
+"""
+
+import argparse
+import time
+
+from corpus import CorpusGenerator
+from interview_prep.job_descripition import job_parser
+from interview_prep.job_descripition.batch_scorer import BatchScorer
+from interview_prep.job_descripition.job_parser import KEYWORD_WEIGHTS, JobDescriptionParser
+from interview_prep.schemas.cv_schema import Document
+from interview_prep.utils.text_tools import normalize_text
+
+
+RESCORE_WEIGHTS = {"requirement": 1, "task": 2, "skill": 8, "exclude": -2}
+
+
+def sequential_top_k(parser: JobDescriptionParser, documents: list, k: int) -> list:
+    return [(d, item["chunk"].id, item["score"])
+            for d, chunks in enumerate(documents)
+            for item in parser.select_relevant_chunks(chunks)[:k]]
+
+
+def batch_top_k(scorer: BatchScorer, k: int, weights: dict) -> list:
+    doc_index, chunk_index, scores = scorer.top_k(k, weights)
+    return list(zip(doc_index.tolist(), chunk_index.tolist(), scores.tolist()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jds", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--max-chunk-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    jd_parser = JobDescriptionParser()
+    for count in args.jds:
+        documents = []
+        for i, text in enumerate(CorpusGenerator(args.seed).job_descriptions(count)):
+            document = Document(category="Job Description", raw_text=text, normalized_text=normalize_text(text),
+                                source=f"jd_{i}")
+            documents.append(jd_parser.chunk_description(document, max_chunk_size=args.max_chunk_size))
+        num_chunks = sum(len(chunks) for chunks in documents)
+
+        start = time.perf_counter()
+        expected = sequential_top_k(jd_parser, documents, args.k)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scorer = BatchScorer(documents)
+        actual = batch_top_k(scorer, args.k, KEYWORD_WEIGHTS)
+        batch = time.perf_counter() - start
+        if actual != expected:
+            raise AssertionError(f"top_k differs from select_relevant_chunks with {count} job descriptions")
+
+        # the sequential loop scores with the module weights, so rescoring swaps them
+        original_weights = dict(job_parser.KEYWORD_WEIGHTS)
+        job_parser.KEYWORD_WEIGHTS.update(RESCORE_WEIGHTS)
+        try:
+            start = time.perf_counter()
+            expected = sequential_top_k(jd_parser, documents, args.k)
+            sequential_rescore = time.perf_counter() - start
+        finally:
+            job_parser.KEYWORD_WEIGHTS.update(original_weights)
+        start = time.perf_counter()
+        actual = batch_top_k(scorer, args.k, RESCORE_WEIGHTS)
+        batch_rescore = time.perf_counter() - start
+        if actual != expected:
+            raise AssertionError(f"Rescored top_k differs from select_relevant_chunks with {count} job descriptions")
+
+        print(f"{count:5d} job descriptions ({num_chunks:6d} chunks) | "
+              f"first scoring: sequential {sequential * 1000:8.1f} ms, batch {batch * 1000:8.1f} ms | "
+              f"rescoring: sequential {sequential_rescore * 1000:8.1f} ms, batch {batch_rescore * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark the BM25Index over many CVs against scoring every CV chunk.
+
+The script chunks generated CVs, indexes them and queries the index with the
+best chunks of generated job descriptions. It checks that the index ranks the
+chunks like a brute-force BM25 over all the chunks, then times the indexing
+and the queries against the brute-force scan as the candidate pool grows.
+tests/test_bm25_index.py checks the scores exhaustively, also after CVs are
+removed and added back. The generated CVs use a vocabulary of about a hundred
+words, so every posting list is long: real CVs query faster.
+
+Usage:
+    PYTHONPATH=src:benchmarks python benchmarks/bench_bm25.py --cvs 250 1000 2000 --jds 20
+"""
+
+import argparse
+import math
+import time
+from collections import Counter
+
+import numpy as np
+
+from corpus import CorpusGenerator
+from interview_prep.CV.chunker import CVChunker
+from interview_prep.job_descripition.job_parser import JobDescriptionParser
+from interview_prep.retrieval.bm25_index import BM25Index, tokenize
+from interview_prep.schemas.cv_schema import Document
+from interview_prep.utils.text_tools import normalize_text
+
+
+class BruteForce:
+    """BM25 computed chunk by chunk, from the term counts of every chunk."""
+
+    def __init__(self, documents: list):
+        self.counts = [(source, chunk, Counter(tokenize(chunk.text))) for source, chunk in documents]
+        self.lengths = [sum(terms.values()) for _, _, terms in self.counts]
+        self.frequencies = Counter(term for _, _, terms in self.counts for term in terms)
+
+    def search(self, query: str, k: int, k1: float = 1.2, b: float = 0.75) -> list:
+        """Top ``k`` (score, source, chunk_id)."""
+        counts, lengths, frequencies = self.counts, self.lengths, self.frequencies
+        average = sum(lengths) / len(lengths)
+        query_terms = Counter(tokenize(query)).items()
+        results = []
+        for (source, chunk, terms), length in zip(counts, lengths):
+            score = 0.0
+            for term, query_frequency in query_terms:
+                if term in terms:
+                    idf = math.log(1 + (len(counts) - frequencies[term] + 0.5) / (frequencies[term] + 0.5))
+                    score += query_frequency * idf * terms[term] * (k1 + 1) / (
+                        terms[term] + k1 * (1 - b + b * length / average))
+            if score > 0:
+                results.append((score, source, chunk.chunk_id))
+        results.sort(key=lambda result: -result[0])
+        return results[:k]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cvs", type=int, nargs="+", default=[250, 1000, 2000])
+    parser.add_argument("--jds", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=10, help="Job description chunks queried per job description")
+    parser.add_argument("-k", type=int, default=5, help="CV chunks returned per query")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generator = CorpusGenerator(args.seed)
+    jd_parser = JobDescriptionParser()
+    scored = []
+    for i, text in enumerate(generator.job_descriptions(args.jds)):
+        _, scored_chunks = jd_parser.process(Document(category="Job Description", raw_text=text,
+                                                      normalized_text=normalize_text(text), source=f"jd_{i}"))
+        scored.append(scored_chunks)
+    queries = [item["chunk"].text for scored_chunks in scored for item in scored_chunks[:args.top_k]]
+
+    chunker = CVChunker()
+    cvs = []
+    for count in args.cvs:
+        while len(cvs) < count:
+            text = generator.cv_text()
+            document = Document(category="CV", raw_text=text, normalized_text=normalize_text(text),
+                                source=f"cv_{len(cvs)}")
+            cvs.append((document.source, chunker.chunk_sections(chunker._retrieve_sections(document))))
+        pool = cvs[:count]
+        documents = [(source, chunk) for source, chunks in pool for chunk in chunks]
+
+        index = BM25Index()
+        start = time.perf_counter()
+        for source, chunks in pool:
+            index.add(source, chunks)
+        indexing = time.perf_counter() - start
+
+        brute_force = BruteForce(documents)
+        for query in queries[:5]:
+            expected = brute_force.search(query, args.k)
+            actual = [(result["score"], result["source"], result["chunk"].chunk_id)
+                      for result in index.search(query, k=args.k)]
+            if [key for _, *key in actual] != [key for _, *key in expected] \
+                    or not np.allclose([s for s, *_ in actual], [s for s, *_ in expected]):
+                raise AssertionError(f"Index results differ from brute force: {actual} != {expected}")
+
+        start = time.perf_counter()
+        for scored_chunks in scored:
+            index.evidence(scored_chunks, top_k=args.top_k, k=args.k)
+        indexed = (time.perf_counter() - start) / len(queries)
+        start = time.perf_counter()
+        for query in queries[:5]:
+            brute_force.search(query, args.k)
+        scan = (time.perf_counter() - start) / 5
+
+        print(f"{count:5d} CVs ({len(documents):6d} chunks) | index {indexing / count * 1000:5.2f} ms/CV | "
+              f"query {indexed * 1000:6.2f} ms | brute force {scan * 1000:8.1f} ms | x{scan / indexed:.0f}")
+
+
+if __name__ == "__main__":
+    main()
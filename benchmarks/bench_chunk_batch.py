@@ -0,0 +1,75 @@
+"""Compare lists of pydantic chunks with the columnar ChunkBatch.
+
+Measures build time and the memory retained by the result of
+``CVChunker.chunk_sections`` versus ``CVChunker.chunk_sections_batch`` on a
+synthetic corpus of CV sections.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_chunk_batch.py --lines 200000
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from interview_prep.CV.chunker import CVChunker
+
+
+LINES = ["- Deployed enterprise chatbot using Docker containerisation on Azure",
+         "• Built data pipelines in Python and SQL for the analytics team",
+         "Technical University of Munich",
+         "Munich, Germany",
+         "Languages: Python, C++, SQL",
+         "October 2021 - October 2024"]
+
+
+def synthetic_sections(num_lines: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    sections = []
+    line_number = 0
+    while line_number < num_lines:
+        size = rng.randint(5, 40)
+        content = [rng.choice(LINES) for _ in range(size)]
+        sections.append({"section": rng.choice(["Education", "Experience", "Projects", "Skills"]),
+                         "content": content,
+                         "lines": list(range(line_number, line_number + size)),
+                         "id": len(sections)})
+        line_number += size
+    return sections
+
+
+def measure(func, sections: list[dict]) -> tuple[float, int, object]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(sections)
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, retained, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000, help="Number of CV lines to chunk")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sections = synthetic_sections(args.lines, args.seed)
+    chunker = CVChunker()
+
+    models_time, models_memory, models = measure(chunker.chunk_sections, sections)
+    batch_time, batch_memory, batch = measure(chunker.chunk_sections_batch, sections)
+    if batch.to_records() != [chunk.model_dump() for chunk in models]:
+        raise AssertionError("ChunkBatch differs from chunk_sections")
+
+    print(f"{len(models)} chunks")
+    print(f"models: build {models_time * 1000:8.1f} ms | retained {models_memory / 2**20:7.1f} MiB")
+    print(f"batch:  build {batch_time * 1000:8.1f} ms | retained {batch_memory / 2**20:7.1f} MiB")
+    print(f"speed-up x{models_time / batch_time:.1f} | memory x{models_memory / batch_memory:.1f} smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark near-duplicate detection with MinHash/LSH against exact pairwise Jaccard.
+
+The script reposts a fraction of the job descriptions with a few words edited,
+checks that the index finds the original of every repost, that distinct
+postings are not merged, and how close the MinHash estimate is to the exact
+shingle Jaccard similarity. It then times the LSH lookups against comparing
+every posting with all the earlier ones while the corpus grows.
+
+Usage:
+    PYTHONPATH=src:benchmarks python benchmarks/bench_dedup.py --jds 250 500 1000 --reposts 0.2
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from corpus import CorpusGenerator
+from interview_prep.job_descripition.dedup import NearDuplicateIndex
+from interview_prep.utils.text_tools import normalize_text
+
+
+def exact_shingles(text: str, size: int) -> set:
+    words = text.casefold().split()
+    return {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+def repost(text: str, edits: int, rng: random.Random) -> str:
+    words = text.split(" ")
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(["Remote", "Hybrid", "urgent", "(m/f/d)", "2026"])
+    return " ".join(words)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jds", type=int, nargs="+", default=[250, 500, 1000])
+    parser.add_argument("--reposts", type=float, default=0.2, help="Fraction of postings reposted with edits")
+    parser.add_argument("--edits", type=int, default=3, help="Words edited in a repost")
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for count in args.jds:
+        rng = random.Random(args.seed)
+        originals = [normalize_text(text) for text in CorpusGenerator(args.seed).job_descriptions(count)]
+        documents = [(f"jd_{i}", text) for i, text in enumerate(originals)]
+        for i in rng.sample(range(count), int(count * args.reposts)):
+            documents.append((f"jd_{i}_repost", repost(originals[i], args.edits, rng)))
+        rng.shuffle(documents)
+
+        index = NearDuplicateIndex(threshold=args.threshold)
+        start = time.perf_counter()
+        matches = {key: index.add(key, text) for key, text in documents}
+        lsh = time.perf_counter() - start
+
+        # a repost may come first, then the original is its duplicate
+        found = 0
+        for key, match in matches.items():
+            if match is None:
+                continue
+            if key.split("_repost")[0] != match[0].split("_repost")[0]:
+                raise AssertionError(f"{key} wrongly matched {match[0]}")
+            found += 1
+        expected = len(documents) - count
+        if found < expected * 0.98:
+            raise AssertionError(f"Only {found} of {expected} reposts found")
+
+        shingle_sets = [exact_shingles(text, index.shingle_size) for _, text in documents]
+        start = time.perf_counter()
+        canonical = []
+        for i, shingles in enumerate(shingle_sets):
+            if not any(jaccard(shingles, shingle_sets[j]) >= args.threshold for j in canonical):
+                canonical.append(i)
+        pairwise = time.perf_counter() - start
+
+        # estimate error on the pairs that matter, a repost and its original
+        errors = []
+        for key, text in documents:
+            if key.endswith("_repost"):
+                original = originals[int(key.split("_")[1])]
+                estimate = np.mean(index.signature(text) == index.signature(original))
+                errors.append(estimate - jaccard(exact_shingles(text, index.shingle_size),
+                                                 exact_shingles(original, index.shingle_size)))
+
+        print(f"{len(documents):5d} postings | {found}/{expected} reposts found | "
+              f"LSH ({index.bands} bands x {index.rows} rows) {lsh / len(documents) * 1e6:7.1f} us/posting | "
+              f"pairwise {pairwise / len(documents) * 1e6:9.1f} us/posting | "
+              f"estimate error mean {np.mean(errors):+.3f} sd {np.std(errors):.3f}")
+
+
+if __name__ == "__main__":
+    main()
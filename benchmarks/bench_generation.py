@@ -0,0 +1,81 @@
+"""Benchmark the QuestionGenerator against sequential, uncached model calls.
+
+Uses the offline ``StubModel`` with a simulated round trip latency. The script
+checks that batched, concurrent and cached generation returns the questions
+the sequential calls return, then times a cold run (empty response cache) and
+a warm one.
+
+Usage:
+    PYTHONPATH=src:benchmarks python benchmarks/bench_generation.py --jds 5 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from corpus import CorpusGenerator
+from interview_prep.CV.chunker import CVChunker
+from interview_prep.generation.models import StubModel
+from interview_prep.generation.question_generator import QuestionGenerator, parse_questions
+from interview_prep.generation.response_cache import ResponseCache
+from interview_prep.job_descripition.job_parser import JobDescriptionParser
+from interview_prep.schemas.cv_schema import Document
+from interview_prep.utils.text_tools import normalize_text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jds", type=int, default=5)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per model call")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--fail-every", type=int, default=7, help="Make every n-th call fail, 0 never")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generator = CorpusGenerator(args.seed)
+    cv_text = generator.cv_text()
+    cv_document = Document(category="CV", raw_text=cv_text, normalized_text=normalize_text(cv_text), source="cv")
+    chunker = CVChunker()
+    cv_chunks = chunker.chunk_sections(chunker._retrieve_sections(cv_document))
+
+    jd_parser = JobDescriptionParser()
+    scored = []
+    for i, text in enumerate(generator.job_descriptions(args.jds)):
+        _, scored_chunks = jd_parser.process(Document(category="Job Description", raw_text=text,
+                                                      normalized_text=normalize_text(text), source=f"jd_{i}"))
+        scored.append(scored_chunks)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model = StubModel(latency=args.latency)
+        sequential = QuestionGenerator(model, use_cache=False)
+        requests = [request for items in scored for request in sequential.build_requests(items, cv_chunks, args.top_k)]
+
+        async def run_sequential():
+            return [parse_questions(await model.complete(request["prompt"])) for request in requests]
+
+        start = time.perf_counter()
+        expected = asyncio.run(run_sequential())
+        reference = time.perf_counter() - start
+
+        flaky = StubModel(latency=args.latency, fail_every=args.fail_every)
+        questions = QuestionGenerator(flaky, cache=ResponseCache(tmp_dir), max_concurrency=args.concurrency,
+                                      batch_size=args.batch_size, backoff=args.latency)
+        timings = []
+        for _ in range(2):
+            start = time.perf_counter()
+            records = [record for items in scored for record in questions.generate(items, cv_chunks, args.top_k)]
+            timings.append(time.perf_counter() - start)
+            actual = [record.get("questions") for record in records]
+            if actual != expected:
+                raise AssertionError("Generated questions differ from the sequential calls")
+
+    print(f"{len(requests)} prompts | sequential {reference:6.2f} s ({len(requests)} calls) | "
+          f"generator cold {timings[0]:6.2f} s ({flaky.calls} calls, x{reference / timings[0]:.1f}) | "
+          f"warm {timings[1] * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
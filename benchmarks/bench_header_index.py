@@ -0,0 +1,75 @@
+"""Benchmark the HeaderIndex against the original per-line header list scans.
+
+The script checks that every line the original CV header test accepts is
+still a header and reports the extra variants the index accepts, then times
+both approaches while the header vocabulary grows.
+
+Usage:
+    PYTHONPATH=src:benchmarks python benchmarks/bench_header_index.py --cvs 200
+"""
+
+import argparse
+import random
+import string
+import time
+
+from constants import CV_SECTION_HEADERS
+from corpus import CorpusGenerator
+from interview_prep.utils.header_index import HeaderIndex
+from interview_prep.utils.text_tools import normalize_text
+
+
+def reference_is_header(line: str, headers: list) -> bool:
+    """The original test: a lowercased header list rebuilt for every line."""
+    return line.strip().lower() in [x.lower() for x in headers]
+
+
+def synthetic_headers(count: int, rng: random.Random) -> list[str]:
+    return [" ".join("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))).capitalize()
+                     for _ in range(rng.randint(1, 3)))
+            for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cvs", type=int, default=200)
+    parser.add_argument("--vocab-sizes", type=int, nargs="+", default=[0, 100, 1000, 10000],
+                        help="Number of synthetic headers added to CV_SECTION_HEADERS")
+    parser.add_argument("--reference-lines", type=int, default=5000,
+                        help="Lines timed with the reference test, it is quadratic")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    lines = ["WORK EXPERIENCE:", "Education.", "— Skills —", "Experiance"]
+    lines += [line for text in CorpusGenerator(args.seed).cv_texts(args.cvs)
+              for line in normalize_text(text).split("\n")]
+
+    for extra in args.vocab_sizes:
+        headers = list(CV_SECTION_HEADERS) + synthetic_headers(extra, rng)
+
+        start = time.perf_counter()
+        index = HeaderIndex(headers)
+        build = time.perf_counter() - start
+
+        sample = lines[:args.reference_lines]
+        start = time.perf_counter()
+        expected = [reference_is_header(line, headers) for line in sample]
+        reference = (time.perf_counter() - start) / len(sample)
+
+        start = time.perf_counter()
+        actual = [line in index for line in lines]
+        indexed = (time.perf_counter() - start) / len(lines)
+
+        missed = [line for line, old, new in zip(sample, expected, actual) if old and not new]
+        if missed:
+            raise AssertionError(f"Headers missed with {extra} extra headers: {missed[:5]}")
+        variants = sorted({line for line, old, new in zip(sample, expected, actual) if new and not old})
+
+        print(f"vocabulary {len(headers):6d}: build {build * 1000:7.1f} ms | "
+              f"list scans {reference * 1e6:8.2f} us/line | index {indexed * 1e6:6.2f} us/line | "
+              f"speed-up x{reference / indexed:.1f} | variants {variants[:4]}")
+
+
+if __name__ == "__main__":
+    main()
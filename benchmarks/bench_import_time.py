@@ -0,0 +1,81 @@
+"""Check the import time of the CLI and the chunkers against a budget.
+
+Each scenario runs in a fresh interpreter with ``python -X importtime``; the
+cumulative time of the imports made by the scenario (interpreter startup
+excluded) must stay under its budget, and none of the heavy backends may be
+loaded. Exits with code 1 when a budget is exceeded.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_import_time.py
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+HEAVY_MODULES = ["pymupdf", "numpy", "scipy", "pydantic", "llama_index", "torch", "transformers",
+                 "sentence_transformers", "spacy", "langchain", "fastapi", "streamlit"]
+
+# name -> (code to run, budget in milliseconds, heavy modules allowed)
+SCENARIOS = {
+    "cli --help": ("import sys; sys.argv = ['interview-prep', '--help']\n"
+                   "from interview_prep import main\n"
+                   "try:\n    main()\nexcept SystemExit:\n    pass",
+                   50, []),
+    "import interview_prep.CV": ("import interview_prep.CV", 30, []),
+    "import CVChunker": ("from interview_prep.CV.chunker import CVChunker", 60, []),
+    "import JobDescriptionParser": ("from interview_prep.job_descripition.job_parser import JobDescriptionParser",
+                                    60, []),
+}
+
+MARKER = "-- scenario start --"
+
+
+def run_scenario(code: str) -> tuple[float, list[str]]:
+    """Return the import time (ms) of a code snippet and the heavy modules it loaded."""
+    script = (f"import sys\nsys.stderr.write({MARKER!r} + '\\n')\n{code}\n"
+              f"import json\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                            capture_output=True, text=True, env=os.environ.copy(), check=True)
+
+    total_us = 0
+    started = False
+    for line in result.stderr.splitlines():
+        if line == MARKER:
+            started = True
+            continue
+        if not started or not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            # only top level imports, nested ones are included in their parent's cumulative time
+            total_us += int(cumulative)
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return total_us / 1000, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per scenario, the best one is kept")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, e.g. on slow machines")
+    args = parser.parse_args()
+
+    failures = []
+    for name, (code, budget_ms, allowed) in SCENARIOS.items():
+        runs = [run_scenario(code) for _ in range(args.repeat)]
+        elapsed = min(ms for ms, _ in runs)
+        loaded = [module for module in runs[0][1] if module not in allowed]
+        budget = budget_ms * args.scale
+        status = "ok" if elapsed <= budget and not loaded else "FAIL"
+        print(f"{status:4s} {name:30s} {elapsed:7.1f} ms (budget {budget:.0f} ms)"
+              + (f" loaded {', '.join(loaded)}" if loaded else ""))
+        if status != "ok":
+            failures.append(name)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
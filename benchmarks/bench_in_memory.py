@@ -0,0 +1,87 @@
+"""Benchmark in-memory ingestion against writing every upload to a temporary file.
+
+The service used to write each uploaded CV PDF and job description text to a
+temporary directory and parse it from there. The script checks that
+``CVReader.read_cv_bytes`` and ``JobDescriptionParser.parse_text`` give the
+records the temporary file route gave, then times both routes per document.
+Both read through the service's extraction cache, kept in a temporary data
+directory: after the first pass every PDF is a cache hit, so the timings
+compare what a request costs around the parsing itself.
+
+Usage:
+    PYTHONPATH=src:benchmarks python benchmarks/bench_in_memory.py --pdfs 20 --jds 200
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from config import config
+from corpus import CorpusGenerator
+from interview_prep.api import workers
+from interview_prep.CV.cv_reader import CVReader
+from interview_prep.job_descripition.job_parser import JobDescriptionParser
+from interview_prep.pipeline import cv_record, job_description_record
+
+
+def parse_cv_from_temp_file(pdf_bytes: bytes, filename: str) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = Path(tmp_dir) / "upload.pdf"
+        pdf_path.write_bytes(pdf_bytes)
+        document = CVReader().read_cv(str(pdf_path))
+    document.source = filename
+    return cv_record(document)
+
+
+def parse_job_description_from_temp_file(text: str, source: str, max_chunk_size: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        text_path = Path(tmp_dir) / "job_description.txt"
+        text_path.write_text(text)
+        document = JobDescriptionParser().parse_description(str(text_path))
+    document.source = source
+    return job_description_record(document, max_chunk_size=max_chunk_size)
+
+
+def best_of(func, items: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in items:
+            func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdfs", type=int, default=20)
+    parser.add_argument("--jds", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generator = CorpusGenerator(args.seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config.data_dir = Path(tmp_dir)
+        pdfs = [(generator.cv_pdf(Path(tmp_dir) / f"cv_{i}.pdf").read_bytes(), f"cv_{i}.pdf")
+                for i in range(args.pdfs)]
+        jds = [(text, f"jd_{i}", 500) for i, text in enumerate(generator.job_descriptions(args.jds))]
+
+        cases = {
+            "CV": (pdfs, parse_cv_from_temp_file, workers.parse_cv),
+            "job description": (jds, parse_job_description_from_temp_file, workers.parse_job_description),
+        }
+        workers.warm_up()
+        for name, (items, temp_file, in_memory) in cases.items():
+            for item in items:
+                if in_memory(*item) != temp_file(*item):
+                    raise AssertionError(f"In-memory {name} record of {item[1]} differs from the temporary file one")
+            before = best_of(temp_file, items, args.repeat)
+            after = best_of(in_memory, items, args.repeat)
+            print(f"{name:16s} temporary file {before * 1000:7.2f} ms | in memory {after * 1000:7.2f} ms | "
+                  f"x{before / after:.2f}")
+
+
+if __name__ == "__main__":
+    main()
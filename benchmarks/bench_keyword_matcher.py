@@ -0,0 +1,127 @@
+"""Benchmark the Aho-Corasick KeywordMatcher against per-keyword substring scans.
+
+The script checks that both matcher strategies (the automaton and one
+``in`` test per keyword) reproduce the scores of the original
+``select_relevant_chunks`` loop and report the same hits, then times them
+against that loop while the skill vocabulary grows. The default strategy
+switches at ``AUTOMATON_MIN_KEYWORDS``.
+
+It first times the default matcher against the original loop on the default
+vocabulary alone, over prose chunks with a few keywords and over chunks made of
+keywords, where the matcher also pays for collecting every position.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_keyword_matcher.py --chunks 2000
+"""
+
+import argparse
+import random
+import string
+import time
+
+from interview_prep.job_descripition.job_parser import KEYWORD_CATEGORIES, KEYWORD_WEIGHTS
+from interview_prep.utils.keyword_matcher import KeywordMatcher
+
+
+FILLER = ["the", "team", "will", "with", "our", "data", "we", "you", "and", "digital",
+          "javascript", "deployment", "modelling", "teamwork", "leadership"]
+PROSE = ["the", "of", "and", "to", "in", "we", "our", "you", "will", "for", "with", "on", "as", "are",
+         "be", "this", "that", "at", "by", "from", "about", "people", "work", "new", "role", "join"]
+
+
+def reference_score(text: str, vocabularies: dict, weights: dict) -> int:
+    """The original scoring: one substring scan per keyword."""
+    score = 0
+    text_lower = text.lower()
+    for category, keywords in vocabularies.items():
+        for keyword in keywords:
+            if keyword.lower() in text_lower:
+                score += weights[category]
+    return score
+
+
+def prose_chunks(count: int, vocabularies: dict, rng: random.Random) -> list[str]:
+    keywords = [kw for keywords in vocabularies.values() for kw in keywords]
+    chunks = []
+    for _ in range(count):
+        words = [rng.choice(PROSE) if rng.random() > 0.05 else rng.choice(keywords)
+                 for _ in range(rng.randint(40, 120))]
+        chunks.append(" ".join(words).capitalize() + ".")
+    return chunks
+
+
+def bench_default_vocabulary(count: int, rng: random.Random) -> None:
+    """Time the default matcher against the original loop on the default vocabulary."""
+    matcher = KeywordMatcher(KEYWORD_CATEGORIES)
+    for name, chunks in (("prose", prose_chunks(count, KEYWORD_CATEGORIES, rng)),
+                         ("keyword dense", synthetic_chunks(count, KEYWORD_CATEGORIES, rng))):
+        start = time.perf_counter()
+        expected = [reference_score(chunk, KEYWORD_CATEGORIES, KEYWORD_WEIGHTS) for chunk in chunks]
+        reference = time.perf_counter() - start
+        start = time.perf_counter()
+        actual = [matcher.score(chunk, KEYWORD_WEIGHTS)[0] for chunk in chunks]
+        default = time.perf_counter() - start
+        if actual != expected:
+            raise AssertionError(f"Default matcher score mismatch on {name} chunks")
+        hits = sum(len(found) for chunk in chunks for found in matcher.scan(chunk).values()) / len(chunks)
+        print(f"default vocabulary, {name} chunks ({hits:.1f} keywords each): "
+              f"original loop {reference * 1000:8.1f} ms | default matcher {default * 1000:8.1f} ms")
+
+
+def synthetic_skills(count: int, rng: random.Random) -> list[str]:
+    return ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 12)))
+            for _ in range(count)]
+
+
+def synthetic_chunks(count: int, vocabularies: dict, rng: random.Random) -> list[str]:
+    words = FILLER + [kw for keywords in vocabularies.values() for kw in keywords]
+    chunks = []
+    for _ in range(count):
+        chunk = " ".join(rng.choice(words) for _ in range(rng.randint(20, 80)))
+        chunks.append(chunk.upper() if rng.random() < 0.1 else chunk)
+    return chunks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--vocab-sizes", type=int, nargs="+", default=[0, 100, 250, 500, 1000, 5000],
+                        help="Number of synthetic skills added to TECHNICAL_SKILLS")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    bench_default_vocabulary(args.chunks, rng)
+    for extra in args.vocab_sizes:
+        vocabularies = dict(KEYWORD_CATEGORIES)
+        vocabularies["skill"] = list(vocabularies["skill"]) + synthetic_skills(extra, rng)
+        chunks = synthetic_chunks(args.chunks, vocabularies, rng)
+
+        start = time.perf_counter()
+        automaton = KeywordMatcher(vocabularies, use_automaton=True)
+        build = time.perf_counter() - start
+        substrings = KeywordMatcher(vocabularies, use_automaton=False)
+
+        start = time.perf_counter()
+        expected = [reference_score(chunk, vocabularies, KEYWORD_WEIGHTS) for chunk in chunks]
+        reference = time.perf_counter() - start
+
+        timings = {}
+        for name, matcher in (("automaton", automaton), ("in per keyword", substrings)):
+            start = time.perf_counter()
+            actual = [matcher.score(chunk, KEYWORD_WEIGHTS)[0] for chunk in chunks]
+            timings[name] = time.perf_counter() - start
+            if actual != expected:
+                raise AssertionError(f"{name} score mismatch with {extra} extra skills")
+        if any(automaton.scan(chunk) != substrings.scan(chunk) for chunk in chunks[:200]):
+            raise AssertionError(f"The strategies report different hits with {extra} extra skills")
+
+        vocab_size = sum(len(keywords) for keywords in vocabularies.values())
+        default = "automaton" if KeywordMatcher(vocabularies).use_automaton else "in per keyword"
+        print(f"vocabulary {vocab_size:6d}: original loop {reference * 1000:8.1f} ms | "
+              + " | ".join(f"{name} {seconds * 1000:8.1f} ms" for name, seconds in timings.items())
+              + f" | automaton build {build * 1000:6.1f} ms | default: {default}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark the spaCy SkillExtractor against substring scans as the skill vocabulary grows.
+
+The script checks that every keyword the extractor finds is also found by
+substring matching (token matches are a subset of substring matches) and
+reports the substring-only hits it rejects, then times both approaches.
+
+Usage:
+    PYTHONPATH=src:benchmarks python benchmarks/bench_skill_extractor.py --jds 200
+"""
+
+import argparse
+import random
+import string
+import time
+
+from corpus import CorpusGenerator
+from interview_prep.job_descripition.job_parser import KEYWORD_CATEGORIES
+from interview_prep.utils.skill_extractor import SkillExtractor
+
+
+def substring_hits(text: str, vocabularies: dict) -> set:
+    """The original matching: ``keyword in text`` for every keyword."""
+    text_lower = text.lower()
+    return {(category, keyword.lower()) for category, keywords in vocabularies.items()
+            for keyword in keywords if keyword.lower() in text_lower}
+
+
+def synthetic_skills(count: int, rng: random.Random) -> list[str]:
+    return ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 12)))
+            for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jds", type=int, default=200)
+    parser.add_argument("--vocab-sizes", type=int, nargs="+", default=[0, 1000, 10000],
+                        help="Number of synthetic skills added to TECHNICAL_SKILLS")
+    parser.add_argument("--n-process", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [paragraph for text in CorpusGenerator(args.seed).job_descriptions(args.jds)
+             for paragraph in text.split("\n\n")]
+    texts += ["Digital marketing with JavaScript", "Legit git user"]
+
+    for extra in args.vocab_sizes:
+        vocabularies = dict(KEYWORD_CATEGORIES)
+        vocabularies["skill"] = list(vocabularies["skill"]) + synthetic_skills(extra, rng)
+        extractor = SkillExtractor(vocabularies, n_process=args.n_process)
+
+        start = time.perf_counter()
+        extractor.matcher
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = [substring_hits(text, vocabularies) for text in texts]
+        reference = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = extractor.extract(texts)
+        extracted = time.perf_counter() - start
+
+        rejected = 0
+        for hits, allowed in zip(results, expected):
+            found = {(category, keyword) for category, keywords in hits.items() for keyword in keywords}
+            if not found <= allowed:
+                raise AssertionError(f"Keywords found without a substring match: {found - allowed}")
+            rejected += len(allowed - found)
+
+        vocab_size = sum(len(keywords) for keywords in vocabularies.values())
+        print(f"vocabulary {vocab_size:6d}: build {build * 1000:7.1f} ms | "
+              f"substring scans {reference * 1000:8.1f} ms | phrase matcher {extracted * 1000:8.1f} ms | "
+              f"substring-only hits rejected {rejected}")
+
+
+if __name__ == "__main__":
+    main()
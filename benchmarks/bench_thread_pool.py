@@ -0,0 +1,116 @@
+"""Benchmark JobDescriptionParser.process_many against a sequential loop.
+
+The script writes the job descriptions to text files and checks that the
+thread pool gives, in order, the chunks and scores of the sequential loop
+and that the statistics counted by all threads add up. It then times:
+
+- the sequential loop with the shared resources, and with a keyword automaton
+  and header index rebuilt per document (what a per-request parser used to cost)
+- ``process_many`` for every ``--threads`` value, with files read as is and with
+  ``--read-latency`` seconds added to every read, like a network file system
+
+Under the GIL, threads only overlap the waits, so the pure CPU run is not
+expected to scale unless the interpreter is a free-threaded build.
+
+Usage:
+    PYTHONPATH=src:benchmarks python benchmarks/bench_thread_pool.py --jds 400 --threads 1 2 4 8
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from constants import JOB_DESCRIPTION_SECTION_HEADERS
+from corpus import CorpusGenerator
+from interview_prep.job_descripition.job_parser import KEYWORD_CATEGORIES, JobDescriptionParser
+from interview_prep.utils.header_index import HeaderIndex
+from interview_prep.utils.instrumentation import InMemorySink, StatsSink, set_sink
+from interview_prep.utils.keyword_matcher import KeywordMatcher
+
+
+class SlowStorageParser(JobDescriptionParser):
+    """Parser whose file reads wait ``latency`` seconds first."""
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    def parse_description(self, job_description_file: str):
+        time.sleep(self.latency)
+        return super().parse_description(job_description_file)
+
+
+def results_key(results) -> list:
+    return [([chunk.model_dump() for chunk in chunks],
+             [(item["chunk"].id, item["score"], item["hits"]) for item in scored])
+            for _, chunks, scored in results]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jds", type=int, default=400)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--read-latency", type=float, default=0.002)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i, text in enumerate(CorpusGenerator(args.seed).job_descriptions(args.jds)):
+            path = Path(tmp_dir) / f"jd_{i}.txt"
+            path.write_text(text)
+            paths.append(str(path))
+
+        jd_parser = JobDescriptionParser()
+
+        def sequential(parser: JobDescriptionParser, rebuild: bool = False) -> list:
+            results = []
+            for path in paths:
+                if rebuild:
+                    KeywordMatcher(KEYWORD_CATEGORIES)
+                    HeaderIndex(JOB_DESCRIPTION_SECTION_HEADERS)
+                document = parser.parse_description(path)
+                results.append((document, *parser.process(document)))
+            return results
+
+        sink = InMemorySink()
+        set_sink(sink)
+        expected = results_key(sequential(jd_parser))
+        expected_counters = dict(sink.summary()["counters"])
+        sink.reset()
+        actual = results_key(jd_parser.process_many(paths, workers=max(args.threads)))
+        counters = sink.summary()["counters"]
+        set_sink(StatsSink())
+        if actual != expected:
+            raise AssertionError("process_many results differ from the sequential loop")
+        if counters != expected_counters:
+            raise AssertionError(f"Counters differ: {counters} != {expected_counters}")
+
+        for latency in (0.0, args.read_latency):
+            slow_parser = SlowStorageParser(latency) if latency else jd_parser
+            timings = {}
+            start = time.perf_counter()
+            sequential(slow_parser)
+            timings["sequential"] = time.perf_counter() - start
+            if not latency:
+                start = time.perf_counter()
+                sequential(slow_parser, rebuild=True)
+                timings["sequential, resources per document"] = time.perf_counter() - start
+            for threads in args.threads:
+                start = time.perf_counter()
+                list(slow_parser.process_many(paths, workers=threads))
+                timings[f"{threads} threads"] = time.perf_counter() - start
+
+            print(f"read latency {latency * 1000:.1f} ms:")
+            for name, seconds in timings.items():
+                print(f"  {name:36s} {args.jds / seconds:8.0f} docs/s | "
+                      f"x{timings['sequential'] / seconds:.2f} vs sequential")
+
+
+if __name__ == "__main__":
+    main()
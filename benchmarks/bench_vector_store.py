@@ -0,0 +1,90 @@
+"""Benchmark VectorStore against loading every embedding into memory and sorting all scores.
+
+Without the store, a corpus of chunk embeddings was unpickled into one float32
+matrix per process and searched by sorting every cosine similarity. The script
+writes the same random unit vectors to a float32 and a float16 store, checks
+that the float32 store returns the same top-k as the in-memory search (and how
+many of them the float16 store keeps), then times opening and searching both
+ways and measures the memory the in-memory route allocates per process.
+
+Usage:
+    PYTHONPATH=src:benchmarks python benchmarks/bench_vector_store.py --vectors 10000 100000 --dim 384
+"""
+
+import argparse
+import pickle
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from interview_prep.embeddings.vector_store import VectorStore
+from interview_prep.schemas.cv_schema import JobDescriptionChunk
+
+
+def in_memory_search(vectors: np.ndarray, queries: np.ndarray, k: int) -> tuple:
+    """The search the store replaces: score every vector, then sort every score."""
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    scores = queries @ vectors.T
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return order, np.take_along_axis(scores, order, axis=1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=16)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=5_000, help="Vectors added per call")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for count in args.vectors:
+        vectors = rng.normal(size=(count, args.dim)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+        chunks = [JobDescriptionChunk(id=i, text="", section="Requirements", chunk_type="paragraph")
+                  for i in range(args.batch)]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pickle_path = Path(tmp_dir) / "embeddings.pkl"
+            pickle_path.write_bytes(pickle.dumps(vectors))
+            for dtype in ("float32", "float16"):
+                store = VectorStore(Path(tmp_dir) / dtype, dim=args.dim, dtype=dtype)
+                for start in range(0, count, args.batch):
+                    batch = vectors[start:start + args.batch]
+                    store.add(batch, chunks[:len(batch)], source=f"batch_{start}")
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            loaded = pickle.loads(pickle_path.read_bytes())
+            load = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            start = time.perf_counter()
+            expected, _ = in_memory_search(loaded, queries, args.k)
+            memory_search = time.perf_counter() - start
+
+            line = (f"{count:7d} vectors x {args.dim} | in memory: load {load * 1000:7.1f} ms, "
+                    f"{peak / 2 ** 20:6.1f} MB per process, search {memory_search * 1000:7.1f} ms")
+            for dtype in ("float32", "float16"):
+                start = time.perf_counter()
+                store = VectorStore(Path(tmp_dir) / dtype)
+                open_time = time.perf_counter() - start
+                start = time.perf_counter()
+                indices, _ = store.search(queries, k=args.k)
+                store_search = time.perf_counter() - start
+                if dtype == "float32" and not np.array_equal(indices, expected):
+                    raise AssertionError(f"The float32 store differs from the in-memory search with {count} vectors")
+                recall = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(indices.tolist(), expected.tolist())])
+                line += (f" | {dtype} store: open {open_time * 1000:5.1f} ms, search {store_search * 1000:7.1f} ms,"
+                         f" recall {recall:.3f}")
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
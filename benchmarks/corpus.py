@@ -0,0 +1,99 @@
+"""Seeded generator of synthetic CVs (text and PDF) and job descriptions."""
+
+import random
+from pathlib import Path
+from typing import List
+
+from constants import (CV_SECTION_HEADERS, EXCLUDE, JOB_DESCRIPTION_SECTION_HEADERS, REQUIREMENT_KEYWORDS,
+                       TASKS, TECHNICAL_SKILLS)
+
+
+WORDS = ["data", "model", "pipeline", "team", "customer", "platform", "analysis", "system", "product",
+         "research", "performance", "quality", "service", "project", "results", "users", "framework",
+         "infrastructure", "reporting", "architecture", "München", "Zürich", "café", "résumé", "naïve"]
+CONTRACTIONS = ["I've", "didn't", "it's", "we're", "can't", "won't", "they'll", "I'd"]
+INSTITUTIONS = ["Technical University of Munich", "École Polytechnique", "Universidad Politécnica de Madrid",
+                "Technical University of Denmark", "qdive", "Acme Analytics GmbH"]
+DATES = ["October 2021 - October 2024", "September 2018 - July 2021", "April 2023 - Present", "2019 – 2020"]
+
+
+class CorpusGenerator:
+    """Generate reproducible synthetic documents from a seed."""
+
+    def __init__(self, seed: int = 0):
+        self.rng = random.Random(seed)
+
+    def _sentence(self, min_words: int = 8, max_words: int = 30) -> str:
+        rng = self.rng
+        vocabulary = WORDS + TECHNICAL_SKILLS + TASKS + CONTRACTIONS
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(min_words, max_words))]
+        return " ".join(words).capitalize() + "."
+
+    def _wrap(self, text: str, width: int = 90) -> List[str]:
+        """Wrap a paragraph like a PDF extraction would, with some hyphenated breaks."""
+        lines, line = [], ""
+        for word in text.split():
+            if len(line) + len(word) + 1 > width:
+                if self.rng.random() < 0.2 and len(word) > 6:
+                    cut = len(word) // 2
+                    lines.append(f"{line} {word[:cut]}-".strip())
+                    line = word[cut:]
+                    continue
+                lines.append(line)
+                line = word
+            else:
+                line = f"{line} {word}".strip()
+        if line:
+            lines.append(line)
+        return lines
+
+    def cv_text(self, num_sections: int = 6, items_per_section: int = 4) -> str:
+        """Generate the text of a CV, as extracted from a PDF."""
+        rng = self.rng
+        lines = ["Jane S´anchez Doe", "Schl¨usselbergstrasse 8, 81673 Munich, Germany | jane@example.com"]
+        for header in rng.sample(CV_SECTION_HEADERS, min(num_sections, len(CV_SECTION_HEADERS))):
+            lines.append(header)
+            for _ in range(items_per_section):
+                lines.append(rng.choice(INSTITUTIONS))
+                lines.append(f"{rng.choice(['Munich', 'Paris', 'Madrid'])}, {rng.choice(['Germany', 'France', 'Spain'])}")
+                lines.append(rng.choice(DATES))
+                for _ in range(rng.randint(1, 3)):
+                    bullet = self._wrap(f"• {self._sentence()}")
+                    lines.extend(bullet)
+            lines.append("")
+        return "\n".join(lines) + "\n"
+
+    def cv_pdf(self, path: Path, lines_per_page: int = 70, **kwargs) -> Path:
+        """Write a generated CV to a PDF, one text line per PDF line."""
+        import pymupdf
+
+        # the base14 fonts cannot render every character, keep latin-1
+        text = self.cv_text(**kwargs).encode("latin-1", "replace").decode("latin-1")
+        lines = text.splitlines()
+
+        doc = pymupdf.open()
+        for start in range(0, len(lines), lines_per_page):
+            page = doc.new_page()
+            for i, line in enumerate(lines[start:start + lines_per_page]):
+                page.insert_text((36, 40 + i * 11), line, fontsize=8)
+        doc.save(path)
+        doc.close()
+        return path
+
+    def job_description(self, num_paragraphs: int = 6) -> str:
+        """Generate a job description text."""
+        rng = self.rng
+        lines = []
+        for header in rng.sample(JOB_DESCRIPTION_SECTION_HEADERS, min(num_paragraphs, len(JOB_DESCRIPTION_SECTION_HEADERS))):
+            lines.append(header)
+            for _ in range(rng.randint(1, 4)):
+                keywords = rng.sample(REQUIREMENT_KEYWORDS + EXCLUDE, 2)
+                lines.append(f"{self._sentence()} {keywords[0].capitalize()} {self._sentence(4, 12)} {keywords[1]}.")
+            lines.append("")
+        return "\n".join(lines)
+
+    def cv_texts(self, count: int, **kwargs) -> List[str]:
+        return [self.cv_text(**kwargs) for _ in range(count)]
+
+    def job_descriptions(self, count: int, **kwargs) -> List[str]:
+        return [self.job_description(**kwargs) for _ in range(count)]
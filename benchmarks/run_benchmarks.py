@@ -0,0 +1,197 @@
+"""Benchmark suite for the parsing pipeline.
+
+Generates a seeded synthetic corpus, measures the throughput and peak memory
+of every pipeline stage and of the end-to-end CV and job description
+pipelines, and compares the results with a stored baseline. A stage whose
+throughput drops, or whose peak memory grows, by more than the threshold
+fails the run (exit code 1).
+
+Usage:
+    # record a baseline on this machine
+    PYTHONPATH=src:benchmarks python benchmarks/run_benchmarks.py --save-baseline
+    # compare against it
+    PYTHONPATH=src:benchmarks python benchmarks/run_benchmarks.py --threshold 0.2
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from corpus import CorpusGenerator
+from interview_prep.CV.chunker import CVChunker
+from interview_prep.CV.cv_reader import CVReader
+from interview_prep.job_descripition.job_parser import JobDescriptionParser
+from interview_prep.schemas.cv_schema import Document
+from interview_prep.utils.text_tools import normalize_text
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def measure(run: Callable[[], None], items: int, size_bytes: int, repeat: int) -> dict:
+    """Time ``run`` (best of ``repeat``) and measure its peak traced memory on a separate run."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    return {"seconds": best,
+            "median_seconds": statistics.median(timings),
+            "items_per_second": items / best,
+            "mb_per_second": size_bytes / best / 2**20,
+            "peak_memory_mb": peak / 2**20}
+
+
+def build_suite(args: argparse.Namespace, tmp_dir: Path) -> Dict[str, Callable[[], dict]]:
+    generator = CorpusGenerator(args.seed)
+    cv_texts = generator.cv_texts(args.cvs, num_sections=args.cv_sections, items_per_section=args.cv_items)
+    jd_texts = generator.job_descriptions(args.jds, num_paragraphs=args.jd_paragraphs)
+
+    pdf_paths = [str(generator.cv_pdf(tmp_dir / f"cv_{i}.pdf", num_sections=args.cv_sections,
+                                      items_per_section=args.cv_items))
+                 for i in range(args.pdfs)]
+    jd_paths = []
+    for i, text in enumerate(jd_texts):
+        path = tmp_dir / f"jd_{i}.txt"
+        path.write_text(text)
+        jd_paths.append(str(path))
+
+    cv_docs = [Document(category="CV", raw_text=text, normalized_text=normalize_text(text), source="synthetic")
+               for text in cv_texts]
+    jd_docs = [Document(category="Job Description", raw_text=text, normalized_text=normalize_text(text),
+                        source="synthetic")
+               for text in jd_texts]
+
+    chunker = CVChunker()
+    cv_sections = [chunker._retrieve_sections(doc) for doc in cv_docs]
+    parser = JobDescriptionParser()
+    jd_chunks = [parser.chunk_description(doc) for doc in jd_docs]
+
+    reader = CVReader(use_cache=False)
+    cv_bytes = sum(len(text.encode("utf-8")) for text in cv_texts)
+    jd_bytes = sum(len(text.encode("utf-8")) for text in jd_texts)
+    pdf_bytes = sum(Path(path).stat().st_size for path in pdf_paths)
+
+    def select_all():
+        for chunks in jd_chunks:
+            parser.select_relevant_chunks(chunks)
+
+    def cv_end_to_end():
+        for path in pdf_paths:
+            document = reader.read_cv(path)
+            chunker.chunk_sections(chunker._retrieve_sections(document))
+
+    def jd_end_to_end():
+        for path in jd_paths:
+            parser.process(parser.parse_description(path))
+
+    repeat = args.repeat
+    return {
+        "normalize_text": lambda: measure(lambda: [normalize_text(t) for t in cv_texts], len(cv_texts), cv_bytes, repeat),
+        "cv.read_cv": lambda: measure(lambda: [reader.read_cv(p) for p in pdf_paths], len(pdf_paths), pdf_bytes, repeat),
+        "cv.retrieve_sections": lambda: measure(lambda: [chunker._retrieve_sections(d) for d in cv_docs],
+                                                len(cv_docs), cv_bytes, repeat),
+        "cv.chunk_sections": lambda: measure(lambda: [chunker.chunk_sections(s) for s in cv_sections],
+                                             len(cv_sections), cv_bytes, repeat),
+        "jd.parse_description": lambda: measure(lambda: [parser.parse_description(p) for p in jd_paths],
+                                                len(jd_paths), jd_bytes, repeat),
+        "jd.chunk_description": lambda: measure(lambda: [parser.chunk_description(d) for d in jd_docs],
+                                                len(jd_docs), jd_bytes, repeat),
+        "jd.select_relevant_chunks": lambda: measure(select_all, len(jd_chunks), jd_bytes, repeat),
+        "cv.end_to_end": lambda: measure(cv_end_to_end, len(pdf_paths), pdf_bytes, repeat),
+        "jd.end_to_end": lambda: measure(jd_end_to_end, len(jd_paths), jd_bytes, repeat),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """List the stages regressing by more than ``threshold`` against the baseline."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result["items_per_second"] < reference["items_per_second"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {result['items_per_second']:.1f}/s "
+                               f"vs baseline {reference['items_per_second']:.1f}/s")
+        if result["peak_memory_mb"] > reference["peak_memory_mb"] * (1 + threshold):
+            regressions.append(f"{name}: peak memory {result['peak_memory_mb']:.2f} MB "
+                               f"vs baseline {reference['peak_memory_mb']:.2f} MB")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cvs", type=int, default=200, help="Number of synthetic CV texts")
+    parser.add_argument("--cv-sections", type=int, default=6)
+    parser.add_argument("--cv-items", type=int, default=4, help="Entries per CV section")
+    parser.add_argument("--pdfs", type=int, default=20, help="Number of synthetic CV PDFs")
+    parser.add_argument("--jds", type=int, default=200, help="Number of synthetic job descriptions")
+    parser.add_argument("--jd-paragraphs", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stages", nargs="+", help="Only run these stages")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Tolerated relative regression")
+    parser.add_argument("-o", "--output", type=Path, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        suite = build_suite(args, Path(tmp_dir))
+        for name, run in suite.items():
+            if args.stages and name not in args.stages:
+                continue
+            results[name] = run()
+            r = results[name]
+            print(f"{name:28s} {r['items_per_second']:10.1f} docs/s {r['mb_per_second']:8.2f} MB/s "
+                  f"peak {r['peak_memory_mb']:8.2f} MB")
+
+    corpus_parameters = ("seed", "cvs", "cv_sections", "cv_items", "pdfs", "jds", "jd_paragraphs")
+    report = {"python": platform.python_version(),
+              "machine": platform.machine(),
+              "parameters": {name: getattr(args, name) for name in corpus_parameters},
+              "results": results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, default=str))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2, default=str))
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, run with --save-baseline to create one.")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("parameters") != report["parameters"]:
+        print("Warning: baseline was recorded with different corpus parameters.")
+    regressions = compare(results, baseline["results"], args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        return 1
+    print(f"No regression beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
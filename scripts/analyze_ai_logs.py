@@ -0,0 +1,469 @@
+"""Analyze AI assistant log exports (xlsx) and report slow and problematic responses.
+
+Workbooks are streamed row by row with openpyxl in read-only mode: questions,
+tool calls and answers are paired per session, checked and matched against
+client-reported issues in a single pass, and the report entries are spooled to
+disk as they are found. Memory stays flat whatever the size of the export, and
+several files can be analyzed in parallel worker processes.
+
+Usage:
+    python scripts/analyze_ai_logs.py logs.xlsx -o results.json --client-issues client_issues.json
+    python scripts/analyze_ai_logs.py exports/*.xlsx --workers 4 --order desc
+"""
+
+import argparse
+import bisect
+import json
+import logging
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger("analyze_ai_logs")
+
+# header names recognized for each column, compared case insensitively
+TIME_COLUMNS = ("timegenerated", "timestamp", "time", "datetime", "date")
+MESSAGE_COLUMNS = ("message", "resultdescription", "msg", "log", "text", "content")
+SESSION_COLUMNS = ("session_id", "sessionid", "conversation_id", "conversationid", "thread_id",
+                   "operation_id", "operationid", "correlation_id", "correlationid")
+
+# markers of question and answer rows, searched in the first MARKER_WINDOW characters
+# of a message only: the text after the marker is the question or answer
+QUESTION_RE = re.compile(r"\b(?:user\s+)?(?:question|query|prompt|user\s+message)\s*[:=]\s*", re.I)
+ANSWER_RE = re.compile(r"\b(?:assistant\s+)?(?:answer|response|reply|assistant\s+message)\s*[:=]\s*", re.I)
+MARKER_WINDOW = 200
+TOOL_RE = re.compile(r"\b(?:calling\s+tool|tool\s+call(?:ed)?|tool|function\s+call)\s*[:=]?\s*[\"'`]?"
+                     r"([A-Za-z_][\w.-]*)", re.I)
+# matched against the lowercased answer, many times faster than an IGNORECASE search
+CLARIFICATION_RE = re.compile(r"could you (?:please )?(?:clarify|specify|provide)|can you (?:clarify|specify)|"
+                              r"what do you mean|please provide more|more (?:details|context|information)"
+                              r"|which (?:one|of the)")
+
+QUESTION, ANSWER, TOOL = "question", "answer", "tool"
+
+# upper bounds, in seconds, of the response time histogram buckets
+DURATION_BUCKETS = [1, 2, 5, 10, 20, 30, 60, 120, 300, 600, float("inf")]
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _words(text: str) -> set:
+    return set(_WORD_RE.findall(text.casefold()))
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, str) and value.strip():
+        try:
+            parsed = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+        return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+    return None
+
+
+class DurationStats:
+    """Count, sum, maximum and histogram of response times, mergeable across files."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.histogram = [0] * len(DURATION_BUCKETS)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+        self.histogram[bisect.bisect_left(DURATION_BUCKETS, seconds)] += 1
+
+    def merge(self, other: "DurationStats") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of the responses."""
+        if not self.count:
+            return None
+        seen = 0
+        for bound, n in zip(DURATION_BUCKETS, self.histogram):
+            seen += n
+            if seen >= fraction * self.count:
+                return bound if bound != float("inf") else self.maximum
+        return self.maximum
+
+    def summary(self) -> dict:
+        return {"count": self.count,
+                "mean_seconds": round(self.total / self.count, 3) if self.count else None,
+                "max_seconds": round(self.maximum, 3) if self.count else None,
+                "p50_seconds_at_most": self.percentile(0.5),
+                "p95_seconds_at_most": self.percentile(0.95),
+                "p99_seconds_at_most": self.percentile(0.99),
+                "histogram": {f"<={bound}": n for bound, n in zip(DURATION_BUCKETS, self.histogram) if n}}
+
+
+class ClientIssueIndex:
+    """Client-reported questions, looked up through an inverted index of their words.
+
+    A logged question matches an issue when it contains the issue's question,
+    or when their word sets overlap by at least ``threshold`` (Jaccard).
+    """
+
+    def __init__(self, issues: Sequence[dict], threshold: float = 0.6):
+        self.issues = list(issues)
+        self.threshold = threshold
+        self._normalized = [" ".join(issue["question"].casefold().split()) for issue in self.issues]
+        self._words = [_words(issue["question"]) for issue in self.issues]
+        self._index: Dict[str, List[int]] = {}
+        for i, words in enumerate(self._words):
+            for word in words:
+                self._index.setdefault(word, []).append(i)
+
+    @classmethod
+    def from_file(cls, path: Path, threshold: float = 0.6) -> "ClientIssueIndex":
+        """Load issues from JSON: a list of questions, of objects with a ``question``, or ``{"issues": [...]}``."""
+        with Path(path).open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get("issues", [])
+        issues = [{"question": item} if isinstance(item, str) else dict(item) for item in data]
+        return cls([issue for issue in issues if issue.get("question")], threshold=threshold)
+
+    def match(self, question: str) -> List[Tuple[dict, float]]:
+        """Issues matching a logged question, with their similarity."""
+        words = _words(question)
+        candidates = {i for word in words for i in self._index.get(word, ())}
+        if not candidates:
+            return []
+        normalized = " ".join(question.casefold().split())
+        matches = []
+        for i in sorted(candidates):
+            if self._normalized[i] in normalized:
+                similarity = 1.0
+            else:
+                similarity = len(words & self._words[i]) / len(words | self._words[i])
+            if similarity >= self.threshold:
+                matches.append((self.issues[i], round(similarity, 3)))
+        return matches
+
+
+class LogAnalyzer:
+    """Single pass analysis of the sheets of a log workbook."""
+
+    def __init__(self,
+                 slow_seconds: float = 60.0,
+                 verbose_chars: int = 3000,
+                 max_text: int = 2000,
+                 order: str = "asc",
+                 client_issues: Optional[ClientIssueIndex] = None,
+                 time_column: Optional[str] = None,
+                 message_column: Optional[str] = None,
+                 session_column: Optional[str] = None):
+        """Create an analyzer.
+
+        Args:
+            slow_seconds (float): Responses taking longer are reported as slow.
+            verbose_chars (int): Answers longer than this are flagged as verbose.
+            max_text (int): Questions and answers are truncated to this length in the report.
+            order (str): ``"asc"`` if rows are oldest first, ``"desc"`` if newest first.
+            client_issues (ClientIssueIndex, optional): Client-reported questions to match.
+            time_column (str, optional): Header of the timestamp column, detected otherwise.
+            message_column (str, optional): Header of the log message column, detected otherwise.
+            session_column (str, optional): Header of the session id column, detected otherwise.
+                Without one, all rows belong to one conversation.
+        """
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be 'asc' or 'desc'")
+        self.slow_seconds = slow_seconds
+        self.verbose_chars = verbose_chars
+        self.max_text = max_text
+        self.order = order
+        self.client_issues = client_issues
+        self.time_column = time_column
+        self.message_column = message_column
+        self.session_column = session_column
+
+    @staticmethod
+    def _find_column(header: Sequence[str], wanted: Optional[str], candidates: Sequence[str]) -> Optional[int]:
+        names = [name.strip().casefold() for name in header]
+        if wanted is not None:
+            if wanted.casefold() not in names:
+                raise ValueError(f"Column {wanted!r} not found in {list(header)}")
+            return names.index(wanted.casefold())
+        for candidate in candidates:
+            if candidate in names:
+                return names.index(candidate)
+        return None
+
+    def _iter_rows(self, path: Path) -> Iterator[Tuple[Optional[datetime], str, str]]:
+        """Yield ``(time, session, message)`` for the rows of every sheet that have a message."""
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                rows = sheet.iter_rows(values_only=True)
+                header = None
+                for row in rows:
+                    if any(value is not None for value in row):
+                        header = ["" if value is None else str(value) for value in row]
+                        break
+                if header is None:
+                    continue
+                message_index = self._find_column(header, self.message_column, MESSAGE_COLUMNS)
+                if message_index is None:
+                    logger.warning("Sheet %r of %s has no message column, skipped", sheet.title, path)
+                    continue
+                time_index = self._find_column(header, self.time_column, TIME_COLUMNS)
+                session_index = self._find_column(header, self.session_column, SESSION_COLUMNS)
+
+                for row in rows:
+                    message = row[message_index] if message_index < len(row) else None
+                    if not isinstance(message, str):
+                        continue
+                    timestamp = _to_datetime(row[time_index]) if time_index is not None and time_index < len(row) \
+                        else None
+                    session = str(row[session_index]) if session_index is not None and session_index < len(row) \
+                        and row[session_index] is not None else ""
+                    yield timestamp, session, message
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _classify(message: str) -> Iterator[Tuple[str, str]]:
+        head = message[:MARKER_WINDOW]
+        match = QUESTION_RE.search(head)
+        if match:
+            yield QUESTION, message[match.end():].strip()
+            return
+        match = ANSWER_RE.search(head)
+        if match:
+            yield ANSWER, message[match.end():].strip()
+            return
+        for match in TOOL_RE.finditer(head):
+            yield TOOL, match.group(1)
+
+    def _truncate(self, text: Optional[str]) -> Optional[str]:
+        if text is None or len(text) <= self.max_text:
+            return text
+        return text[:self.max_text] + "…"
+
+    def _close(self, pair: dict, report: "_Report") -> None:
+        """Check a question and its answer, and write the report entries they belong to."""
+        question, answer = pair.get("question"), pair.get("answer")
+        if question is None:
+            report.stats["orphan_answers"] += 1
+            return
+        report.stats["total_questions"] += 1
+
+        duration = None
+        if pair.get("start") is not None and pair.get("end") is not None:
+            duration = abs((pair["end"] - pair["start"]).total_seconds())
+        if duration is not None:
+            report.durations.add(duration)
+
+        timestamp = pair.get("question_time")
+        record = {"timestamp": timestamp.isoformat() if timestamp else None,
+                  "session": pair["session"] or None,
+                  "question": self._truncate(question),
+                  "duration_seconds": round(duration, 3) if duration is not None else None,
+                  "answer": self._truncate(answer),
+                  "answer_length": len(answer) if answer is not None else 0,
+                  "tools_used": sorted(set(pair["tools"])),
+                  "num_tools": len(pair["tools"])}
+
+        if duration is not None and duration > self.slow_seconds:
+            report.write("slow_responses", record)
+
+        issues = []
+        if answer is None:
+            issues.append("unanswered")
+        else:
+            if CLARIFICATION_RE.search(answer.lower()):
+                issues.append("clarification_request")
+            if len(answer) > self.verbose_chars:
+                issues.append("verbose")
+            if not pair["tools"]:
+                issues.append("no_tools_used")
+        for issue in issues:
+            report.stats[f"issue_{issue}"] += 1
+        if issues:
+            report.write("problematic_qa_pairs", {**record, "issues": issues})
+
+        if self.client_issues is not None:
+            for client_issue, similarity in self.client_issues.match(question):
+                report.write("client_reported_issues", {**record, "client_issue": client_issue,
+                                                        "similarity": similarity})
+
+    def analyze_file(self, path: Path, spool_dir: Path) -> "_Report":
+        """Analyze one workbook, spooling its report entries under ``spool_dir``."""
+        report = _Report(Path(path), Path(spool_dir))
+        opening, closing = (QUESTION, ANSWER) if self.order == "asc" else (ANSWER, QUESTION)
+        pending: Dict[str, dict] = {}
+        try:
+            for timestamp, session, message in self._iter_rows(Path(path)):
+                report.stats["total_log_entries"] += 1
+                for kind, value in self._classify(message):
+                    pair = pending.get(session)
+                    if kind == TOOL:
+                        if pair is not None:
+                            pair["tools"].append(value)
+                        continue
+                    if kind == opening:
+                        if pair is not None:
+                            self._close(pair, report)
+                        pair = pending[session] = {"session": session, "tools": [], "start": timestamp}
+                    elif pair is None:
+                        # nothing opened it, e.g. the export starts in the middle of a conversation; without
+                        # a start there is no response time (a 0 s one would skew the summary)
+                        pair = {"session": session, "tools": [], "start": None}
+                    else:
+                        del pending[session]
+                    pair[kind] = value
+                    if kind == QUESTION:
+                        pair["question_time"] = timestamp
+                    if kind == closing:
+                        pair["end"] = timestamp
+                        self._close(pair, report)
+            for pair in pending.values():
+                self._close(pair, report)
+        finally:
+            report.close()
+        return report
+
+
+class _Counter(dict):
+    def __missing__(self, key: str) -> int:
+        return 0
+
+
+class _Report:
+    """Statistics of one analyzed file, and the spool files of its report entries."""
+
+    SECTIONS = ("slow_responses", "problematic_qa_pairs", "client_reported_issues")
+
+    def __init__(self, source: Path, spool_dir: Path):
+        self.source = str(source)
+        self.stats: Dict[str, int] = _Counter(total_log_entries=0, total_questions=0, orphan_answers=0)
+        self.counts = {section: 0 for section in self.SECTIONS}
+        self.durations = DurationStats()
+        directory = Path(tempfile.mkdtemp(dir=spool_dir))
+        self.spools = {section: directory / f"{section}.jsonl" for section in self.SECTIONS}
+        self._files = {section: path.open("w", encoding="utf-8") for section, path in self.spools.items()}
+
+    def write(self, section: str, record: dict) -> None:
+        self.counts[section] += 1
+        self._files[section].write(json.dumps({"source_file": self.source, **record}, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_files"] = {}
+        return state
+
+
+def _analyze_worker(path: str, analyzer: LogAnalyzer, spool_dir: str) -> _Report:
+    return analyzer.analyze_file(Path(path), Path(spool_dir))
+
+
+def analyze_files(paths: Sequence[str], analyzer: LogAnalyzer, spool_dir: Path,
+                  workers: int = 1) -> List[_Report]:
+    """Analyze every file, in ``workers`` processes if more than one; reports are in input order."""
+    if workers <= 1 or len(paths) <= 1:
+        return [analyzer.analyze_file(Path(path), spool_dir) for path in paths]
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        return list(executor.map(_analyze_worker, paths, [analyzer] * len(paths), [str(spool_dir)] * len(paths)))
+
+
+def _write_array(out, lines: Iterable[str]) -> None:
+    out.write("[")
+    first = True
+    for line in lines:
+        out.write("\n    " if first else ",\n    ")
+        out.write(line.rstrip("\n"))
+        first = False
+    out.write("\n  ]" if not first else "]")
+
+
+def write_report(output: Path, sources: Sequence[str], reports: Sequence[_Report]) -> dict:
+    """Write the JSON report, streaming the spooled entries into it, and return its summary."""
+    totals = _Counter()
+    durations = DurationStats()
+    counts = _Counter()
+    for report in reports:
+        for key, value in report.stats.items():
+            totals[key] += value
+        for key, value in report.counts.items():
+            counts[key] += value
+        durations.merge(report.durations)
+
+    summary = {"total_log_entries": totals["total_log_entries"],
+               "total_questions": totals["total_questions"],
+               "slow_responses_count": counts["slow_responses"],
+               "problematic_qa_count": counts["problematic_qa_pairs"],
+               "matched_client_issues_count": counts["client_reported_issues"],
+               "orphan_answers": totals["orphan_answers"],
+               "issues": {key[len("issue_"):]: value for key, value in sorted(totals.items())
+                          if key.startswith("issue_")},
+               "response_times": durations.summary()}
+
+    with Path(output).open("w", encoding="utf-8") as out:
+        out.write("{\n")
+        out.write(f'  "analysis_timestamp": {json.dumps(datetime.now().isoformat())},\n')
+        out.write(f'  "source_file": {json.dumps(sources[0] if len(sources) == 1 else list(sources))},\n')
+        out.write(f'  "summary": {json.dumps(summary, ensure_ascii=False)}')
+        for section in _Report.SECTIONS:
+            out.write(f',\n  "{section}": ')
+            _write_array(out, (line for report in reports
+                               for line in report.spools[section].open("r", encoding="utf-8")))
+        out.write("\n}\n")
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="xlsx log exports")
+    parser.add_argument("-o", "--output", default="analysis_results.json", help="JSON report path")
+    parser.add_argument("--client-issues", help="JSON file of client-reported questions")
+    parser.add_argument("--match-threshold", type=float, default=0.6,
+                        help="Minimum word overlap (Jaccard) of a question with a client issue")
+    parser.add_argument("--slow-seconds", type=float, default=60.0)
+    parser.add_argument("--verbose-chars", type=int, default=3000)
+    parser.add_argument("--max-text", type=int, default=2000, help="Truncate questions and answers in the report")
+    parser.add_argument("--order", choices=("asc", "desc"), default="asc",
+                        help="Row order of the exports: oldest first (asc) or newest first (desc)")
+    parser.add_argument("--time-column", help="Timestamp column header, detected by default")
+    parser.add_argument("--message-column", help="Log message column header, detected by default")
+    parser.add_argument("--session-column", help="Session id column header, detected by default")
+    parser.add_argument("--workers", type=int, default=1, help="Processes analyzing files in parallel")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    client_issues = (ClientIssueIndex.from_file(Path(args.client_issues), threshold=args.match_threshold)
+                     if args.client_issues else None)
+    analyzer = LogAnalyzer(slow_seconds=args.slow_seconds, verbose_chars=args.verbose_chars,
+                           max_text=args.max_text, order=args.order, client_issues=client_issues,
+                           time_column=args.time_column, message_column=args.message_column,
+                           session_column=args.session_column)
+
+    with tempfile.TemporaryDirectory() as spool_dir:
+        reports = analyze_files(args.inputs, analyzer, Path(spool_dir), workers=args.workers)
+        summary = write_report(Path(args.output), args.inputs, reports)
+
+    logger.info("%d log entries, %d questions, %d slow, %d problematic, %d client issues matched -> %s",
+                summary["total_log_entries"], summary["total_questions"], summary["slow_responses_count"],
+                summary["problematic_qa_count"], summary["matched_client_issues_count"], args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,26 @@ class Config:
     """Application configuration."""
 
     def __init__(self):
-        self.root_dir = Path(__file__).parent.parent.parent
-        self.data_dir = self.root_dir / "data"
+        # src/config.py -> the checkout root
+        self.root_dir = Path(__file__).resolve().parent.parent
+        self.data_dir = self._optional_path("DATA_DIR") or self.root_dir / "data"
+
+        # extra section header vocabularies, one header per line
+        self.cv_section_headers_file = self._optional_path("CV_SECTION_HEADERS_FILE")
+        self.job_description_section_headers_file = self._optional_path("JD_SECTION_HEADERS_FILE")
+
+        # extra technical skills matched by the spaCy skill extractor, one per line
+        self.skills_vocabulary_file = self._optional_path("SKILLS_VOCABULARY_FILE")
+
+        # parsing service
+        self.api_workers = int(os.getenv("API_WORKERS", os.cpu_count() or 1))
+        self.api_max_concurrency = int(os.getenv("API_MAX_CONCURRENCY", 2 * self.api_workers))
+        self.api_timeout = float(os.getenv("API_TIMEOUT", 60))
+        self.api_max_upload_bytes = int(os.getenv("API_MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+
+    @staticmethod
+    def _optional_path(name: str) -> Optional[Path]:
+        value = os.getenv(name)
+        return Path(value) if value else None
 
 config = Config() 
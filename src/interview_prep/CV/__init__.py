@@ -1,3 +1,28 @@
-from interview_prep.CV.cv_reader import CVReader as CVReader
-from interview_prep.schemas.cv_schema import Document as Document
+"""CV reading and chunking.
 
+Submodules are imported on first attribute access, so importing this package
+(or ``interview_prep.CV.chunker``) does not load pymupdf.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from interview_prep.CV.cv_reader import CVReader as CVReader
+    from interview_prep.schemas.cv_schema import Document as Document
+
+_LAZY_ATTRIBUTES = {
+    "CVReader": "interview_prep.CV.cv_reader",
+    "Document": "interview_prep.schemas.cv_schema",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
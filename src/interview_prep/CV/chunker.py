@@ -1,11 +1,27 @@
 
-from interview_prep.schemas.cv_schema import Document, CVChunk
-from constants import CV_SECTION_HEADERS, TECHNICAL_SKILLS
+import logging
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from interview_prep.utils.instrumentation import increment, timed
+from interview_prep.utils.header_index import get_cv_header_index
+from constants import TECHNICAL_SKILLS
+
+if TYPE_CHECKING:
+    from interview_prep.schemas.chunk_batch import ChunkBatch
+    from interview_prep.schemas.cv_schema import CVChunk, Document
+
+logger = logging.getLogger(__name__)
 
 class CVChunker:
     """Class to chunk CVs into small items."""
 
-    def _retrieve_sections(self, document: Document) -> list[dict]:
+    @staticmethod
+    def _is_section_header(line: str) -> bool:
+        """Whether a line is one of the CV section headers, see ``HeaderIndex`` for the variants matched."""
+        return line in get_cv_header_index()
+
+    @timed("cv.sections")
+    def _retrieve_sections(self, document: "Document") -> list[dict]:
         """Retrieve sections from a CV document based on common section headers.
         Args:
             document (Document): The document pydantic model
@@ -23,11 +39,14 @@ class CVChunker:
         content_buffer = []
         lines_buffer = []
 
-        for i, line in enumerate(document.normalized_text.split("\n")):
+        lines = document.normalized_text.split("\n")
+        increment("cv.lines", len(lines))
+
+        for i, line in enumerate(lines):
             if line.strip() == "":
                 continue
 
-            if line.strip().lower() in [x.lower() for x in CV_SECTION_HEADERS]:
+            if self._is_section_header(line):
                 
                 if content_buffer or lines_buffer:
                     section["content"] = content_buffer
@@ -54,72 +73,110 @@ class CVChunker:
             section["lines"] = lines_buffer
             section["id"] = section_id
             sections.append(section)
-            
+
+        increment("cv.sections", len(sections))
+        if logger.isEnabledFor(logging.DEBUG):
+            for s in sections:
+                logger.debug("Section %d: %s | %d lines | Preview: %s...",
+                             s["id"], s["section"], len(s["content"]), " ".join(s["content"])[:150])
 
         return sections
     
-    def chunk_sections(self, sections: list[dict]) -> list[CVChunk]:
-        """Chunk sections into smaller items based on bullet points and headings.
-        Args:
-            sections (list[dict]): A list of sections with their content and line numbers.
+    @staticmethod
+    def _classify_line(line: str, in_bullet_continuation: bool) -> tuple[Optional[str], bool]:
+        """Classify a section line, see ``chunk_sections`` for the rules.
+
         Return:
-            list[CVChunk]: A list of CVChunk models representing the chunks.
+            tuple[Optional[str], bool]: The chunk type the line starts (``ITEM`` or
+            ``HEADING``), ``CONTINUATION`` if it extends the previous chunk or ``None``
+            if it is dropped, and the bullet continuation state after the line.
+        """
+        #bullet points (check first)
+        if line.startswith("-") or line.startswith("*") or line.startswith("•"):
+            return "ITEM", True
+        
+        # Continuation of previous bullet point (starts with lowercase or is all caps)
+        if in_bullet_continuation and line[0].islower() and (line.endswith(".") or len(line)>100):
+            return "CONTINUATION", in_bullet_continuation
+
+        #headings (only if not in bullet continuation)
+        if not in_bullet_continuation and len(line.split()) < 15:
+            return "HEADING", False
+        
+        #other lines
+        if ":" in line and len(line.split()) < 15:
+            return "ITEM", in_bullet_continuation
+
+        if len(line.split()) < 10:
+            return "HEADING", in_bullet_continuation
+
+        return None, in_bullet_continuation
+
+    def _iter_chunk_rows(self, sections: list[dict], in_bullet_continuation: bool = False) -> Iterator[dict]:
+        """Yield the fields of every chunk, see ``chunk_sections`` for the rules.
+
+        A chunk is only yielded once the next one starts, since bullet point
+        continuation lines are appended to the previous chunk.
+        Args:
+            sections (list[dict]): The sections to chunk.
+            in_bullet_continuation (bool): Whether a bullet point was seen before these sections.
         """
         chunk_id = 0
-        chunks = []
-        in_bullet_continuation = False
+        pending = None
         
         for section in sections:
             for i, line in enumerate(section["content"]):
+                chunk_type, in_bullet_continuation = self._classify_line(line, in_bullet_continuation)
 
-                #bullet points (check first)
-                if line.startswith("-") or line.startswith("*") or line.startswith("•"):
-                    chunks.append(CVChunk(section_id=section["id"],
-                                  text=line.strip(),
-                                  section=section["section"],
-                                  chunk_type="ITEM",
-                                  chunk_id=chunk_id,
-                                  location=section["lines"][i]))
-                    chunk_id += 1
-                    in_bullet_continuation = True
-                    continue
-                
-                # Continuation of previous bullet point (starts with lowercase or is all caps)
-                if in_bullet_continuation and line[0].islower() and (line.endswith(".") or len(line)>100):
-                    chunks[-1].text += " " + line.strip()
+                if chunk_type is None:
                     continue
 
-                #headings (only if not in bullet continuation)
-                if not in_bullet_continuation and len(line.split()) < 15:
-                    chunks.append(CVChunk(section_id=section["id"],
-                                  text=line.strip(),
-                                  section=section["section"],
-                                  chunk_type="HEADING",
-                                  chunk_id=chunk_id,
-                                  location=section["lines"][i]))
-                    chunk_id += 1
-                    in_bullet_continuation = False
-                    continue
-                
-                #other lines
-                if ":" in line and len(line.split()) < 15:
-                    chunks.append(CVChunk(section_id=section["id"],
-                                  text=line.strip(),
-                                  section=section["section"],
-                                  chunk_type="ITEM",
-                                  chunk_id=chunk_id,
-                                  location=section["lines"][i]))
-                    chunk_id += 1
+                if chunk_type == "CONTINUATION":
+                    pending["text"] += " " + line.strip()
                     continue
 
-                if len(line.split()) < 10:
-                    chunks.append(CVChunk(section_id=section["id"],
-                                  text=line.strip(),
-                                  section=section["section"],
-                                  chunk_type="HEADING",
-                                  chunk_id=chunk_id,
-                                  location=section["lines"][i]))
-                    chunk_id += 1
-                    continue
+                if pending is not None:
+                    yield pending
+                pending = {"section_id": section["id"],
+                           "chunk_id": chunk_id,
+                           "text": line.strip(),
+                           "section": section["section"],
+                           "chunk_type": chunk_type,
+                           "location": section["lines"][i]}
+                chunk_id += 1
+
+        if pending is not None:
+            yield pending
+
+    @timed("cv.chunk")
+    def chunk_sections(self, sections: list[dict]) -> list["CVChunk"]:
+        """Chunk sections into smaller items based on bullet points and headings.
+        Args:
+            sections (list[dict]): A list of sections with their content and line numbers.
+        Return:
+            list[CVChunk]: A list of CVChunk models representing the chunks.
+        """
+        from interview_prep.schemas.cv_schema import CVChunk
+
+        chunks = [CVChunk(**row) for row in self._iter_chunk_rows(sections)]
+        increment("cv.chunks", len(chunks))
+        return chunks
+
+    @timed("cv.chunk")
+    def chunk_sections_batch(self, sections: list[dict]) -> "ChunkBatch":
+        """Chunk sections like ``chunk_sections``, into a columnar ``ChunkBatch``.
+
+        No pydantic model is built until a chunk is accessed or exported.
+        Args:
+            sections (list[dict]): A list of sections with their content and line numbers.
+        Return:
+            ChunkBatch: The chunks, stored column by column.
+        """
+        from interview_prep.schemas.chunk_batch import ChunkBatchBuilder
 
-        return chunks
\ No newline at end of file
+        builder = ChunkBatchBuilder(kind="CV")
+        for row in self._iter_chunk_rows(sections):
+            builder.append(**row)
+        batch = builder.build()
+        increment("cv.chunks", len(batch))
+        return batch
@@ -1,65 +1,212 @@
-from llama_index.readers.file import PDFReader
 from interview_prep.utils.text_tools import normalize_text
 from config import config
 from pathlib import Path
 from interview_prep.schemas.cv_schema import Document
+from interview_prep.CV.text_cache import ExtractionCache
+from interview_prep.utils.instrumentation import increment, stage, timed
+from interview_prep.utils.parallel import map_unordered
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable, Iterator, Optional, Union
+import io
+import logging
 
+if TYPE_CHECKING:
+    import mmap
 
-import pymupdf
+    import pymupdf
 
 
 cfg = config
+logger = logging.getLogger(__name__)
+
+
+def _read_cv_worker(file_path: str, cache: Optional[ExtractionCache]) -> Document:
+    """Read a single CV inside a worker process."""
+    return CVReader(use_cache=cache is not None, cache=cache).read_cv(file_path)
+
+
+def _split_at_safe_break(text: str) -> tuple[str, str]:
+    """Split a text at its last line break that normalization cannot change.
+
+    That is a newline between two non-whitespace characters, the first not a
+    hyphen or a comma, so ``normalize_text(head + "\\n" + tail)`` is
+    ``normalize_text(head) + "\\n" + normalize_text(tail)``. The head is empty
+    when there is no such break.
+    """
+    index = len(text)
+    while True:
+        index = text.rfind("\n", 0, index)
+        if index <= 0:
+            return "", text
+        before, after = text[index - 1], text[index + 1:index + 2]
+        if after and not after.isspace() and not before.isspace() and before not in "-,":
+            return text[:index], text[index + 1:]
+
+
+def _report_failure(file_path: str, error: BaseException) -> None:
+    """Default failure handler for batch reads."""
+    logger.warning("Failed to read %s: %r", file_path, error)
+
 
 class CVReader:
     """A class to read and parse CVs from PDF files."""
 
-    def __init__(self):
-        pass
-        
+    def __init__(self, use_cache: bool = True, cache: Optional[ExtractionCache] = None):
+        """Create a CV reader.
+
+        Args:
+            use_cache (bool): Whether to store and reuse extracted text on disk.
+            cache (ExtractionCache, optional): Cache to use. Defaults to one under ``config.data_dir``.
+        """
+        self.use_cache = use_cache
+        self.cache = cache if cache is not None else (ExtractionCache() if use_cache else None)
+
 
-    def read_cv(self, file_path: str) -> str:
+    @timed("cv.read")
+    def read_cv(self, file_path: str) -> Document:
         """Read and extract text from a CV PDF file.
 
         Args:
             file_path (str): The path to the CV PDF file.
         """
-        #create structured data dictionary
-        structured_data = {}
-        structured_data["category"] = "CV"
-        structured_data["source"] = file_path
-
-
         pdf_path = Path(file_path)
     
-        #for caching purpose
-        file_name = pdf_path.stem
-        text_file = file_name + ".txt"
-        print("file name : ", file_name)
-        print("text file name : ", text_file)
+        logger.debug("Reading CV %s", file_path)
         if not pdf_path.exists():
             raise FileNotFoundError(f"The file {file_path} does not exist.")
         
-        doc = pymupdf.open(file_path)
-        text = ""
-        for page in doc:
+        return self._read_pdf(pdf_path.read_bytes(), file_path)
+
+    @timed("cv.read")
+    def read_cv_bytes(self, pdf_data: Union[bytes, bytearray, memoryview, "mmap.mmap", BinaryIO],
+                      source: str = "<bytes>") -> Document:
+        """Read and extract text from a CV PDF held in memory, without writing it to disk.
+
+        Args:
+            pdf_data (Union[bytes, memoryview, BinaryIO]): The PDF content: bytes, any buffer
+                (``bytearray``, ``memoryview``, ``mmap``) or a binary file object, read from its
+                current position to its end. A file object is left at its end, a ``BytesIO``
+                too, although its buffer is used in place rather than copied.
+            source (str): Source recorded in the document, e.g. the uploaded file name.
+        """
+        logger.debug("Reading CV %s from memory", source)
+        if hasattr(pdf_data, "getbuffer"):
+            stream = pdf_data
+            pdf_data = stream.getbuffer()[stream.tell():]
+            # consume the stream like read() does
+            stream.seek(0, io.SEEK_END)
+        elif hasattr(pdf_data, "read"):
+            pdf_data = pdf_data.read()
+        # pymupdf opens a memoryview in place, and one over a mmap is released before the mmap is closed
+        with memoryview(pdf_data) as view:
+            if not view.nbytes:
+                raise ValueError(f"The CV {source} is empty.")
+            return self._read_pdf(view.cast("B"), source)
+
+    def _read_pdf(self, pdf_bytes: Union[bytes, memoryview], source: str) -> Document:
+        #create structured data dictionary
+        structured_data = {}
+        structured_data["category"] = "CV"
+        structured_data["source"] = source
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(pdf_bytes)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                increment("cv.cache_hits")
+                structured_data.update(cached)
+                return Document(**structured_data)
+
+        import pymupdf
+
+        raw_pages = []
+        normalized_pages = []
+        with stage("cv.extract"), pymupdf.open(stream=pdf_bytes, filetype="pdf") as doc:
+            for raw_page, normalized_page in self._iter_document_pages(doc):
+                raw_pages.append(raw_page)
+                normalized_pages.append(normalized_page)
+
+        structured_data["raw_text"] = "".join(raw_pages)
+        structured_data["normalized_text"] = "\n".join(page for page in normalized_pages if page)
+        structured_data["page_offsets"] = self._page_offsets(normalized_pages)
 
-            text += page.get_text()
-            
-            normalized_text = normalize_text(text)
-            structured_data["raw_text"] = text
-            structured_data["normalized_text"] = normalized_text
-            print(structured_data["raw_text"])
-        
         document = Document(**structured_data)
-        
-        print(document.normalized_text)
+        if cache_key is not None:
+            self.cache.put(cache_key, document.raw_text, document.normalized_text, document.page_offsets)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Normalized text of %s:\n%s", source, document.normalized_text)
         return document
 
-        
-        
+    def iter_pages(self, file_path: str) -> Iterator[tuple[str, str]]:
+        """Stream the pages of a CV PDF file, extracting and normalizing each page once.
 
+        Args:
+            file_path (str): The path to the CV PDF file.
+        Return:
+            Iterator[tuple[str, str]]: The raw and normalized text of each page.
+        """
+        if not Path(file_path).exists():
+            raise FileNotFoundError(f"The file {file_path} does not exist.")
 
-        
+        import pymupdf
 
+        with pymupdf.open(file_path) as doc:
+            yield from self._iter_document_pages(doc)
 
+    @staticmethod
+    def _iter_document_pages(doc: "pymupdf.Document") -> Iterator[tuple[str, str]]:
+        # the lines after the last safe break of a page are normalized with the
+        # next page, so a word hyphenated or a list broken across pages is repaired
+        # like in the whole text; a page is yielded once the next one is read
+        carry = ""
+        previous = None
+        for page in doc:
+            raw_page = page.get_text()
+            increment("cv.pages")
+            if previous is not None:
+                head, carry = _split_at_safe_break(carry + previous)
+                yield previous, normalize_text(head)
+            previous = raw_page
+        if previous is not None:
+            yield previous, normalize_text(carry + previous)
+
+    @staticmethod
+    def _page_offsets(normalized_pages: list[str]) -> list[int]:
+        """Start offset of every page inside the normalized text, the non-empty pages joined by newlines."""
+        offsets = []
+        offset = 0
+        for page in normalized_pages:
+            offsets.append(offset)
+            if page:
+                offset += len(page) + 1
+        return offsets
+
+    def read_many(self,
+                  file_paths: Iterable[str],
+                  workers: Optional[int] = None,
+                  max_in_flight: Optional[int] = None,
+                  on_error: Callable[[str, BaseException], None] = _report_failure,
+                  ) -> Iterator[Document]:
+        """Read many CV PDF files in parallel over a process pool.
+
+        Documents are yielded as soon as they finish, so the output order is
+        not the input order. A failing file is reported through ``on_error``
+        and does not abort the batch.
 
+        Args:
+            file_paths (Iterable[str]): Paths of the CV PDF files to read.
+            workers (int, optional): Number of worker processes. Defaults to the CPU count.
+            max_in_flight (int, optional): Maximum number of files submitted but not yet
+                consumed. Defaults to twice the number of workers.
+            on_error (Callable): Called with the file path and the raised exception.
+        Return:
+            Iterator[Document]: The parsed documents, in completion order.
+        """
+        paths = (str(path) for path in file_paths)
+        for path, document, error in map_unordered(_read_cv_worker, paths, self.cache,
+                                                   workers=workers, max_in_flight=max_in_flight):
+            if error is not None:
+                on_error(path, error)
+            else:
+                yield document
@@ -0,0 +1,66 @@
+"""Content-addressed on-disk cache for extracted CV text."""
+
+import hashlib
+import inspect
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from config import config
+from interview_prep.utils import text_tools
+from interview_prep.utils.disk_cache import DiskCache
+
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# bump when the layout of cached entries changes
+CACHE_FORMAT = "3"
+
+
+@lru_cache(maxsize=1)
+def normalizer_version() -> str:
+    """Fingerprint of the text normalization code.
+
+    Any change to ``utils/text_tools.py`` produces a new fingerprint, so cached
+    entries built with an older ``normalize_text`` are never read back.
+    """
+    source = inspect.getsource(text_tools)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+class ExtractionCache(DiskCache):
+    """On-disk cache of raw and normalized text extracted from PDF files.
+
+    Entries are keyed by a hash of the PDF bytes plus the normalizer version,
+    one JSON file each. The cache is bounded by ``max_bytes``; when it grows
+    past the cap the least recently used entries are evicted (see ``DiskCache``).
+    """
+
+    suffix = ".json"
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(cache_dir if cache_dir is not None else config.data_dir / "cache" / "cv_text", max_bytes)
+
+    def key(self, pdf_bytes: bytes) -> str:
+        """Compute the cache key for the given PDF content."""
+        digest = hashlib.sha256(pdf_bytes)
+        digest.update(normalizer_version().encode("ascii"))
+        digest.update(CACHE_FORMAT.encode("ascii"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached ``raw_text``, ``normalized_text`` and ``page_offsets`` for a key, if any."""
+        payload = self._read(key)
+        if payload is None:
+            return None
+        try:
+            return json.loads(payload)
+        except json.JSONDecodeError:
+            return None
+
+    def put(self, key: str, raw_text: str, normalized_text: str, page_offsets: Optional[list[int]] = None) -> None:
+        """Store extracted text for a key and evict old entries if over the cap."""
+        self._write(key, json.dumps({"raw_text": raw_text,
+                                     "normalized_text": normalized_text,
+                                     "page_offsets": page_offsets or []}).encode("utf-8"))
@@ -7,7 +7,8 @@ __all__ = ["__version__", "main"]
 
 def main() -> None:
     """Entry point for the CLI application."""
-    print(f"Interview Prep Tool v{__version__}")
-    print("Welcome to your interview preparation assistant!")
-    print("\nUse 'interview-prep --help' for more information.")
+    import sys
 
+    from interview_prep.cli import main as cli_main
+
+    sys.exit(cli_main())
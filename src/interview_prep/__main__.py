@@ -0,0 +1,3 @@
+from interview_prep import main
+
+main()
@@ -0,0 +1 @@
+"""HTTP service for CV and job description parsing."""
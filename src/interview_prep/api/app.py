@@ -0,0 +1,128 @@
+"""FastAPI application exposing CV and job description parsing.
+
+Parsing is CPU bound, so every request is shipped to a warm process pool and
+awaited; the event loop only handles I/O. Concurrency is bounded by a
+semaphore, every request has a timeout and uploads have a size limit.
+
+Run with:
+    uvicorn interview_prep.api.app:app
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Literal, Optional
+
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from pydantic import BaseModel
+
+from config import config
+from interview_prep.api import workers
+
+
+class JobDescriptionRequest(BaseModel):
+    text: str
+    source: str = "request"
+    max_chunk_size: int = 500
+    # keyword matching, see pipeline.SKILL_MATCHERS
+    skills: Literal["substring", "spacy"] = "substring"
+
+
+def create_app(num_workers: Optional[int] = None,
+               max_concurrency: Optional[int] = None,
+               timeout: Optional[float] = None,
+               max_upload_bytes: Optional[int] = None) -> FastAPI:
+    """Create the parsing service.
+
+    Args:
+        num_workers (int, optional): Size of the process pool. Defaults to ``config.api_workers``.
+        max_concurrency (int, optional): Requests parsed at the same time; others wait.
+            Defaults to ``config.api_max_concurrency``.
+        timeout (float, optional): Seconds before a request fails with 504. Defaults to ``config.api_timeout``.
+        max_upload_bytes (int, optional): Largest CV upload or job description text; larger ones
+            fail with 413. Defaults to ``config.api_max_upload_bytes``.
+    Return:
+        FastAPI: The application.
+    """
+    num_workers = num_workers or config.api_workers
+    max_concurrency = max_concurrency or config.api_max_concurrency
+    timeout = timeout or config.api_timeout
+    max_upload_bytes = max_upload_bytes or config.api_max_upload_bytes
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        executor = ProcessPoolExecutor(max_workers=num_workers)
+        loop = asyncio.get_running_loop()
+        # start every worker now and import the parsers there, not on the first request
+        await asyncio.gather(*(loop.run_in_executor(executor, workers.warm_up) for _ in range(num_workers)))
+        app.state.executor = executor
+        app.state.semaphore = asyncio.Semaphore(max_concurrency)
+        try:
+            yield
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    app = FastAPI(title="Interview Prep parsing service", lifespan=lifespan)
+
+    async def run_in_pool(func, *args):
+        loop = asyncio.get_running_loop()
+        semaphore = app.state.semaphore
+        await semaphore.acquire()
+        try:
+            future = app.state.executor.submit(func, *args)
+        except BaseException:
+            semaphore.release()
+            raise
+        # the slot is freed when the worker is done with the job, not when the
+        # client stops waiting, so timed out jobs still count against the limit
+        future.add_done_callback(lambda _: _release_from_thread(loop, semaphore))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            # a job still queued is cancelled, a running one finishes in the background
+            raise HTTPException(status_code=504, detail=f"Parsing took longer than {timeout} seconds.")
+
+    def too_large() -> HTTPException:
+        return HTTPException(status_code=413, detail=f"Uploads are limited to {max_upload_bytes} bytes.")
+
+    @app.get("/health")
+    async def health() -> dict:
+        return {"status": "ok"}
+
+    @app.post("/cv")
+    async def parse_cv(file: UploadFile = File(...)) -> dict:
+        if file.size is not None and file.size > max_upload_bytes:
+            raise too_large()
+        pdf_bytes = await file.read(max_upload_bytes + 1)
+        if len(pdf_bytes) > max_upload_bytes:
+            raise too_large()
+        if not pdf_bytes:
+            raise HTTPException(status_code=400, detail="Empty file.")
+        try:
+            return await run_in_pool(workers.parse_cv, pdf_bytes, file.filename or "upload.pdf")
+        except workers.ParseError as e:
+            raise HTTPException(status_code=422, detail=f"Could not parse CV: {e}")
+
+    @app.post("/job-description")
+    async def parse_job_description(request: JobDescriptionRequest) -> dict:
+        if len(request.text.encode("utf-8")) > max_upload_bytes:
+            raise too_large()
+        try:
+            return await run_in_pool(workers.parse_job_description,
+                                     request.text, request.source, request.max_chunk_size, request.skills)
+        except workers.ParseError as e:
+            raise HTTPException(status_code=422, detail=f"Could not parse job description: {e}")
+
+    return app
+
+
+def _release_from_thread(loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore) -> None:
+    # executor futures call back from the executor's thread, the semaphore belongs to the loop
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        # the loop is closed, the service is shutting down
+        pass
+
+
+app = create_app()
@@ -0,0 +1,57 @@
+"""Parsing jobs executed inside the service's worker processes.
+
+Everything here runs in a child process: the functions take and return plain
+picklable data so the event loop process never touches pymupdf or the parsers.
+"""
+
+import importlib.util
+import os
+
+from interview_prep.CV.cv_reader import CVReader
+from interview_prep.job_descripition.job_parser import JobDescriptionParser, get_keyword_matcher, get_skill_extractor
+from interview_prep.pipeline import cv_record, job_description_record
+from interview_prep.utils.header_index import get_cv_header_index, get_job_description_header_index
+from interview_prep.utils.text_tools import get_normalizer
+
+
+def warm_up() -> int:
+    """Load what the first request would otherwise pay for.
+
+    That is pymupdf, the shared parsing tables and, when spaCy is installed, the
+    pipeline and phrase matcher of the ``skills="spacy"`` requests.
+    """
+    # CVReader imports pymupdf on first use only
+    import pymupdf
+
+    get_normalizer()
+    get_keyword_matcher()
+    get_cv_header_index()
+    get_job_description_header_index()
+    if importlib.util.find_spec("spacy") is not None:
+        # loads the spaCy pipeline, then builds the phrase matcher on it
+        get_skill_extractor().matcher
+    return os.getpid()
+
+
+class ParseError(ValueError):
+    """The uploaded document itself could not be parsed, e.g. a corrupt or empty PDF."""
+
+
+def parse_cv(pdf_bytes: bytes, filename: str) -> dict:
+    """Read, section and chunk an uploaded CV PDF, straight from memory."""
+    import pymupdf
+
+    try:
+        document = CVReader().read_cv_bytes(pdf_bytes, source=filename)
+    except (ValueError, pymupdf.FileDataError) as e:
+        raise ParseError(str(e)) from e
+    return cv_record(document)
+
+
+def parse_job_description(text: str, source: str, max_chunk_size: int, skills: str = "substring") -> dict:
+    """Normalize, chunk and score a job description text, matching keywords as ``skills`` says."""
+    try:
+        document = JobDescriptionParser().parse_text(text, source=source)
+        return job_description_record(document, max_chunk_size=max_chunk_size, skills=skills)
+    except ValueError as e:
+        raise ParseError(str(e)) from e
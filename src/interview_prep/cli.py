@@ -0,0 +1,336 @@
+"""Command line interface.
+
+Subcommands run the whole pipeline over directories of documents and stream
+one JSONL record per document to the output file as soon as it is done.
+Documents already present in the output are skipped, so an interrupted run
+can simply be started again; failed documents are retried, and their earlier
+error records are removed once the retry is recorded. ``watch`` keeps polling
+the inputs and re-chunks only the edited sections of every changed document,
+and retries the documents that failed on every poll.
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from interview_prep.__version__ import __version__
+from interview_prep.job_descripition.token_packer import DEFAULT_TOKENIZER_NAME
+
+
+logger = logging.getLogger(__name__)
+
+
+def iter_input_files(inputs: Iterable[str], pattern: str) -> Iterator[str]:
+    """Expand files and directories (searched recursively for ``pattern``) into sorted file paths."""
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            for file_path in sorted(path.rglob(pattern)):
+                if file_path.is_file():
+                    yield str(file_path)
+        else:
+            yield str(path)
+
+
+def completed_sources(output: Path) -> Set[str]:
+    """Sources of the documents already processed successfully in an output file."""
+    return _output_sources(output)[0]
+
+
+def _output_sources(output: Path) -> Tuple[Set[str], Set[str]]:
+    """Sources with a successful record, and sources with error records only, in an output file."""
+    done, failed = set(), set()
+    if not output.exists():
+        return done, failed
+    with output.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # a line cut short by an interrupted run
+                continue
+            if "error" in record:
+                failed.add(record["source"])
+            else:
+                done.add(record["source"])
+    return done, failed - done
+
+
+def drop_error_records(output: Path, sources: Set[str], end: int) -> int:
+    """Rewrite an output file without the error records of ``sources`` found before byte ``end``.
+
+    Args:
+        output (Path): The JSONL output file.
+        sources (Set[str]): Sources whose earlier error records are dropped.
+        end (int): Offset of the first record kept whatever it is, e.g. where a run started appending.
+    Return:
+        int: Number of records dropped.
+    """
+    dropped = 0
+    tmp_path = output.with_name(f"{output.name}.{os.getpid()}.tmp")
+    with output.open("rb") as src, tmp_path.open("wb") as dst:
+        while src.tell() < end:
+            line = src.readline()
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            if isinstance(record, dict) and "error" in record and record.get("source") in sources:
+                dropped += 1
+                continue
+            dst.write(line)
+        shutil.copyfileobj(src, dst)
+    os.replace(tmp_path, output)
+    return dropped
+
+
+def run_batch(process: Callable[..., dict],
+              inputs: Iterable[str],
+              output: Path,
+              jobs: int,
+              resume: bool = True,
+              extra_args: tuple = (),
+              find_duplicates: Optional[Callable[[List[str]], Tuple[List[str], Dict[str, list]]]] = None,
+              duplicate_record: Optional[Callable[[dict, str, float], dict]] = None) -> dict:
+    """Process every input file and append one JSONL record per document to ``output``.
+
+    Args:
+        process (Callable[..., dict]): Picklable function turning a file path into a record.
+        inputs (Iterable[str]): File paths to process.
+        output (Path): JSONL file the records are appended to.
+        jobs (int): Number of worker processes; 1 processes the files in this process.
+        resume (bool): Skip files whose record is already in ``output``. Files that failed are
+            processed again, and their earlier error records removed from ``output``.
+        extra_args (tuple): Extra arguments passed to ``process`` after the file path.
+        find_duplicates (Callable, optional): Splits the files left to process into canonical
+            files and ``{canonical: [(duplicate, similarity), ...]}``. Duplicates are not
+            processed: their record is ``duplicate_record(canonical_record, duplicate, similarity)``.
+        duplicate_record (Callable, optional): Builds the record of a duplicate, see ``find_duplicates``.
+    Return:
+        dict: Counts of processed, duplicate, failed and skipped documents.
+    """
+    from interview_prep.utils.parallel import map_unordered
+
+    done, failed_before = _output_sources(output) if resume else (set(), set())
+    retried = set()
+    stats = {"processed": 0, "duplicates": 0, "failed": 0, "skipped": 0}
+
+    duplicates: Dict[str, list] = {}
+    if find_duplicates is not None:
+        inputs = list(inputs)
+        stats["skipped"] = sum(file_path in done for file_path in inputs)
+        inputs, duplicates = find_duplicates([file_path for file_path in inputs if file_path not in done])
+
+    def pending() -> Iterator[str]:
+        for file_path in inputs:
+            if file_path in done:
+                stats["skipped"] += 1
+                continue
+            yield file_path
+
+    if jobs == 1:
+        def results():
+            for file_path in pending():
+                try:
+                    yield file_path, process(file_path, *extra_args), None
+                except Exception as e:
+                    yield file_path, None, e
+    else:
+        def results():
+            return map_unordered(process, pending(), *extra_args, workers=jobs)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    mode = "a" if resume else "w"
+    if resume and output.exists() and output.stat().st_size:
+        # make sure a record cut short by an interrupted run does not swallow the next one
+        with output.open("rb") as f:
+            f.seek(-1, 2)
+            needs_newline = f.read(1) != b"\n"
+        if needs_newline:
+            with output.open("a", encoding="utf-8") as f:
+                f.write("\n")
+    start = output.stat().st_size if resume and output.exists() else 0
+
+    with output.open(mode, encoding="utf-8") as f:
+        for file_path, record, error in results():
+            if error is not None:
+                logger.warning("Failed to process %s: %r", file_path, error)
+                record = {"source": file_path, "error": repr(error)}
+                stats["failed"] += 1
+            else:
+                stats["processed"] += 1
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if file_path in failed_before:
+                retried.add(file_path)
+
+            for duplicate_path, similarity in duplicates.pop(file_path, ()):
+                if error is None:
+                    try:
+                        duplicate = duplicate_record(record, duplicate_path, similarity)
+                        stats["duplicates"] += 1
+                    except Exception as e:
+                        logger.warning("Failed to process %s: %r", duplicate_path, e)
+                        duplicate = {"source": duplicate_path, "error": repr(e)}
+                        stats["failed"] += 1
+                else:
+                    duplicate = {"source": duplicate_path, "error": repr(error), "duplicate_of": file_path}
+                    stats["failed"] += 1
+                f.write(json.dumps(duplicate, ensure_ascii=False) + "\n")
+                if duplicate_path in failed_before:
+                    retried.add(duplicate_path)
+            f.flush()
+
+    # the new records of the retried files supersede their earlier errors
+    if retried:
+        drop_error_records(output, retried, start)
+    return stats
+
+
+def _add_batch_arguments(parser: argparse.ArgumentParser, default_pattern: str) -> None:
+    parser.add_argument("inputs", nargs="+", help="Files or directories to process")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="JSONL file to append the records to")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of worker processes")
+    parser.add_argument("--pattern", default=default_pattern, help="File pattern searched in directories")
+    parser.add_argument("--no-resume", dest="resume", action="store_false",
+                        help="Overwrite the output instead of skipping documents already in it")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="interview-prep",
+                                     description="Interview Preparation Tool - A comprehensive tool "
+                                                 "for technical interview preparation.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log debug previews of every stage")
+    subparsers = parser.add_subparsers(dest="command")
+
+    cv_parser = subparsers.add_parser("cv", help="Read, section and chunk CV PDFs")
+    _add_batch_arguments(cv_parser, "*.pdf")
+    cv_parser.add_argument("--no-cache", dest="use_cache", action="store_false",
+                           help="Do not use the on-disk extraction cache")
+
+    jd_parser = subparsers.add_parser("jd", help="Chunk and score job description text files")
+    _add_batch_arguments(jd_parser, "*.txt")
+    jd_parser.add_argument("--max-chunk-size", type=int, default=500, help="Maximum chunk size in characters")
+    jd_parser.add_argument("--max-tokens", type=int,
+                           help="Split sections to this many tokens instead of --max-chunk-size characters")
+    jd_parser.add_argument("--token-overlap", type=int, default=0,
+                           help="Tokens a chunk repeats from the previous one, with --max-tokens")
+    jd_parser.add_argument("--tokenizer", default=DEFAULT_TOKENIZER_NAME,
+                           help="transformers tokenizer counting the tokens, with --max-tokens")
+    jd_parser.add_argument("--skills", choices=["substring", "spacy"], default="substring",
+                           help="Match keywords as substrings, or as whole spaCy tokens (slower below about "
+                                "a thousand keywords, loads spaCy in every worker)")
+    jd_parser.add_argument("--dedup-threshold", type=float,
+                           help="Reuse the chunks and scores of an earlier job description for its near-duplicates "
+                                "at this estimated similarity (e.g. 0.85) instead of processing them again")
+
+    watch_parser = subparsers.add_parser("watch", help="Re-chunk documents incrementally whenever they change",
+                                         description="Re-chunk documents incrementally whenever they change. "
+                                                     "Documents that fail are retried on every poll until they "
+                                                     "succeed; their error is logged and recorded once.")
+    watch_parser.add_argument("kind", choices=["cv", "jd"], help="Kind of the watched documents")
+    watch_parser.add_argument("inputs", nargs="+", help="Files or directories to watch")
+    watch_parser.add_argument("-o", "--output", type=Path, help="JSONL file to append the updated records to")
+    watch_parser.add_argument("--pattern", help="File pattern searched in directories (default *.pdf or *.txt)")
+    watch_parser.add_argument("--interval", type=float, default=1.0, help="Seconds between polls")
+    watch_parser.add_argument("--state-dir", type=Path, help="Directory of the incremental state files")
+    watch_parser.add_argument("--max-chunk-size", type=int, default=500, help="Maximum chunk size in characters")
+    watch_parser.add_argument("--no-cache", dest="use_cache", action="store_false",
+                              help="Do not use the on-disk extraction cache")
+
+    return parser
+
+
+def run_watch(args: argparse.Namespace) -> int:
+    """Re-chunk every watched document when it changes, until interrupted."""
+    from interview_prep.incremental import IncrementalChunker, watch
+
+    chunker = IncrementalChunker(state_dir=args.state_dir, max_chunk_size=args.max_chunk_size)
+    if args.kind == "cv":
+        def process(file_path):
+            return chunker.update_cv(file_path, use_cache=args.use_cache)
+    else:
+        process = chunker.update_job_description
+    pattern = args.pattern or ("*.pdf" if args.kind == "cv" else "*.txt")
+
+    def on_removed(file_path):
+        logger.info("%s removed", file_path)
+        chunker.forget(file_path)
+
+    output = None
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        output = args.output.open("a", encoding="utf-8")
+    # failed files are retried on every poll: only a new error is logged and recorded
+    errors: Dict[str, str] = {}
+    logger.info("Watching %s every %.1fs, Ctrl+C to stop", ", ".join(args.inputs), args.interval)
+    try:
+        for file_path, record, error in watch(lambda: iter_input_files(args.inputs, pattern), process,
+                                              interval=args.interval, on_removed=on_removed):
+            if error is not None:
+                if errors.get(file_path) == repr(error):
+                    continue
+                errors[file_path] = repr(error)
+                logger.warning("Failed to process %s: %r", file_path, error)
+                record = {"source": file_path, "error": repr(error)}
+            else:
+                errors.pop(file_path, None)
+                logger.info("%s: %d chunks, %d changed, %d removed", file_path, len(record["chunks"]),
+                            len(record["changed_chunk_ids"]), len(record["removed_chunk_ids"]))
+            if output is not None:
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if output is not None:
+            output.close()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(levelname)s %(name)s: %(message)s")
+
+    if args.command is None:
+        print(f"Interview Prep Tool v{__version__}")
+        print("Welcome to your interview preparation assistant!")
+        print("\nUse 'interview-prep --help' for more information.")
+        return 0
+
+    if args.command == "watch":
+        return run_watch(args)
+
+    from interview_prep import pipeline
+
+    find_duplicates = duplicate_record = None
+    if args.command == "cv":
+        process, extra_args = pipeline.process_cv_file, (args.use_cache,)
+    else:
+        process = pipeline.process_job_description_file
+        extra_args = (args.max_chunk_size, args.max_tokens, args.token_overlap, args.tokenizer, args.skills)
+        if args.dedup_threshold is not None:
+            def find_duplicates(file_paths):
+                return pipeline.find_duplicate_job_descriptions(file_paths, threshold=args.dedup_threshold)
+            duplicate_record = pipeline.duplicate_job_description_record
+
+    start = time.perf_counter()
+    stats = run_batch(process, iter_input_files(args.inputs, args.pattern), args.output,
+                      jobs=args.jobs, resume=args.resume, extra_args=extra_args,
+                      find_duplicates=find_duplicates, duplicate_record=duplicate_record)
+    logger.info("%d processed, %d duplicates, %d failed, %d skipped in %.1fs -> %s",
+                stats["processed"], stats["duplicates"], stats["failed"], stats["skipped"],
+                time.perf_counter() - start, args.output)
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Streamlit dashboard reviewing parsed CVs and job descriptions."""
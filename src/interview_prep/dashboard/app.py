@@ -0,0 +1,205 @@
+"""Streamlit dashboard showing the sections, chunks and relevance scores of a CV and a job description.
+
+Streamlit reruns this script on every widget interaction. The readers, parsers
+and the spaCy model are built once per server process (``st.cache_resource``),
+and the parsed documents, chunks and scores are cached by the SHA-256 of the
+file and the parsing options (``st.cache_data``), so changing a filter or the
+number of results only re-renders.
+
+Run with:
+    streamlit run src/interview_prep/dashboard/app.py
+"""
+
+import hashlib
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import streamlit as st
+
+from config import config
+from interview_prep.CV.chunker import CVChunker
+from interview_prep.CV.cv_reader import CVReader
+from interview_prep.job_descripition.job_parser import JobDescriptionParser, get_skill_extractor
+from interview_prep.retrieval.bm25_index import BM25Index
+from interview_prep.schemas.cv_schema import CVChunk, Document
+
+
+CV_DIR = config.data_dir / "CVs" / "raw"
+JOB_DESCRIPTION_DIR = config.data_dir / "job_descriptions"
+
+EXTRACTORS = {
+    "Keywords (substrings)": None,
+    "Skills (spaCy tokens)": "spacy",
+}
+
+
+@st.cache_resource
+def load_cv_reader() -> CVReader:
+    return CVReader()
+
+
+@st.cache_resource
+def load_cv_chunker() -> CVChunker:
+    return CVChunker()
+
+
+@st.cache_resource
+def load_job_description_parser() -> JobDescriptionParser:
+    return JobDescriptionParser()
+
+
+@st.cache_resource(show_spinner="Loading the spaCy model...")
+def load_skill_extractor():
+    return get_skill_extractor()
+
+
+@st.cache_data(show_spinner="Reading the CV...")
+def parse_cv(digest: str, source: str, _pdf_bytes: bytes) -> Tuple[Document, List[dict], List[CVChunk]]:
+    """Read, section and chunk a CV PDF; cached by ``digest``, the content is not hashed again."""
+    document = load_cv_reader().read_cv_bytes(_pdf_bytes, source=source)
+    chunker = load_cv_chunker()
+    sections = chunker._retrieve_sections(document)
+    return document, sections, chunker.chunk_sections(sections)
+
+
+@st.cache_data(show_spinner="Scoring the job description...")
+def parse_job_description(digest: str, source: str, max_chunk_size: int, extractor: Optional[str],
+                          _text_bytes: bytes) -> Tuple[Document, List[dict], list, List[dict]]:
+    """Parse, section, chunk and score a job description; cached by ``digest`` and the options."""
+    parser = load_job_description_parser()
+    document = parser.parse_bytes(_text_bytes, source=source)
+    sections = parser._create_sections(document)
+    chunks, scored_chunks = parser.process(document, max_chunk_size=max_chunk_size, sections=sections,
+                                           extractor=load_skill_extractor() if extractor else None)
+    return document, sections, chunks, scored_chunks
+
+
+@st.cache_data(show_spinner="Ranking CV evidence...")
+def rank_evidence(cv_digest: str, jd_digest: str, max_chunk_size: int, extractor: Optional[str],
+                  top_k: int, k: int, _cv_chunks: List[CVChunk], _scored_chunks: List[dict]) -> List[dict]:
+    """BM25 ranked CV chunks for the ``top_k`` best job description chunks."""
+    index = BM25Index()
+    index.add(cv_digest, _cv_chunks)
+    return index.evidence(_scored_chunks, top_k=top_k, k=k)
+
+
+def select_input(label: str, folder: Path, extensions: List[str]) -> Optional[Tuple[str, bytes]]:
+    """An uploaded file, or one of ``folder``; its source name and content."""
+    uploaded = st.sidebar.file_uploader(label, type=extensions)
+    if uploaded is not None:
+        return uploaded.name, uploaded.getvalue()
+    files = sorted(path for path in folder.glob("*") if path.suffix.lstrip(".") in extensions) \
+        if folder.is_dir() else []
+    if files:
+        path = st.sidebar.selectbox(f"or one of {folder.name}/", files, index=None, format_func=lambda p: p.name)
+        if path is not None:
+            return str(path), path.read_bytes()
+    return None
+
+
+def format_hits(hits: dict) -> str:
+    return "; ".join(f"{category}: {', '.join(found)}" for category, found in hits.items() if found)
+
+
+def show_sections(sections: List[dict]) -> None:
+    for section in sections:
+        with st.expander(f"{section['section']} ({len(section['content'])} lines)"):
+            st.text("\n".join(section["content"]))
+
+
+def show_cv(document: Document, sections: List[dict], chunks: List[CVChunk]) -> None:
+    st.subheader(f"CV: {Path(document.source).name}")
+    sections_tab, chunks_tab, text_tab = st.tabs(["Sections", "Chunks", "Normalized text"])
+    with sections_tab:
+        show_sections(sections)
+    with chunks_tab:
+        names = list(dict.fromkeys(chunk.section for chunk in chunks))
+        selected = st.multiselect("Sections", names, default=names, key=f"cv_sections_{document.source}")
+        st.dataframe([chunk.model_dump() for chunk in chunks if chunk.section in selected], hide_index=True)
+    with text_tab:
+        st.text(document.normalized_text)
+
+
+def show_job_description(document: Document, sections: List[dict], chunks: list, scored_chunks: List[dict],
+                         min_score: int) -> None:
+    st.subheader(f"Job description: {Path(document.source).name}")
+    relevance_tab, sections_tab, chunks_tab = st.tabs(["Relevance", "Sections", "Chunks"])
+    with relevance_tab:
+        st.dataframe([{"id": item["chunk"].id, "section": item["chunk"].section, "score": item["score"],
+                       "hits": format_hits(item["hits"]), "text": item["chunk"].text}
+                      for item in scored_chunks if item["score"] >= min_score], hide_index=True)
+    with sections_tab:
+        show_sections(sections)
+    with chunks_tab:
+        st.dataframe([chunk.model_dump() for chunk in chunks], hide_index=True)
+
+
+def show_evidence(scored_chunks: List[dict], evidence: List[dict]) -> None:
+    st.header("Job description chunks and CV evidence")
+    for item, matches in zip(scored_chunks, evidence):
+        jd_column, cv_column = st.columns(2)
+        with jd_column:
+            st.markdown(f"**#{item['chunk'].id} {item['chunk'].section}**, score {item['score']}")
+            st.write(item["chunk"].text)
+            st.caption(format_hits(item["hits"]))
+        with cv_column:
+            if not matches["evidence"]:
+                st.caption("No CV chunk shares a term with this chunk.")
+            for match in matches["evidence"]:
+                st.markdown(f"**{match['chunk'].section}**, BM25 {match['score']:.2f}")
+                st.write(match["chunk"].text)
+        st.divider()
+
+
+def main() -> None:
+    st.set_page_config(page_title="Interview Prep review", layout="wide")
+    st.sidebar.title("Documents")
+    cv_input = select_input("CV (PDF)", CV_DIR, ["pdf"])
+    jd_input = select_input("Job description (text)", JOB_DESCRIPTION_DIR, ["txt", "md"])
+    pasted = st.sidebar.text_area("or paste a job description")
+    if jd_input is None and pasted.strip():
+        jd_input = "pasted", pasted.encode("utf-8")
+
+    # parsing options are part of the cache keys, display options are not
+    st.sidebar.title("Parsing")
+    max_chunk_size = st.sidebar.slider("Job description chunk size (characters)", 100, 2000, 500, step=50)
+    extractor = EXTRACTORS[st.sidebar.radio("Keyword matching", list(EXTRACTORS))]
+    st.sidebar.title("Display")
+    top_k = st.sidebar.slider("Job description chunks", 1, 30, 10)
+    k = st.sidebar.slider("CV chunks per job description chunk", 1, 10, 3)
+    min_score = st.sidebar.number_input("Minimum relevance score", value=0, step=1)
+
+    if cv_input is None and jd_input is None:
+        st.info("Upload or select a CV and a job description in the sidebar.")
+        return
+
+    cv_column, jd_column = st.columns(2)
+    cv = jd = None
+    if cv_input is not None:
+        cv_digest = hashlib.sha256(cv_input[1]).hexdigest()
+        try:
+            cv = parse_cv(cv_digest, cv_input[0], cv_input[1])
+        except Exception as e:
+            cv_column.error(f"Could not parse CV: {e}")
+        else:
+            with cv_column:
+                show_cv(*cv)
+    if jd_input is not None:
+        jd_digest = hashlib.sha256(jd_input[1]).hexdigest()
+        try:
+            jd = parse_job_description(jd_digest, jd_input[0], max_chunk_size, extractor, jd_input[1])
+        except Exception as e:
+            jd_column.error(f"Could not parse job description: {e}")
+        else:
+            with jd_column:
+                show_job_description(*jd, min_score=min_score)
+
+    if cv is not None and jd is not None:
+        evidence = rank_evidence(cv_digest, jd_digest, max_chunk_size, extractor, top_k, k, cv[2], jd[3])
+        # the evidence is cached for the unfiltered chunks, filter both the same way
+        pairs = [(item, matches) for item, matches in zip(jd[3], evidence) if item["score"] >= min_score]
+        show_evidence([item for item, _ in pairs], [matches for _, matches in pairs])
+
+
+if __name__ == "__main__":
+    main()
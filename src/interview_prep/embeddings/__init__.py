@@ -0,0 +1 @@
+"""Embedding of CV and job description chunks."""
@@ -0,0 +1,89 @@
+"""Batched, cached embedding of CV and job description chunks."""
+
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+
+from interview_prep.embeddings.embedding_cache import EmbeddingCache, embedding_key
+from interview_prep.schemas.cv_schema import CVChunk, JobDescriptionChunk
+
+
+DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class ChunkEmbedder:
+    """Encode chunk texts with a sentence-transformers model.
+
+    Identical texts are encoded once, and vectors are cached by model name and
+    text hash, so re-running the pipeline only encodes new or changed chunks.
+    """
+
+    def __init__(self,
+                 model_name: str = DEFAULT_MODEL_NAME,
+                 batch_size: int = 64,
+                 normalize: bool = True,
+                 cache: Optional[EmbeddingCache] = None,
+                 model: Optional[Any] = None):
+        """Create a chunk embedder.
+
+        Args:
+            model_name (str): Name of the sentence-transformers model, also part of the cache key.
+            batch_size (int): Number of texts encoded per model call.
+            normalize (bool): Whether to L2 normalize the embeddings.
+            cache (EmbeddingCache, optional): Vector cache. Defaults to one under ``config.data_dir``.
+            model (Any, optional): Already loaded model exposing ``encode``. Loaded on first use otherwise.
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.normalize = normalize
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self._model = model
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def _cache_key(self, text: str) -> str:
+        model_id = f"{self.model_name}|normalized" if self.normalize else self.model_name
+        return embedding_key(model_id, text)
+
+    def embed_texts(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts, encoding only those missing from the cache.
+
+        Args:
+            texts (Sequence[str]): The texts to embed.
+        Return:
+            np.ndarray: One row per input text.
+        """
+        keys = [self._cache_key(text) for text in texts]
+
+        # deduplicate, then look every distinct text up in the cache
+        unique = dict(zip(keys, texts))
+        vectors = self.cache.get_many(unique)
+        missing_keys = [key for key in unique if key not in vectors]
+
+        for start in range(0, len(missing_keys), self.batch_size):
+            batch_keys = missing_keys[start:start + self.batch_size]
+            encoded = self.model.encode([unique[key] for key in batch_keys],
+                                        batch_size=self.batch_size,
+                                        convert_to_numpy=True,
+                                        normalize_embeddings=self.normalize)
+            self.cache.put_many(batch_keys, encoded)
+            vectors.update(zip(batch_keys, encoded))
+
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([vectors[key] for key in keys])
+
+    def embed_chunks(self, chunks: Sequence[Union[CVChunk, JobDescriptionChunk]]) -> np.ndarray:
+        """Embed the text of CV or job description chunks.
+
+        Args:
+            chunks (Sequence[Union[CVChunk, JobDescriptionChunk]]): The chunks to embed.
+        Return:
+            np.ndarray: One row per chunk, in input order.
+        """
+        return self.embed_texts([chunk.text for chunk in chunks])
@@ -0,0 +1,158 @@
+"""Two tier (memory and disk) cache of text embeddings."""
+
+import hashlib
+import io
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+from config import config
+from interview_prep.utils.disk_cache import DiskCache
+
+
+DEFAULT_MAX_ENTRIES = 50_000
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+_PACK_ERRORS = (FileNotFoundError, ValueError, KeyError, OSError, EOFError, zipfile.BadZipFile)
+
+
+def embedding_key(model_name: str, text: str) -> str:
+    """Cache key of the embedding of a text by a given model."""
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache(DiskCache):
+    """Embedding cache with a bounded in-memory LRU tier and a size-capped disk tier.
+
+    The disk tier stores the vectors of each ``put_many`` call, i.e. one
+    encoded batch, in a single ``.npz`` pack holding their keys and their
+    matrix, instead of one file per vector. The packs written by any process
+    are indexed by key when a key is not found in the known packs. Packs are
+    evicted as a whole, least recently used first (see ``DiskCache``).
+    """
+
+    suffix = ".npz"
+    sharded = True
+
+    def __init__(self,
+                 cache_dir: Optional[Path] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 use_disk: bool = True):
+        super().__init__(cache_dir if cache_dir is not None else config.data_dir / "cache" / "embeddings",
+                         max_bytes)
+        self.max_entries = max_entries
+        self.use_disk = use_disk
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        # key -> name of the pack holding its vector, and the packs already indexed
+        self._packs: Dict[str, str] = {}
+        self._indexed: set = set()
+
+    def __getstate__(self) -> dict:
+        # worker processes start with an empty memory tier and index the disk again
+        state = super().__getstate__()
+        state["_memory"] = OrderedDict()
+        state["_packs"] = {}
+        state["_indexed"] = set()
+        return state
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the cached vector of a key, if any."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Return the cached vectors of the keys found in the cache.
+
+        Every pack holding some of the keys is read once; the disk tier is
+        indexed again at most once per call.
+        """
+        found = {}
+        missing = []
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                found[key] = vector
+            else:
+                missing.append(key)
+        if not missing or not self.use_disk:
+            return found
+
+        if any(key not in self._packs for key in missing):
+            self._index_packs()
+        loaded: Dict[str, np.ndarray] = {}
+        read = set()
+        for key in missing:
+            pack = self._packs.get(key)
+            if key not in loaded and pack is not None and pack not in read:
+                read.add(pack)
+                loaded.update(self._load_pack(pack))
+            vector = loaded.get(key)
+            if vector is not None:
+                self._remember(key, vector)
+                found[key] = vector
+        return found
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """Store the vector of a key in both tiers."""
+        self.put_many([key], [vector])
+
+    def put_many(self, keys: Sequence[str], vectors: Sequence[np.ndarray]) -> None:
+        """Store the vectors of several keys in both tiers, in one pack on disk."""
+        for key, vector in zip(keys, vectors):
+            self._remember(key, vector)
+        if not self.use_disk or not len(keys):
+            return
+
+        pack = hashlib.sha256("\0".join(keys).encode("utf-8")).hexdigest()
+        buffer = io.BytesIO()
+        np.savez(buffer, keys=np.array([key.encode("utf-8") for key in keys]), vectors=np.stack(vectors))
+        self._write(pack, buffer.getvalue())
+        self._indexed.add(pack)
+        for key in keys:
+            self._packs[key] = pack
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _index_packs(self) -> None:
+        """Index the keys of the packs written since the last call, reading only their keys."""
+        for path in self._entries():
+            pack = path.stem
+            if pack in self._indexed:
+                continue
+            try:
+                with np.load(path) as data:
+                    keys = data["keys"].tolist()
+            except _PACK_ERRORS:
+                continue
+            self._indexed.add(pack)
+            for key in keys:
+                self._packs[key.decode("utf-8")] = pack
+
+    def _load_pack(self, pack: str) -> Dict[str, np.ndarray]:
+        payload = self._read(pack)
+        try:
+            if payload is None:
+                raise FileNotFoundError(pack)
+            with np.load(io.BytesIO(payload)) as data:
+                keys, vectors = data["keys"].tolist(), data["vectors"]
+        except _PACK_ERRORS:
+            # evicted, by this process or another one, or unreadable
+            self._indexed.discard(pack)
+            self._packs = {key: holder for key, holder in self._packs.items() if holder != pack}
+            return {}
+        return {key.decode("utf-8"): vector for key, vector in zip(keys, vectors)}
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        self._memory.clear()
+        self._packs.clear()
+        self._indexed.clear()
+        super().clear()
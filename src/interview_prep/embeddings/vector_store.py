@@ -0,0 +1,228 @@
+"""Append-only, memory-mapped store of chunk embeddings."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from interview_prep.schemas.cv_schema import CVChunk, JobDescriptionChunk
+
+
+METADATA_DTYPE = np.dtype([
+    ("chunk_id", np.int32),
+    ("location", np.int32),
+    ("section", np.int32),
+    ("chunk_type", np.int32),
+    ("source", np.int32),
+])
+
+
+class VectorStore:
+    """Append-only store of unit-normalized chunk embeddings.
+
+    A store is a directory holding:
+
+    - ``vectors.bin``: the raw float16/float32 vectors, memory-mapped on read;
+    - ``metadata.bin``: one fixed-size record per vector (chunk id, location and
+      string-table codes for section, chunk type and source);
+    - ``strings.jsonl``: the string table, one string per line;
+    - ``store.json``: the dimension, dtype, number of committed vectors and
+      size of the committed string table.
+
+    ``add`` writes the data files first and the header last, and starts by
+    truncating them to their committed size, so the leftovers of an
+    interrupted ``add`` are never read and are overwritten by the next one.
+
+    Several processes can open the same store read-only; the vectors are never
+    copied into process memory, they share the operating system page cache.
+    """
+
+    def __init__(self, path: Union[str, Path], dim: Optional[int] = None, dtype: Optional[str] = None):
+        """Open a store, creating it if it does not exist.
+
+        A ``dim`` or ``dtype`` other than those of an existing store raises a ``ValueError``.
+
+        Args:
+            path (Union[str, Path]): Directory of the store.
+            dim (int, optional): Vector dimension, required to create a store.
+            dtype (str, optional): ``float16`` or ``float32``. Defaults to ``float16`` when
+                creating a store, and to the store's dtype when opening one.
+        """
+        self.path = Path(path)
+        header_path = self.path / "store.json"
+        if header_path.exists():
+            header = json.loads(header_path.read_text())
+            if dim is not None and dim != header["dim"]:
+                raise ValueError(f"Store {self.path} has dimension {header['dim']}, not {dim}.")
+            if dtype is not None and np.dtype(dtype) != np.dtype(header["dtype"]):
+                raise ValueError(f"Store {self.path} has dtype {header['dtype']}, not {dtype}.")
+        else:
+            if dim is None:
+                raise ValueError(f"Store {self.path} does not exist and no dimension was given.")
+            dtype = dtype or "float16"
+            if dtype not in ("float16", "float32"):
+                raise ValueError(f"Unsupported dtype {dtype}.")
+            self.path.mkdir(parents=True, exist_ok=True)
+            header = {"dim": dim, "dtype": dtype, "count": 0, "strings_size": 0}
+            self._write_header(header)
+
+        self.dim = header["dim"]
+        self.dtype = np.dtype(header["dtype"])
+        self._count = header["count"]
+        self._strings_size = header.get("strings_size")
+        self._strings: List[str] = []
+        self._string_codes: Dict[str, int] = {}
+        self._load_strings()
+        self._vectors: Optional[np.memmap] = None
+        self._metadata: Optional[np.memmap] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _write_header(self, header: dict) -> None:
+        tmp_path = self.path / f"store.json.{os.getpid()}.tmp"
+        tmp_path.write_text(json.dumps(header))
+        os.replace(tmp_path, self.path / "store.json")
+
+    def _load_strings(self) -> None:
+        strings_path = self.path / "strings.jsonl"
+        if not strings_path.exists():
+            self._strings_size = 0
+            return
+        with strings_path.open("rb") as f:
+            data = f.read(self._strings_size) if self._strings_size is not None else f.read()
+        self._strings_size = len(data)
+        for line in data.decode("utf-8").splitlines():
+            value = json.loads(line)
+            self._string_codes[value] = len(self._strings)
+            self._strings.append(value)
+
+    def _encode_string(self, value: Optional[str], new_strings: List[str]) -> int:
+        if value is None:
+            return -1
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self._strings)
+            self._strings.append(value)
+            new_strings.append(value)
+        return code
+
+    def add(self, vectors: np.ndarray, chunks: Sequence[Union[CVChunk, JobDescriptionChunk]], source: str) -> None:
+        """Append the embeddings of the chunks of one document.
+
+        Args:
+            vectors (np.ndarray): One vector per chunk; normalized before storage.
+            chunks (Sequence[Union[CVChunk, JobDescriptionChunk]]): The embedded chunks.
+            source (str): Source of the document the chunks come from.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if len(vectors) != len(chunks):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(chunks)} chunks.")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        new_strings: List[str] = []
+        metadata = np.empty(len(chunks), dtype=METADATA_DTYPE)
+        source_code = self._encode_string(source, new_strings)
+        for i, chunk in enumerate(chunks):
+            metadata[i] = (chunk.chunk_id if isinstance(chunk, CVChunk) else chunk.id,
+                           getattr(chunk, "location", -1),
+                           self._encode_string(chunk.section, new_strings),
+                           self._encode_string(chunk.chunk_type, new_strings),
+                           source_code)
+
+        # data first, header last: readers only see vectors once they are complete
+        with (self.path / "vectors.bin").open("ab") as f:
+            f.seek(self._count * self.dim * self.dtype.itemsize)
+            f.truncate()
+            f.write(vectors.astype(self.dtype).tobytes())
+        with (self.path / "metadata.bin").open("ab") as f:
+            f.seek(self._count * METADATA_DTYPE.itemsize)
+            f.truncate()
+            f.write(metadata.tobytes())
+        with (self.path / "strings.jsonl").open("ab") as f:
+            f.seek(self._strings_size)
+            f.truncate()
+            f.write("".join(json.dumps(s) + "\n" for s in new_strings).encode("utf-8"))
+            self._strings_size = f.tell()
+
+        self._count += len(chunks)
+        self._write_header({"dim": self.dim, "dtype": self.dtype.name, "count": self._count,
+                            "strings_size": self._strings_size})
+        self._vectors = None
+        self._metadata = None
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Read-only memory map of the stored vectors."""
+        if self._vectors is None:
+            if self._count == 0:
+                return np.empty((0, self.dim), dtype=self.dtype)
+            self._vectors = np.memmap(self.path / "vectors.bin", dtype=self.dtype, mode="r",
+                                      shape=(self._count, self.dim))
+        return self._vectors
+
+    @property
+    def metadata_table(self) -> np.ndarray:
+        """Read-only memory map of the metadata records."""
+        if self._metadata is None:
+            if self._count == 0:
+                return np.empty(0, dtype=METADATA_DTYPE)
+            self._metadata = np.memmap(self.path / "metadata.bin", dtype=METADATA_DTYPE, mode="r",
+                                       shape=(self._count,))
+        return self._metadata
+
+    def metadata(self, index: int) -> dict:
+        """Decode the metadata of the vector at a given index."""
+        record = self.metadata_table[index]
+
+        def decode(code):
+            return self._strings[code] if code >= 0 else None
+
+        return {"chunk_id": int(record["chunk_id"]),
+                "location": int(record["location"]),
+                "section": decode(record["section"]),
+                "chunk_type": decode(record["chunk_type"]),
+                "source": decode(record["source"])}
+
+    def search(self, query: np.ndarray, k: int = 10, block_size: int = 65536) -> Tuple[np.ndarray, np.ndarray]:
+        """Brute-force top-k cosine search.
+
+        The store is scanned in blocks of ``block_size`` vectors so memory use stays
+        bounded whatever the store size.
+
+        Args:
+            query (np.ndarray): One query vector, or a (queries x dim) matrix.
+            k (int): Number of results per query.
+            block_size (int): Number of stored vectors multiplied at once.
+        Return:
+            Tuple[np.ndarray, np.ndarray]: Indices and cosine similarities, each of
+            shape (queries x k), sorted by decreasing similarity.
+        """
+        queries = np.asarray(query, dtype=np.float32).reshape(-1, self.dim)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+        k = min(k, self._count)
+
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_indices = np.empty((len(queries), 0), dtype=np.int64)
+        vectors = self.vectors
+        for start in range(0, self._count, block_size):
+            block = np.asarray(vectors[start:start + block_size], dtype=np.float32)
+            scores = queries @ block.T
+            if scores.shape[1] > k:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, top, axis=1)
+            else:
+                top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_indices = np.concatenate([best_indices, top + start], axis=1)
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_indices = np.take_along_axis(best_indices, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        return np.take_along_axis(best_indices, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
@@ -0,0 +1 @@
+"""Generation of interview questions from job description and CV chunks."""
@@ -0,0 +1,104 @@
+"""Language model backends of the question generator.
+
+A backend has a ``model_id`` (part of the response cache key) and an async
+``complete(prompt) -> str`` method. ``StubModel`` answers locally so the
+generation pipeline can be tested and benchmarked offline.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+from typing import Any, List, Optional, Protocol
+
+
+SYSTEM_PROMPT = ("You are a senior technical interviewer preparing an interview. "
+                 "Write specific, open questions grounded in the job description and the candidate's CV. "
+                 "Always reply with JSON only.")
+
+# numbered items of a batched prompt, see ``question_generator.batch_prompt``
+ITEM_RE = re.compile(r"^### Item (\d+)\n(.*?)(?=^### Item \d+\n|\Z)", re.MULTILINE | re.DOTALL)
+
+
+class QuestionModel(Protocol):
+    model_id: str
+
+    async def complete(self, prompt: str) -> str:
+        ...
+
+
+class StubModelError(RuntimeError):
+    """Transient failure raised on purpose by ``StubModel``."""
+
+
+class StubModel:
+    """Offline model answering every prompt with deterministic questions.
+
+    Answers only depend on the prompt, and a batched prompt gets, for each item,
+    the answer the item would get alone, so batching and caching can be checked
+    against unbatched calls.
+    """
+
+    def __init__(self, latency: float = 0.0, fail_every: int = 0, model_id: str = "stub"):
+        """Create a stub model.
+
+        Args:
+            latency (float): Seconds every call waits, like a network round trip.
+            fail_every (int): Raise ``StubModelError`` on every n-th call, 0 never fails.
+            model_id (str): Identifier of the model in cache keys.
+        """
+        self.latency = latency
+        self.fail_every = fail_every
+        self.model_id = model_id
+        self.calls = 0
+
+    @staticmethod
+    def answer(prompt: str) -> List[str]:
+        """The questions the stub generates for a single prompt."""
+        excerpt = re.search(r"Job description excerpt:\n(.*?)\n\n", prompt, re.DOTALL)
+        topic = " ".join((excerpt.group(1) if excerpt else prompt).split()[:8])
+        count = re.search(r"Write (\d+) ", prompt)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return [f"Question {i + 1} ({digest[i * 4:i * 4 + 4]}): how does your experience relate to \"{topic}\"?"
+                for i in range(int(count.group(1)) if count else 3)]
+
+    async def complete(self, prompt: str) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.fail_every and self.calls % self.fail_every == 0:
+            raise StubModelError(f"Simulated failure of call {self.calls}")
+
+        items = ITEM_RE.findall(prompt)
+        if items:
+            return json.dumps({number: self.answer(item.strip()) for number, item in items})
+        return json.dumps(self.answer(prompt))
+
+
+class PydanticAIModel:
+    """Model called through a pydantic-ai ``Agent``, e.g. ``"openai:gpt-4o-mini"``."""
+
+    def __init__(self, model: str = "openai:gpt-4o-mini", system_prompt: str = SYSTEM_PROMPT,
+                 agent: Optional[Any] = None):
+        """Create a pydantic-ai backed model.
+
+        Args:
+            model (str): pydantic-ai model name, also part of the cache key.
+            system_prompt (str): Instructions sent with every prompt.
+            agent (Any, optional): Already built agent. Built on first use otherwise.
+        """
+        self.model = model
+        self.system_prompt = system_prompt
+        self.model_id = f"pydantic-ai:{model}:{hashlib.sha256(system_prompt.encode('utf-8')).hexdigest()[:8]}"
+        self._agent = agent
+
+    @property
+    def agent(self) -> Any:
+        if self._agent is None:
+            from pydantic_ai import Agent
+            self._agent = Agent(self.model, system_prompt=self.system_prompt)
+        return self._agent
+
+    async def complete(self, prompt: str) -> str:
+        result = await self.agent.run(prompt)
+        return result.output
@@ -0,0 +1,263 @@
+"""Async, cached and concurrency limited generation of interview questions.
+
+The relevant job description chunks (see ``JobDescriptionParser.select_relevant_chunks``)
+are paired with the CV chunks sharing the most keywords with them, and every
+pair becomes one prompt. Prompts already answered by the same model are read
+from the response cache; the others are packed into batched requests, sent
+with at most ``max_concurrency`` requests in flight and retried with
+exponential backoff.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from interview_prep.generation.models import QuestionModel
+from interview_prep.generation.response_cache import ResponseCache, response_key
+from interview_prep.job_descripition.job_parser import get_keyword_matcher
+from interview_prep.utils.instrumentation import increment, stage
+
+if TYPE_CHECKING:
+    from interview_prep.utils.skill_extractor import SkillExtractor
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_INSTRUCTIONS = ("Answer every numbered item below independently. Reply with a JSON object mapping "
+                      "each item number (as a string) to the JSON list of questions for that item.")
+
+_LIST_MARKER_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+
+def build_prompt(jd_text: str, cv_texts: Sequence[str], num_questions: int = 3) -> str:
+    """Prompt asking for interview questions on a job description chunk and CV chunks."""
+    cv_part = "\n".join(f"- {text}" for text in cv_texts) or "- (no matching CV excerpt)"
+    return (f"Job description excerpt:\n{jd_text.strip()}\n\n"
+            f"Candidate CV excerpts:\n{cv_part}\n\n"
+            f"Write {num_questions} interview questions that check how well the candidate's "
+            f"experience matches the job description excerpt. Reply with a JSON list of strings.")
+
+
+def batch_prompt(prompts: Sequence[str]) -> str:
+    """Pack several prompts into one request, answered with a JSON object keyed by item number."""
+    items = "\n\n".join(f"### Item {number}\n{prompt}" for number, prompt in enumerate(prompts, start=1))
+    return f"{BATCH_INSTRUCTIONS}\n\n{items}"
+
+
+def _strip_code_fence(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    return text.strip()
+
+
+def parse_questions(response: Any) -> List[str]:
+    """Questions of a single prompt response: a JSON list, or one question per line otherwise."""
+    if isinstance(response, str):
+        try:
+            response = json.loads(_strip_code_fence(response))
+        except json.JSONDecodeError:
+            lines = (_LIST_MARKER_RE.sub("", line).strip() for line in response.splitlines())
+            return [line for line in lines if line]
+    if isinstance(response, list):
+        return [str(question).strip() for question in response if str(question).strip()]
+    raise ValueError(f"Unexpected response: {response!r}")
+
+
+def parse_batch(response: str, size: int) -> Dict[int, List[str]]:
+    """Questions per item (0 based) of a batched response; items missing or malformed are left out."""
+    try:
+        answers = json.loads(_strip_code_fence(response))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(answers, dict):
+        return {}
+    parsed = {}
+    for number in range(1, size + 1):
+        answer = answers.get(str(number))
+        if isinstance(answer, list):
+            parsed[number - 1] = parse_questions(answer)
+    return parsed
+
+
+class QuestionGenerator:
+    """Fan interview question prompts out to a language model.
+
+    Responses are cached on disk by model id and prompt, prompts shorter than
+    ``batch_max_chars`` are sent ``batch_size`` at a time in one request, and
+    failed requests are retried with exponential backoff and jitter. An item
+    missing from a batched answer is asked again on its own.
+    """
+
+    def __init__(self,
+                 model: QuestionModel,
+                 cache: Optional[ResponseCache] = None,
+                 use_cache: bool = True,
+                 max_concurrency: int = 4,
+                 max_retries: int = 3,
+                 backoff: float = 0.5,
+                 max_backoff: float = 8.0,
+                 batch_size: int = 4,
+                 batch_max_chars: int = 4000,
+                 num_questions: int = 3):
+        """Create a question generator.
+
+        Args:
+            model (QuestionModel): The model backend, e.g. ``PydanticAIModel`` or ``StubModel``.
+            cache (ResponseCache, optional): Response cache. Defaults to one under ``config.data_dir``.
+            use_cache (bool): Whether to read and write the response cache.
+            max_concurrency (int): Maximum number of requests in flight.
+            max_retries (int): Retries of a failed request before giving up.
+            backoff (float): Seconds before the first retry, doubled on every retry.
+            max_backoff (float): Upper bound of the backoff in seconds.
+            batch_size (int): Maximum number of prompts per request, 1 disables batching.
+            batch_max_chars (int): Maximum size of a batched request in characters.
+            num_questions (int): Questions asked per job description chunk.
+        """
+        self.model = model
+        self.cache = (cache if cache is not None else ResponseCache()) if use_cache else None
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.batch_size = max(batch_size, 1)
+        self.batch_max_chars = batch_max_chars
+        self.num_questions = num_questions
+
+    def build_requests(self, scored_chunks: Sequence[dict], cv_chunks: Sequence[Any],
+                       top_k: int = 10, cv_per_prompt: int = 3,
+                       extractor: Optional["SkillExtractor"] = None) -> List[dict]:
+        """Pair the best scored job description chunks with the CV chunks sharing most keywords with them.
+
+        Args:
+            scored_chunks (Sequence[dict]): Output of ``select_relevant_chunks``, best first.
+            cv_chunks (Sequence[Any]): CV chunks (``CVChunk`` or anything with ``chunk_id`` and ``text``).
+            top_k (int): Number of job description chunks to generate questions for.
+            cv_per_prompt (int): Maximum number of CV chunks per prompt.
+            extractor (SkillExtractor, optional): Token aware keyword extractor of the CV
+                chunks, the one ``select_relevant_chunks`` used. Substring matching otherwise.
+        Return:
+            List[dict]: ``jd_chunk_id``, ``cv_chunk_ids`` and ``prompt`` of every request.
+        """
+        if extractor is not None:
+            cv_hits = extractor.extract_chunks(cv_chunks)
+        else:
+            matcher = get_keyword_matcher()
+            cv_hits = [matcher.scan(chunk.text) for chunk in cv_chunks]
+        cv_keywords = [{keyword for found in hits.values() for keyword in found} for hits in cv_hits]
+
+        requests = []
+        for item in scored_chunks[:top_k]:
+            jd_keywords = {keyword for found in item["hits"].values() for keyword in found}
+            overlaps = [(len(jd_keywords & keywords), index) for index, keywords in enumerate(cv_keywords)]
+            best = sorted((overlap for overlap in overlaps if overlap[0] > 0), key=lambda x: (-x[0], x[1]))
+            matched = [cv_chunks[index] for _, index in best[:cv_per_prompt]]
+            requests.append({"jd_chunk_id": item["chunk"].id,
+                             "cv_chunk_ids": [chunk.chunk_id for chunk in matched],
+                             "prompt": build_prompt(item["chunk"].text, [chunk.text for chunk in matched],
+                                                    self.num_questions)})
+        return requests
+
+    async def _call(self, semaphore: asyncio.Semaphore, prompt: str) -> str:
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    increment("llm.requests")
+                    return await self.model.complete(prompt)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                logger.debug("Model call failed (%r), retry %d in %.2fs", e, attempt + 1, delay)
+                increment("llm.retries")
+                # the slot is released while waiting, so other requests go on
+                await asyncio.sleep(delay)
+
+    def _batches(self, prompts: List[str]) -> List[List[str]]:
+        batches, batch, size = [], [], 0
+        for prompt in prompts:
+            if batch and (len(batch) == self.batch_size or size + len(prompt) > self.batch_max_chars):
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(prompt)
+            size += len(prompt)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _answer_batch(self, semaphore: asyncio.Semaphore, batch: List[str]) -> Dict[str, List[str]]:
+        if len(batch) == 1:
+            return {batch[0]: parse_questions(await self._call(semaphore, batch[0]))}
+
+        answers = parse_batch(await self._call(semaphore, batch_prompt(batch)), len(batch))
+        missing = [prompt for index, prompt in enumerate(batch) if index not in answers]
+        if missing:
+            increment("llm.batch_misses", len(missing))
+            retried = await asyncio.gather(*(self._call(semaphore, prompt) for prompt in missing))
+            answers.update({batch.index(prompt): parse_questions(response)
+                            for prompt, response in zip(missing, retried)})
+        return {prompt: answers[index] for index, prompt in enumerate(batch)}
+
+    async def complete_prompts(self, prompts: Sequence[str]) -> List[Any]:
+        """Questions for every prompt, in order; an exception in place of the prompts that failed."""
+        results: Dict[str, Any] = {}
+        keys = {}
+        for prompt in dict.fromkeys(prompts):
+            if self.cache is not None:
+                keys[prompt] = response_key(self.model.model_id, prompt)
+                cached = self.cache.get(keys[prompt])
+                if cached is not None:
+                    results[prompt] = cached
+                    increment("llm.cache_hits")
+        missing = [prompt for prompt in dict.fromkeys(prompts) if prompt not in results]
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        batches = self._batches(missing)
+        answers = await asyncio.gather(*(self._answer_batch(semaphore, batch) for batch in batches),
+                                       return_exceptions=True)
+        for batch, answer in zip(batches, answers):
+            if isinstance(answer, BaseException):
+                logger.warning("Question generation failed for %d prompts: %r", len(batch), answer)
+                results.update((prompt, answer) for prompt in batch)
+                continue
+            for prompt, questions in answer.items():
+                results[prompt] = questions
+                if self.cache is not None:
+                    self.cache.put(keys[prompt], questions)
+        return [results[prompt] for prompt in prompts]
+
+    async def agenerate(self, scored_chunks: Sequence[dict], cv_chunks: Sequence[Any],
+                        top_k: int = 10, cv_per_prompt: int = 3,
+                        extractor: Optional["SkillExtractor"] = None) -> List[dict]:
+        """Generate interview questions for the best job description chunks, see ``build_requests``.
+
+        Return:
+            List[dict]: ``jd_chunk_id``, ``cv_chunk_ids`` and ``questions`` of every
+            request, or ``error`` instead of ``questions`` if it failed.
+        """
+        requests = self.build_requests(scored_chunks, cv_chunks, top_k=top_k, cv_per_prompt=cv_per_prompt,
+                                       extractor=extractor)
+        increment("llm.prompts", len(requests))
+        answers = await self.complete_prompts([request["prompt"] for request in requests])
+
+        records = []
+        for request, answer in zip(requests, answers):
+            record = {"jd_chunk_id": request["jd_chunk_id"], "cv_chunk_ids": request["cv_chunk_ids"]}
+            if isinstance(answer, BaseException):
+                record["error"] = repr(answer)
+            else:
+                record["questions"] = answer
+            records.append(record)
+        return records
+
+    def generate(self, scored_chunks: Sequence[dict], cv_chunks: Sequence[Any],
+                 top_k: int = 10, cv_per_prompt: int = 3,
+                 extractor: Optional["SkillExtractor"] = None) -> List[dict]:
+        """Blocking version of ``agenerate``, for code not running an event loop."""
+        with stage("llm.generate"):
+            return asyncio.run(self.agenerate(scored_chunks, cv_chunks, top_k=top_k, cv_per_prompt=cv_per_prompt,
+                                              extractor=extractor))
@@ -0,0 +1,46 @@
+"""Content-addressed on-disk cache of language model responses."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+from config import config
+from interview_prep.utils.disk_cache import DiskCache
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def response_key(model_id: str, prompt: str) -> str:
+    """Cache key of the response of a model to a prompt."""
+    return hashlib.sha256(f"{model_id}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache(DiskCache):
+    """On-disk cache of parsed model responses, one JSON file per prompt.
+
+    Entries are keyed by ``response_key``, so a different model or any change to
+    the prompt is a miss. The cache is bounded by ``max_bytes``; when it grows
+    past the cap the least recently used entries are evicted (see ``DiskCache``).
+    """
+
+    suffix = ".json"
+    sharded = True
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(cache_dir if cache_dir is not None else config.data_dir / "cache" / "llm", max_bytes)
+
+    def get(self, key: str) -> Optional[object]:
+        """Return the cached response of a key, if any."""
+        payload = self._read(key)
+        if payload is None:
+            return None
+        try:
+            return json.loads(payload)["response"]
+        except json.JSONDecodeError:
+            return None
+
+    def put(self, key: str, response: object) -> None:
+        """Store a JSON serializable response for a key and evict old entries if over the cap."""
+        self._write(key, json.dumps({"response": response}, ensure_ascii=False).encode("utf-8"))
@@ -0,0 +1,636 @@
+"""Incremental re-chunking of edited CVs and job descriptions.
+
+The sections and chunks of every processed document are kept in a JSON state
+file. When the document changes, its normalized lines are diffed against the
+stored version and only the sections touching the edited lines are sectioned
+and chunked again; the other sections are reused with their line numbers
+shifted. The result is the same as processing the whole document again, except
+that chunk ids stay stable: a chunk keeps its id as long as its section, type
+and text are unchanged, and new chunks get ids that were never used before.
+Downstream consumers (embeddings, vector stores) only have to handle the
+``changed_chunk_ids`` and ``removed_chunk_ids`` of every record.
+"""
+
+import difflib
+import hashlib
+import json
+import logging
+import os
+import time
+from bisect import bisect_right
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import config
+from interview_prep.CV.chunker import CVChunker
+from interview_prep.CV.text_cache import normalizer_version
+from interview_prep.job_descripition.job_parser import KEYWORD_WEIGHTS, JobDescriptionParser, get_keyword_matcher
+from interview_prep.utils.header_index import HeaderIndex, get_cv_header_index, get_job_description_header_index
+from interview_prep.utils.instrumentation import increment, timed
+
+
+logger = logging.getLogger(__name__)
+
+STATE_FORMAT = "1"
+
+CV = "cv"
+JOB_DESCRIPTION = "jd"
+
+
+class _LineMap:
+    """Map old line numbers to new ones through the ``equal`` blocks of a diff."""
+
+    def __init__(self, opcodes: List[tuple], old_length: int, new_length: int):
+        self.blocks = [(i1, i2, j1) for tag, i1, i2, j1, _ in opcodes if tag == "equal"]
+        self.starts = [block[0] for block in self.blocks]
+        self.old_length = old_length
+        self.new_length = new_length
+
+    def __call__(self, line: int) -> Optional[int]:
+        """New number of an old line or line boundary, ``None`` if it was edited."""
+        if line == 0:
+            return 0
+        if line == self.old_length:
+            return self.new_length
+        index = bisect_right(self.starts, line) - 1
+        # a boundary at the end of a block maps too, so look at the previous one as well
+        for i1, i2, j1 in self.blocks[max(index - 1, 0):index + 1]:
+            if i1 <= line <= i2:
+                return j1 + line - i1
+        return None
+
+
+def _diff(old_lines: List[str], new_lines: List[str]) -> List[tuple]:
+    """Opcodes turning ``old_lines`` into ``new_lines``.
+
+    Edits are usually local, so the common head and tail are split off before
+    the quadratic matching.
+    """
+    limit = min(len(old_lines), len(new_lines))
+    head = 0
+    while head < limit and old_lines[head] == new_lines[head]:
+        head += 1
+    tail = 0
+    while tail < limit - head and old_lines[-1 - tail] == new_lines[-1 - tail]:
+        tail += 1
+
+    matcher = difflib.SequenceMatcher(None, old_lines[head:len(old_lines) - tail],
+                                      new_lines[head:len(new_lines) - tail], autojunk=False)
+    opcodes = [("equal", 0, head, 0, head)] if head else []
+    opcodes += [(tag, i1 + head, i2 + head, j1 + head, j2 + head) for tag, i1, i2, j1, j2 in matcher.get_opcodes()]
+    if tail:
+        opcodes.append(("equal", len(old_lines) - tail, len(old_lines), len(new_lines) - tail, len(new_lines)))
+    return opcodes
+
+
+def _source_key(source: str) -> str:
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+class IncrementalChunker:
+    """Re-section and re-chunk only the edited parts of documents.
+
+    Args:
+        state_dir (Optional[Path]): Directory of the per-document state files.
+        max_chunk_size (int): Maximum job description chunk size in characters.
+    """
+
+    def __init__(self, state_dir: Optional[Path] = None, max_chunk_size: int = 500):
+        self.state_dir = Path(state_dir) if state_dir is not None else config.data_dir / "incremental"
+        self.max_chunk_size = max_chunk_size
+        self.cv_chunker = CVChunker()
+        self.jd_parser = JobDescriptionParser()
+
+    # state files
+
+    def _state_path(self, source: str) -> Path:
+        return self.state_dir / f"{_source_key(source)}.json"
+
+    def _load_state(self, kind: str, source: str) -> Optional[dict]:
+        path = self._state_path(source)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (state.get("format") != STATE_FORMAT
+                or state.get("normalizer") != normalizer_version()
+                or state.get("headers") != self._header_index(kind).fingerprint
+                or state.get("kind") != kind
+                or state.get("source") != source
+                or (kind == JOB_DESCRIPTION and state.get("max_chunk_size") != self.max_chunk_size)):
+            return None
+        return state
+
+    def _save_state(self, state: dict) -> None:
+        path = self._state_path(state["source"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            # dumps goes through the C encoder, dump does not
+            f.write(json.dumps(state, ensure_ascii=False))
+        os.replace(tmp_path, path)
+
+    def forget(self, source: str) -> None:
+        """Drop the stored state of a document, its next update is processed in full."""
+        self._state_path(source).unlink(missing_ok=True)
+
+    # entry points
+
+    def update_cv(self, file_path: str, use_cache: bool = True) -> dict:
+        """Read a CV PDF and update its sections and chunks."""
+        from interview_prep.CV.cv_reader import CVReader
+
+        return self.update(CVReader(use_cache=use_cache).read_cv(file_path), CV)
+
+    def update_job_description(self, file_path: str) -> dict:
+        """Read a job description text file and update its chunks and scores."""
+        return self.update(self.jd_parser.parse_description(file_path), JOB_DESCRIPTION)
+
+    @timed("incremental.update")
+    def update(self, document, kind: str) -> dict:
+        """Update the record of a read document against its stored previous version.
+
+        Args:
+            document (Document): The read CV or job description.
+            kind (str): ``"cv"`` or ``"jd"``.
+        Return:
+            dict: The record ``pipeline.cv_record``/``pipeline.job_description_record``
+            would return, plus ``changed_chunk_ids`` (chunks that are new or whose
+            text changed) and ``removed_chunk_ids``.
+        """
+        if kind not in (CV, JOB_DESCRIPTION):
+            raise ValueError(f"Unknown document kind: {kind!r}")
+
+        lines = document.normalized_text.split("\n")
+        state = self._load_state(kind, document.source)
+
+        if state is None:
+            increment("incremental.full")
+            sections = self._sections(kind, lines, 0, len(lines), None)
+            chunks, next_chunk_id = self._chunk_all(kind, sections)
+            old_ids = set()
+        elif state["lines"] == lines:
+            increment("incremental.unchanged")
+            return self._record(document, kind, state, [], [])
+        else:
+            increment("incremental.partial")
+            sections, reused = self._update_sections(kind, state, lines)
+            chunks, next_chunk_id = self._update_chunks(kind, state, sections, reused)
+            old_ids = {chunk["chunk_id"] for chunk in state["chunks"]}
+
+        new_ids = {chunk["chunk_id"] for chunk in chunks}
+        changed = [chunk["chunk_id"] for chunk in chunks if chunk["chunk_id"] not in old_ids]
+        removed = sorted(old_ids - new_ids)
+        increment("incremental.changed_chunks", len(changed))
+
+        scores = {}
+        if kind == JOB_DESCRIPTION:
+            matcher = get_keyword_matcher()
+            old_scores = state["scores"] if state is not None else {}
+            for chunk in chunks:
+                key = str(chunk["chunk_id"])
+                if key in old_scores:
+                    scores[key] = old_scores[key]
+                else:
+                    score, hits = matcher.score(chunk["text"], KEYWORD_WEIGHTS)
+                    scores[key] = {"score": score, "hits": hits}
+
+        state = {"format": STATE_FORMAT,
+                 "normalizer": normalizer_version(),
+                 "headers": self._header_index(kind).fingerprint,
+                 "kind": kind,
+                 "source": document.source,
+                 "max_chunk_size": self.max_chunk_size,
+                 "lines": lines,
+                 "sections": sections,
+                 "chunks": chunks,
+                 "next_chunk_id": next_chunk_id,
+                 "scores": scores}
+        self._save_state(state)
+        return self._record(document, kind, state, changed, removed)
+
+    def _record(self, document, kind: str, state: dict, changed: List[int], removed: List[int]) -> dict:
+        record = {"source": document.source,
+                  "category": document.category,
+                  "document": document.model_dump()}
+        if kind == CV:
+            record["sections"] = state["sections"]
+            record["chunks"] = [{key: chunk[key] for key in
+                                 ("section_id", "chunk_id", "text", "section", "chunk_type", "location")}
+                                for chunk in state["chunks"]]
+        else:
+            record["chunks"] = [{"id": chunk["chunk_id"], "text": chunk["text"],
+                                 "section": chunk["section"], "chunk_type": chunk["chunk_type"]}
+                                for chunk in state["chunks"]]
+            scored = [{"chunk_id": chunk["chunk_id"], **state["scores"][str(chunk["chunk_id"])]}
+                      for chunk in state["chunks"]]
+            scored.sort(key=lambda x: x["score"], reverse=True)
+            record["scored_chunks"] = scored
+        record["changed_chunk_ids"] = changed
+        record["removed_chunk_ids"] = removed
+        return record
+
+    # sections
+
+    @staticmethod
+    def _header_index(kind: str) -> HeaderIndex:
+        return get_cv_header_index() if kind == CV else get_job_description_header_index()
+
+    def _is_header(self, kind: str, line: str) -> bool:
+        if kind == CV:
+            return self.cv_chunker._is_section_header(line)
+        return self.jd_parser._is_section_header(line)
+
+    def _sections(self, kind: str, lines: List[str], start: int, end: int, first_name: Optional[str]) -> List[dict]:
+        """Section ``lines[start:end]`` with the parser of ``kind``, numbering lines from ``start``.
+
+        ``first_name`` renames the first CV section: the parser calls the first
+        section of a text "Introduction", but a region after another section is
+        named after the first header before its content.
+        """
+        from interview_prep.schemas.cv_schema import Document
+
+        region = Document.model_construct(normalized_text="\n".join(lines[start:end]))
+        if kind == CV:
+            sections = self.cv_chunker._retrieve_sections(region)
+        else:
+            sections = self.jd_parser._create_sections(region)
+        for section in sections:
+            section["lines"] = [line + start for line in section["lines"]]
+        if first_name is not None and sections:
+            sections[0]["section"] = first_name
+        return sections
+
+    @staticmethod
+    def _spans(kind: str, sections: List[dict], length: int) -> Tuple[List[int], List[int]]:
+        """First and past-the-end line of every section, the blank and header lines before it included."""
+        starts = [0]
+        for k in range(1, len(sections)):
+            if kind == CV:
+                # CV headers are not part of a section, it starts after the previous content
+                starts.append(sections[k - 1]["lines"][-1] + 1)
+            else:
+                starts.append(sections[k]["lines"][0])
+        return starts, starts[1:] + [length]
+
+    def _update_sections(self, kind: str, state: dict, lines: List[str]) -> Tuple[List[dict], List[Optional[int]]]:
+        """Section the new lines, reusing the old sections outside the edited regions.
+
+        Return:
+            tuple[list[dict], list[Optional[int]]]: The sections and, for every one,
+            the index of the old section it reuses or ``None``.
+        """
+        old_lines, old_sections = state["lines"], state["sections"]
+        if not old_sections:
+            sections = self._sections(kind, lines, 0, len(lines), None)
+            return sections, [None] * len(sections)
+
+        opcodes = _diff(old_lines, lines)
+        line_map = _LineMap(opcodes, len(old_lines), len(lines))
+        starts, ends = self._spans(kind, old_sections, len(old_lines))
+        last = len(old_sections) - 1
+
+        def section_at(line: int) -> int:
+            return min(max(bisect_right(starts, line) - 1, 0), last)
+
+        affected = set()
+        for tag, i1, i2, _, _ in opcodes:
+            if tag == "equal":
+                continue
+            # an edit at a boundary can change the sections on both sides
+            affected.update(range(section_at(i1 - 1), section_at(max(i2, i1 + 1) - 1) + 1))
+            affected.add(section_at(i1))
+
+        regions = self._grow_regions(kind, sorted(affected), starts, ends, last, lines, line_map)
+
+        sections, reused = [], []
+        previous = 0
+        for a, b, start, end in regions:
+            for k in range(previous, a):
+                sections.append(self._shift(old_sections[k], line_map))
+                reused.append(k)
+            first_name = None
+            if kind == CV and a > 0:
+                first_name = next((line.strip() for line in lines[start:end]
+                                   if line.strip() and self._is_header(kind, line)), None)
+            for section in self._sections(kind, lines, start, end, first_name):
+                sections.append(section)
+                reused.append(None)
+            previous = b + 1
+        for k in range(previous, len(old_sections)):
+            sections.append(self._shift(old_sections[k], line_map))
+            reused.append(k)
+
+        for index, section in enumerate(sections):
+            section["id"] = index
+        increment("incremental.resectioned", reused.count(None))
+        return sections, reused
+
+    def _grow_regions(self, kind: str, affected: List[int], starts: List[int], ends: List[int], last: int,
+                      lines: List[str], line_map: _LineMap) -> List[Tuple[int, int, int, int]]:
+        """Group the affected sections into regions that can be sectioned on their own.
+
+        A region grows until its boundaries are unedited lines and sectioning it
+        alone gives the same sections as sectioning the whole text: its content
+        must not continue the previous section and, for CVs, it must not change
+        the name of the next section.
+        Return:
+            list[tuple[int, int, int, int]]: First and last old section and first and
+            past-the-end new line of every region.
+        """
+        runs = []
+        for k in affected:
+            if runs and k <= runs[-1][1] + 1:
+                runs[-1][1] = max(runs[-1][1], k)
+            else:
+                runs.append([k, k])
+
+        while True:
+            grown = False
+            regions = []
+            for a, b in runs:
+                start, end = line_map(starts[a]), line_map(ends[b])
+                if start is None or end is None:
+                    # a boundary inside an edit, take in the neighbouring section
+                    if start is None:
+                        a = max(a - 1, 0)
+                    if end is None:
+                        b = min(b + 1, last)
+                    grown = True
+                    regions.append((a, b, None, None))
+                    continue
+
+                content = [i for i in range(start, end) if lines[i].strip() and not self._is_header(kind, lines[i])]
+                if a > 0 and content:
+                    if kind == CV:
+                        continues_previous = not any(self._is_header(kind, lines[i])
+                                                     for i in range(start, content[0]) if lines[i].strip())
+                    else:
+                        first = next(i for i in range(start, end) if lines[i].strip())
+                        continues_previous = not self._is_header(kind, lines[first])
+                    if continues_previous:
+                        a, grown = a - 1, True
+                if kind == CV and b < last:
+                    tail = range(content[-1] + 1 if content else start, end)
+                    # the next section would be named by a header at the end, or become the "Introduction"
+                    if any(lines[i].strip() for i in tail) or (a == 0 and not content):
+                        b, grown = b + 1, True
+                regions.append((a, b, start, end))
+
+            runs = []
+            for a, b, _, _ in regions:
+                if runs and a <= runs[-1][1] + 1:
+                    runs[-1][1] = max(runs[-1][1], b)
+                    grown = True
+                else:
+                    runs.append([a, b])
+            if not grown:
+                return regions
+
+    @staticmethod
+    def _shift(section: dict, line_map: _LineMap) -> dict:
+        return {**section, "lines": [line_map(line) for line in section["lines"]]}
+
+    # chunks
+
+    def _chunk_all(self, kind: str, sections: List[dict]) -> Tuple[List[dict], int]:
+        if kind == CV:
+            chunks = [{**row, "owner": row["section_id"]} for row in self.cv_chunker._iter_chunk_rows(sections)]
+        else:
+            chunks = [self._jd_row(row, unit[-1])
+                      for unit in self._jd_units(sections)
+                      for row in self.jd_parser._iter_chunk_rows([sections[k] for k in unit], self.max_chunk_size)]
+        for chunk_id, chunk in enumerate(chunks):
+            chunk["chunk_id"] = chunk_id
+        return chunks, len(chunks)
+
+    def _update_chunks(self, kind: str, state: dict, sections: List[dict],
+                       reused: List[Optional[int]]) -> Tuple[List[dict], int]:
+        """Chunk the new sections, reusing the chunks of the sections that chunk the same as before."""
+        old_chunks = defaultdict(list)
+        for chunk in state["chunks"]:
+            old_chunks[chunk["owner"]].append(chunk)
+
+        if kind == CV:
+            entry_states = self._cv_entry_states(sections)
+            groups = self._cv_groups(state["sections"], sections, reused)
+        else:
+            groups = self._jd_groups(state["sections"], sections, reused)
+
+        # ids of the chunks that are chunked again, reused for identical chunks
+        pool = defaultdict(deque)
+        kept = {owner for _, owner in groups if owner is not None}
+        for owner, chunks in old_chunks.items():
+            if owner not in kept:
+                for chunk in chunks:
+                    pool[chunk["section"], chunk["chunk_type"], chunk["text"]].append(chunk["chunk_id"])
+
+        next_chunk_id = state["next_chunk_id"]
+        line_map_cache = {}
+        result = []
+        for indices, owner in groups:
+            if owner is not None:
+                # unchanged chunks of a reused CV section or job description unit
+                new_owner = indices[-1]
+                for chunk in old_chunks[owner]:
+                    chunk = {**chunk, "owner": new_owner}
+                    if kind == CV:
+                        chunk["section_id"] = new_owner
+                        chunk["location"] = self._new_location(chunk["location"], sections[new_owner],
+                                                               state["sections"][owner], line_map_cache)
+                    result.append(chunk)
+                continue
+
+            group_sections = [sections[k] for k in indices]
+            if kind == CV:
+                rows = list(self.cv_chunker._iter_chunk_rows(group_sections, entry_states[indices[0]]))
+                for row in rows:
+                    row["owner"] = row["section_id"]
+            else:
+                rows = [self._jd_row(row, indices[-1])
+                        for row in self.jd_parser._iter_chunk_rows(group_sections, self.max_chunk_size)]
+            increment("incremental.rechunked", len(group_sections))
+            for row in rows:
+                ids = pool.get((row["section"], row["chunk_type"], row["text"]))
+                if ids:
+                    row["chunk_id"] = ids.popleft()
+                else:
+                    row["chunk_id"] = next_chunk_id
+                    next_chunk_id += 1
+                result.append(row)
+        return result, next_chunk_id
+
+    @staticmethod
+    def _new_location(location: int, section: dict, old_section: dict, cache: dict) -> int:
+        # reused sections have the same content, only their line numbers moved
+        key = id(old_section)
+        if key not in cache:
+            cache[key] = dict(zip(old_section["lines"], section["lines"]))
+        return cache[key][location]
+
+    def _cv_groups(self, old_sections: List[dict], sections: List[dict],
+                   reused: List[Optional[int]]) -> List[Tuple[List[int], Optional[int]]]:
+        """Split the CV sections into runs chunked together and reused sections.
+
+        The chunks of a section depend on the sections before it through the
+        bullet point state, and bullet point continuation lines at the start of a
+        section extend the last chunk of an earlier section, so those sections
+        are chunked together.
+        Return:
+            list[tuple[list[int], Optional[int]]]: Section indices of every group and
+            the old section whose chunks are reused, ``None`` to chunk them again.
+        """
+        old_entry = self._cv_entry_states(old_sections)
+        new_entry = self._cv_entry_states(sections)
+        old_links = self._cv_links(old_sections, old_entry)
+        new_links = self._cv_links(sections, new_entry)
+
+        rechunk = {k for k, old in enumerate(reused) if old is None or old_entry[old] != new_entry[k]}
+        new_index = {old: k for k, old in enumerate(reused) if old is not None}
+
+        while True:
+            size = len(rechunk)
+            for owner, k in new_links:
+                linked = range(owner, k + 1)
+                if any(i in rechunk for i in linked):
+                    rechunk.update(linked)
+            for owner, k in old_links:
+                # the stored chunks of ``owner`` include the continuation lines of ``k``
+                linked = [new_index.get(i) for i in range(owner, k + 1)]
+                if None in linked or any(i in rechunk for i in linked):
+                    rechunk.update(i for i in linked if i is not None)
+            if len(rechunk) == size:
+                break
+
+        groups = []
+        for k, old in enumerate(reused):
+            if k not in rechunk:
+                groups.append(([k], old))
+            elif groups and groups[-1][1] is None and groups[-1][0][-1] == k - 1:
+                groups[-1][0].append(k)
+            else:
+                groups.append(([k], None))
+        return groups
+
+    @staticmethod
+    def _cv_entry_states(sections: List[dict]) -> List[bool]:
+        """Bullet point continuation state before every section: whether a bullet point was seen."""
+        states, seen = [], False
+        for section in sections:
+            states.append(seen)
+            seen = seen or any(line.startswith(("-", "*", "•")) for line in section["content"])
+        return states
+
+    def _cv_links(self, sections: List[dict], entry_states: List[bool]) -> List[Tuple[int, int]]:
+        """Pairs of (section of the last chunk, section) for sections whose continuation lines extend it."""
+        links = []
+        owner = None
+        for k, section in enumerate(sections):
+            starts_chunk = False
+            linked = False
+            # only the lines before the first chunk of a section can continue an earlier one
+            for line in section["content"]:
+                chunk_type, _ = self.cv_chunker._classify_line(line, entry_states[k])
+                if chunk_type == "CONTINUATION" and not linked and owner is not None:
+                    links.append((owner, k))
+                    linked = True
+                elif chunk_type in ("ITEM", "HEADING"):
+                    starts_chunk = True
+                    break
+            if starts_chunk:
+                owner = k
+        return links
+
+    @staticmethod
+    def _jd_units(sections: List[dict]) -> List[List[int]]:
+        """Group job description sections into a content section and the empty sections before it.
+
+        The empty section titles before a content section become one "Metadata"
+        chunk, so each unit is chunked on its own.
+        """
+        units, unit = [], []
+        for k, section in enumerate(sections):
+            unit.append(k)
+            if section["content"]:
+                units.append(unit)
+                unit = []
+        if unit:
+            units.append(unit)
+        return units
+
+    def _jd_groups(self, old_sections: List[dict], sections: List[dict],
+                   reused: List[Optional[int]]) -> List[Tuple[List[int], Optional[int]]]:
+        old_units = {tuple(unit) for unit in self._jd_units(old_sections)}
+        old_last = len(old_sections) - 1
+        groups = []
+        for unit in self._jd_units(sections):
+            old = tuple(reused[k] for k in unit)
+            same = None not in old and old in old_units
+            # trailing empty sections are joined differently, they have to stay trailing
+            if same and not sections[unit[-1]]["content"]:
+                same = unit[-1] == len(sections) - 1 and old[-1] == old_last
+            groups.append((unit, old[-1] if same else None))
+        return groups
+
+    @staticmethod
+    def _jd_row(row: dict, owner: int) -> dict:
+        row = {"chunk_id": row.pop("id"), **row}
+        row["owner"] = owner
+        return row
+
+
+def _snapshot(paths: Iterable[str]) -> Dict[str, float]:
+    snapshot = {}
+    for path in paths:
+        try:
+            snapshot[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+    return snapshot
+
+
+def watch(list_files: Callable[[], Iterable[str]],
+          process: Callable[[str], dict],
+          interval: float = 1.0,
+          on_removed: Optional[Callable[[str], None]] = None,
+          max_polls: Optional[int] = None) -> Iterator[Tuple[str, Optional[dict], Optional[Exception]]]:
+    """Poll files for changes and process every new or modified one.
+
+    A file whose processing failed is processed again on every poll, changed or
+    not, until it succeeds: the failure may come from a partially written file
+    or a resource that was briefly unavailable.
+
+    Args:
+        list_files (Callable[[], Iterable[str]]): Returns the watched file paths, called on every poll.
+        process (Callable[[str], dict]): Turns a changed file into a record.
+        interval (float): Seconds between polls.
+        on_removed (Optional[Callable[[str], None]]): Called with the paths that disappeared.
+        max_polls (Optional[int]): Stop after this many polls, ``None`` watches forever.
+    Yield:
+        tuple[str, Optional[dict], Optional[Exception]]: The file path, its record and
+        the error raised while processing it.
+    """
+    # path -> modification time when it was processed, None while it fails
+    seen: Dict[str, Optional[float]] = {}
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        if polls:
+            time.sleep(interval)
+        polls += 1
+        current: Dict[str, Optional[float]] = _snapshot(list_files())
+        for path, mtime in current.items():
+            if seen.get(path) == mtime:
+                continue
+            try:
+                record = process(path)
+            except Exception as e:
+                current[path] = None
+                yield path, None, e
+            else:
+                yield path, record, None
+        if on_removed is not None:
+            for path in seen.keys() - current.keys():
+                on_removed(path)
+        seen = current
@@ -0,0 +1,104 @@
+"""Vectorized keyword scoring of many job descriptions at once."""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from interview_prep.job_descripition.job_parser import KEYWORD_WEIGHTS, get_keyword_matcher
+from interview_prep.schemas.cv_schema import JobDescriptionChunk
+from interview_prep.utils.keyword_matcher import KeywordMatcher
+
+
+class BatchScorer:
+    """Score the chunks of a whole job description corpus with one matrix-vector product.
+
+    The keyword automaton runs once per chunk to build a sparse chunk x keyword
+    matrix whose entries are the number of times a keyword is listed in its
+    category (so the scores match ``select_relevant_chunks``). Rescoring with new
+    category weights then only costs a sparse matrix-vector product.
+    """
+
+    def __init__(self, documents: Sequence[Sequence[JobDescriptionChunk]], matcher: Optional[KeywordMatcher] = None):
+        """Build the chunk x keyword matrix.
+
+        Args:
+            documents (Sequence[Sequence[JobDescriptionChunk]]): The chunks of every job description.
+            matcher (KeywordMatcher, optional): Keyword automaton. Defaults to the one built from the constants.
+        """
+        self.matcher = matcher or get_keyword_matcher()
+        self.documents = documents
+        self.categories = list(self.matcher.multiplicity)
+
+        columns: Dict[Tuple[str, str], int] = {}
+        column_categories = []
+        rows, cols, values = [], [], []
+        # row boundaries of each document, like the indptr of a CSR matrix
+        doc_offsets = [0]
+
+        row = 0
+        for chunks in documents:
+            for chunk in chunks:
+                for category, found in self.matcher.scan(chunk.text).items():
+                    multiplicity = self.matcher.multiplicity[category]
+                    for keyword in found:
+                        col = columns.get((category, keyword))
+                        if col is None:
+                            col = columns[(category, keyword)] = len(columns)
+                            column_categories.append(self.categories.index(category))
+                        rows.append(row)
+                        cols.append(col)
+                        values.append(multiplicity[keyword])
+                row += 1
+            doc_offsets.append(row)
+
+        self.columns = list(columns)
+        self.column_categories = np.asarray(column_categories, dtype=np.int32)
+        self.doc_offsets = np.asarray(doc_offsets, dtype=np.int64)
+        self.doc_ids = np.repeat(np.arange(len(documents)), np.diff(self.doc_offsets))
+        self.matrix = sparse.csr_matrix((np.asarray(values, dtype=np.float32), (rows, cols)),
+                                        shape=(row, len(columns)))
+
+    def category_counts(self) -> np.ndarray:
+        """Keyword hits per chunk and category, as a dense (chunks x categories) array."""
+        membership = sparse.csr_matrix((np.ones(len(self.column_categories), dtype=np.float32),
+                                        (np.arange(len(self.column_categories)), self.column_categories)),
+                                       shape=(len(self.column_categories), len(self.categories)))
+        return (self.matrix @ membership).toarray()
+
+    def score(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Score every chunk of the corpus.
+
+        Args:
+            weights (Dict[str, float], optional): Weight per category. Defaults to ``KEYWORD_WEIGHTS``.
+        Return:
+            np.ndarray: One score per chunk, in corpus order.
+        """
+        weights = KEYWORD_WEIGHTS if weights is None else weights
+        category_weights = np.array([weights.get(category, 0) for category in self.categories], dtype=np.float32)
+        return self.matrix @ category_weights[self.column_categories]
+
+    def top_k(self, k: int, weights: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Select the ``k`` best scored chunks of every document.
+
+        Ties keep the chunk order, as the stable sort of ``select_relevant_chunks`` does.
+
+        Args:
+            k (int): Number of chunks to keep per document.
+            weights (Dict[str, float], optional): Weight per category. Defaults to ``KEYWORD_WEIGHTS``.
+        Return:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Document index, chunk index within the
+            document and score of the selected chunks, grouped by document and sorted by
+            descending score.
+        """
+        scores = self.score(weights)
+        rows = np.arange(len(scores))
+        order = np.lexsort((rows, -scores, self.doc_ids))
+        doc_ids = self.doc_ids[order]
+        rank = np.arange(len(order)) - self.doc_offsets[doc_ids]
+        keep = order[rank < k]
+        return self.doc_ids[keep], keep - self.doc_offsets[self.doc_ids[keep]], scores[keep]
+
+    def chunks(self, doc_index: np.ndarray, chunk_index: np.ndarray) -> List[JobDescriptionChunk]:
+        """Look up the chunk objects selected by ``top_k``."""
+        return [self.documents[d][c] for d, c in zip(doc_index.tolist(), chunk_index.tolist())]
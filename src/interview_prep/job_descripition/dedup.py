@@ -0,0 +1,180 @@
+"""Near-duplicate job description detection with MinHash signatures and LSH banding."""
+
+import zlib
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+_MAX_HASH = np.uint32((1 << 32) - 1)
+
+
+def _shingle_weights(size: int, seed: int) -> np.ndarray:
+    # odd weights, one per position in the shingle, so word order matters
+    return np.random.default_rng(seed).integers(0, 1 << 32, size=size, dtype=np.uint32) | np.uint32(1)
+
+
+def shingle_hashes(text: str, size: int = 5, seed: int = 1, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """32 bit hashes of the word ``size``-grams of a text, case folded.
+
+    Words are hashed once and the hash of a shingle is a weighted sum of the
+    hashes of its words, computed for all shingles at once, so no shingle
+    string is built. A text shorter than ``size`` words is one shingle.
+    ``weights`` are the precomputed ``_shingle_weights(size, seed)``.
+    """
+    words = text.casefold().split()
+    if not words:
+        return np.empty(0, dtype=np.uint32)
+    word_hashes = np.array(list(map(zlib.crc32, map(str.encode, words))), dtype=np.uint32)
+    if weights is None:
+        weights = _shingle_weights(size, seed)
+    count = max(len(words) - size + 1, 1)
+    hashes = word_hashes[:count] * weights[0]
+    for position in range(1, min(size, len(words))):
+        hashes += word_hashes[position:position + count] * weights[position]
+    return hashes
+
+
+def _lsh_parameters(num_perm: int, threshold: float, recall: float = 0.95) -> Tuple[int, int]:
+    """Bands and rows per band making pairs at the threshold candidates with probability ``recall``.
+
+    Among those, the banding with the fewest candidates below the threshold is
+    chosen: a missed duplicate is reprocessed for good, while a false candidate
+    only costs one signature comparison.
+    """
+    points = np.linspace(0.0, threshold, 101)
+    best = None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            if 1 - (1 - threshold ** rows) ** bands < recall:
+                continue
+            false_positives = float(np.trapezoid(1 - (1 - points ** rows) ** bands, points))
+            if best is None or false_positives < best[0]:
+                best = (false_positives, bands, rows)
+    return best[1], best[2]
+
+
+class NearDuplicateIndex:
+    """Index of canonical documents, finding the near-duplicates of a new one in sub-linear time.
+
+    A document is summarized by a MinHash signature of its word shingles: the
+    fraction of equal signature values estimates the Jaccard similarity of two
+    shingle sets. Signatures are cut into bands hashed to buckets, so only the
+    documents sharing a bucket with a new one are compared to it, and a pair is
+    a near-duplicate when its estimated similarity reaches ``threshold``.
+
+    Only canonical documents (the first seen of each group) are indexed, so a
+    chain of small edits does not drift away from the original posting.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        """Create an empty index.
+
+        Args:
+            threshold (float): Minimum estimated Jaccard similarity of near-duplicates.
+            num_perm (int): Number of hash functions of a signature; more is more accurate and slower.
+            shingle_size (int): Number of words of a shingle.
+            seed (int): Seed of the hash functions. Signatures are only comparable with the same seed.
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # x -> a * x + b modulo 2 ** 32 permutes the 32 bit hashes when a is odd
+        self._a = (rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint32) | np.uint32(1))[:, None]
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint32)[:, None]
+        self._weights = _shingle_weights(shingle_size, seed)
+        self.bands, self.rows = _lsh_parameters(num_perm, threshold)
+
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        self._keys: List[Hashable] = []
+        self._signatures: List[Optional[np.ndarray]] = []
+        self._positions: Dict[Hashable, int] = {}
+        self.duplicates: Dict[Hashable, Tuple[Hashable, float]] = {}
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text, ``num_perm`` 32 bit values."""
+        hashes = shingle_hashes(text, self.shingle_size, weights=self._weights)
+        if not hashes.size:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        # in place, a temporary of this size costs more than the arithmetic
+        permuted = self._a * hashes
+        permuted += self._b
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows].tobytes()
+
+    def query(self, signature: np.ndarray) -> List[Tuple[Hashable, float]]:
+        """Indexed documents whose estimated similarity with a signature reaches the threshold, most similar first."""
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+        matches = []
+        for index in sorted(candidates):
+            similarity = float(np.count_nonzero(self._signatures[index] == signature)) / self.num_perm
+            if similarity >= self.threshold:
+                matches.append((self._keys[index], similarity))
+        matches.sort(key=lambda match: -match[1])
+        return matches
+
+    def insert(self, key: Hashable, signature: np.ndarray) -> None:
+        """Index a document as canonical."""
+        if key in self._positions:
+            # indexed again, e.g. edited in place: the new signature replaces the old one
+            self._unindex(self._positions[key])
+        index = len(self._keys)
+        self._keys.append(key)
+        self._signatures.append(signature)
+        self._positions[key] = index
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(index)
+
+    def add(self, key: Hashable, text: str) -> Optional[Tuple[Hashable, float]]:
+        """Look a document up, and index it as canonical if it is not a near-duplicate.
+
+        Return:
+            Optional[Tuple[Hashable, float]]: The canonical document it duplicates and their
+            estimated similarity, ``None`` if it is new. Also recorded in ``duplicates``.
+        """
+        signature = self.signature(text)
+        matches = self.query(signature)
+        if matches:
+            self.duplicates[key] = matches[0]
+            return matches[0]
+        self.insert(key, signature)
+        return None
+
+    def remove(self, key: Hashable) -> bool:
+        """Forget a document, e.g. a posting taken down.
+
+        A canonical document leaves the buckets, so a later repost of it is new;
+        the documents recorded as its duplicates stay in ``duplicates``. A
+        duplicate only leaves ``duplicates``.
+
+        Return:
+            bool: Whether the document was known.
+        """
+        if self.duplicates.pop(key, None) is not None:
+            return True
+        index = self._positions.pop(key, None)
+        if index is None:
+            return False
+        self._unindex(index)
+        return True
+
+    def _unindex(self, index: int) -> None:
+        for band, band_key in self._band_keys(self._signatures[index]):
+            bucket = self._buckets[band][band_key]
+            bucket.remove(index)
+            if not bucket:
+                del self._buckets[band][band_key]
+        self._signatures[index] = None
+
+    def __len__(self) -> int:
+        return len(self._positions)
@@ -1,31 +1,147 @@
 """File to parse job descriptions."""
-from constants import JOB_DESCRIPTION_SECTION_HEADERS, TECHNICAL_SKILLS, TASKS, EXCLUDE, REQUIREMENT_KEYWORDS
-from interview_prep.schemas.cv_schema import Document, JobDescriptionChunk
+from constants import TECHNICAL_SKILLS, TASKS, EXCLUDE, REQUIREMENT_KEYWORDS
 from interview_prep.utils.text_tools import normalize_text, normalize_chunk_text
+from interview_prep.utils.keyword_matcher import KeywordMatcher
+from interview_prep.utils.header_index import get_job_description_header_index
+from interview_prep.utils.instrumentation import get_sink, increment, timed
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, BinaryIO, Deque, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+import codecs
+import logging
+import os
+import threading
+
+if TYPE_CHECKING:
+    import mmap
+
+    from interview_prep.schemas.chunk_batch import ChunkBatch
+    from interview_prep.job_descripition.dedup import NearDuplicateIndex
+    from interview_prep.job_descripition.token_packer import TokenBudgetPacker
+    from interview_prep.schemas.cv_schema import Document, JobDescriptionChunk
+    from interview_prep.utils.skill_extractor import SkillExtractor
+
+
+KEYWORD_CATEGORIES = {
+    "requirement": REQUIREMENT_KEYWORDS,
+    "task": TASKS,
+    "skill": TECHNICAL_SKILLS,
+    "exclude": EXCLUDE,
+}
+
+KEYWORD_WEIGHTS = {
+    "requirement": 2,
+    "task": 3,
+    "skill": 5,
+    "exclude": -5,
+}
+
+logger = logging.getLogger(__name__)
+
+# guards the first build of the shared resources below, which are read-only afterwards
+_resources_lock = threading.Lock()
+
+_keyword_matcher = None
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Return the keyword automaton compiled from the constants, building it on first use."""
+    global _keyword_matcher
+    if _keyword_matcher is None:
+        with _resources_lock:
+            if _keyword_matcher is None:
+                _keyword_matcher = KeywordMatcher(KEYWORD_CATEGORIES)
+    return _keyword_matcher
+
+
+_skill_extractor = None
+
+
+def get_skill_extractor() -> "SkillExtractor":
+    """Return the token aware extractor of the constants' keywords, plus the skills of ``SKILLS_VOCABULARY_FILE``."""
+    from config import config
+    from interview_prep.utils.skill_extractor import SkillExtractor
+
+    global _skill_extractor
+    if _skill_extractor is None:
+        with _resources_lock:
+            if _skill_extractor is None:
+                if config.skills_vocabulary_file is not None:
+                    _skill_extractor = SkillExtractor.from_file(config.skills_vocabulary_file, category="skill",
+                                                                vocabularies=KEYWORD_CATEGORIES)
+                else:
+                    _skill_extractor = SkillExtractor(KEYWORD_CATEGORIES)
+    return _skill_extractor
 
 class JobDescriptionParser:
-    """Class to parse job descriptions."""
+    """Class to parse job descriptions.
+
+    The parser holds no state: every method returns its result, and the
+    precompiled resources it uses (keyword automaton, header index, normalizer)
+    are built once per process and shared. One instance can serve any number
+    of threads at once.
+    """
     def __init__(self):
         pass
 
+    @staticmethod
+    def _is_section_header(line: str) -> bool:
+        """Whether a line starts a new section: a known header or any short line."""
+        return len(line.split()) < 5 or line in get_job_description_header_index()
+
+    @timed("jd.parse")
     def parse_description(self, job_description_file: str):
         """Parse a job description file and return a Document model."""
-
         text = ""
         with Path.open(job_description_file, "r") as f:
             text = f.read()
 
+        return self.parse_text(text, source=job_description_file)
+
+    def parse_text(self, text: str, source: str = "<text>") -> "Document":
+        """Parse a job description text and return a Document model."""
+        from interview_prep.schemas.cv_schema import Document
+
         normalized_text = normalize_text(text)
-        doc = Document(category="Job Description",
-                       raw_text=text,
-                       normalized_text=normalized_text,
-                       source=job_description_file)
+        return Document(category="Job Description",
+                        raw_text=text,
+                        normalized_text=normalized_text,
+                        source=source)
 
-        return doc
+    def parse_bytes(self, data: Union[bytes, bytearray, memoryview, "mmap.mmap"], source: str = "<bytes>",
+                    encoding: str = "utf-8") -> "Document":
+        """Parse a job description held in a buffer (bytes, ``memoryview``, ``mmap``), decoded in place."""
+        return self.parse_text(str(data, encoding), source=source)
+
+    def parse_stream(self, stream: Union[TextIO, BinaryIO], source: Optional[str] = None,
+                     encoding: str = "utf-8", block_size: int = 1 << 16) -> "Document":
+        """Parse a job description from a text or binary file object, e.g. a request body or a pipe.
+
+        The stream is read ``block_size`` at a time and binary blocks are decoded
+        as they arrive, so no copy of the whole encoded text is kept. ``source``
+        defaults to the stream's ``name``.
+        """
+        decoder = None
+        parts = []
+        while True:
+            block = stream.read(block_size)
+            if not block:
+                break
+            if isinstance(block, str):
+                parts.append(block)
+                continue
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding)()
+            parts.append(decoder.decode(block))
+        if decoder is not None:
+            parts.append(decoder.decode(b"", final=True))
+        if source is None:
+            source = str(getattr(stream, "name", "<stream>"))
+        return self.parse_text("".join(parts), source=source)
     
-    def _create_sections(self, document: Document) -> List[dict]:
+    @timed("jd.sections")
+    def _create_sections(self, document: "Document") -> List[dict]:
         #manual chunking
         sections = []
         current_section = {
@@ -35,13 +151,16 @@ class JobDescriptionParser:
             "id": 0,
         }
 
-        for i, line in enumerate(document.normalized_text.split("\n")):
+        lines = document.normalized_text.split("\n")
+        increment("jd.lines", len(lines))
+
+        for i, line in enumerate(lines):
             
             if not line.strip():
                 continue
             
             #checking main section headers
-            if line in JOB_DESCRIPTION_SECTION_HEADERS or len(line.split()) < 5:
+            if self._is_section_header(line):
                 # Save current section if it has content
                 if current_section["content"] or current_section["lines"]:
                     sections.append(current_section)
@@ -61,32 +180,61 @@ class JobDescriptionParser:
         if current_section["content"] or current_section["lines"]:
             sections.append(current_section)
         
-        print(f"\nCreated {len(sections)} sections:\n")
-        
-        for index, s in enumerate(sections):
-            content_text = ' '.join(s['content'])
-            print(f"Section {index}:")
-            print(f"Header: {s['section']}")
-            print(f"Content length: {len(content_text)} chars")
-            if s['lines']:
-                print(f"Lines: {min(s['lines'])} - {max(s['lines'])}")
-            print(f"Preview: {content_text[:150]}...")
-            print("\n")
+        increment("jd.sections", len(sections))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Created %d sections", len(sections))
+            for index, s in enumerate(sections):
+                content_text = ' '.join(s['content'])
+                lines_range = f"{min(s['lines'])} - {max(s['lines'])}" if s['lines'] else "-"
+                logger.debug("Section %d: Header: %s | Content length: %d chars | Lines: %s | Preview: %s...",
+                             index, s['section'], len(content_text), lines_range, content_text[:150])
         
         return sections
 
-    def chunk_description(self, document: Document, max_chunk_size: int = 500) -> List[JobDescriptionChunk]:
-        """Chunk a job description document.
+    @staticmethod
+    def _split_by_characters(section_title: str, full_content: str, max_chunk_size: int) -> Iterator[str]:
+        """Yield the chunk texts of a section, split into chunks of at most ``max_chunk_size`` characters."""
+        # If content fits in one chunk
+        if len(full_content) <= max_chunk_size:
+            chunk_text = f"{section_title}\n\n{full_content}"
+            yield normalize_chunk_text(chunk_text)
+            return
+
+        # Split content into smaller chunks
+        words = full_content.split()
+        current_chunk_words = []
+        current_length = 0
         
-        - Consecutive empty sections are combined into a single chunk with their titles
-        - Sections with content are split into chunks of max_chunk_size characters
-        - Each content chunk includes the section title
-        """
-        sections = self._create_sections(document)
+        for word in words:
+            word_length = len(word) + 1  # +1 for space
+            
+            if current_length + word_length > max_chunk_size and current_chunk_words:
+                # Create chunk with current words
+                chunk_content = " ".join(current_chunk_words)
+                chunk_text = f"{section_title}\n\n{chunk_content}"
+                yield normalize_chunk_text(chunk_text)
+                current_chunk_words = [word]
+                current_length = word_length
+            else:
+                current_chunk_words.append(word)
+                current_length += word_length
         
-        chunks = []
+        # Don't forget last chunk
+        if current_chunk_words:
+            chunk_content = " ".join(current_chunk_words)
+            chunk_text = f"{section_title}\n\n{chunk_content}"
+            yield normalize_chunk_text(chunk_text)
+
+    def _iter_chunk_rows(self, sections: List[dict], max_chunk_size: int,
+                         packer: Optional["TokenBudgetPacker"] = None) -> Iterator[dict]:
+        """Yield the fields of every chunk, see ``chunk_description`` for the rules."""
         chunk_id = 0
         empty_sections_buffer = []
+
+        if packer is not None:
+            # tokenize every section once, in a single batch
+            packer.prepare(text for section in sections if section["content"]
+                           for text in (" ".join(section["content"]), f"{section['section']}\n\n"))
         
         for section in sections:
             # If section has no content, add to buffer
@@ -97,88 +245,87 @@ class JobDescriptionParser:
             #create a chunk from empty sections
             if empty_sections_buffer:
                 combined_title = " ".join(empty_sections_buffer)
-                chunks.append(JobDescriptionChunk(
-                    id=chunk_id,
-                    text=combined_title,
-                    section="Metadata",
-                    chunk_type="HEADER",
-                ))
+                yield {"id": chunk_id,
+                       "text": combined_title,
+                       "section": "Metadata",
+                       "chunk_type": "HEADER"}
                 chunk_id += 1
                 empty_sections_buffer = []
 
             # handle non empty content
             section_title = section["section"]
             full_content = " ".join(section["content"])
-            
-            # If content fits in one chunk
-            if len(full_content) <= max_chunk_size:
-                chunk_text = f"{section_title}\n\n{full_content}"
-                chunks.append(JobDescriptionChunk(
-                    id=chunk_id,
-                    text=normalize_chunk_text(chunk_text),
-                    section=section_title,
-                    chunk_type="CONTENT",
-                ))
-                chunk_id += 1
+            if packer is not None:
+                chunk_texts = packer.pack(section_title, full_content)
             else:
-                # Split content into smaller chunks
-                words = full_content.split()
-                current_chunk_words = []
-                current_length = 0
-                
-                for word in words:
-                    word_length = len(word) + 1  # +1 for space
-                    
-                    if current_length + word_length > max_chunk_size and current_chunk_words:
-                        # Create chunk with current words
-                        chunk_content = " ".join(current_chunk_words)
-                        chunk_text = f"{section_title}\n\n{chunk_content}"
-                        chunks.append(JobDescriptionChunk(
-                            id=chunk_id,
-                            text=normalize_chunk_text(chunk_text),
-                            section=section_title,
-                            chunk_type="CONTENT"
-                        ))
-                        chunk_id += 1
-                        current_chunk_words = [word]
-                        current_length = word_length
-                    else:
-                        current_chunk_words.append(word)
-                        current_length += word_length
-                
-                # Don't forget last chunk
-                if current_chunk_words:
-                    chunk_content = " ".join(current_chunk_words)
-                    chunk_text = f"{section_title}\n\n{chunk_content}"
-                    chunks.append(JobDescriptionChunk(
-                        id=chunk_id,
-                        text=normalize_chunk_text(chunk_text),
-                        section=section_title,
-                        chunk_type="CONTENT"
-                    ))
-                    chunk_id += 1
+                chunk_texts = self._split_by_characters(section_title, full_content, max_chunk_size)
+
+            for chunk_text in chunk_texts:
+                yield {"id": chunk_id,
+                       "text": chunk_text,
+                       "section": section_title,
+                       "chunk_type": "CONTENT"}
+                chunk_id += 1
         
         # Handle any remaining empty sections at the end
         if empty_sections_buffer:
             combined_title = " | ".join(empty_sections_buffer)
-            chunks.append(JobDescriptionChunk(
-                id=chunk_id,
-                text=combined_title,
-                section="Metadata",
-                chunk_type="HEADER"
-            ))
+            yield {"id": chunk_id,
+                   "text": combined_title,
+                   "section": "Metadata",
+                   "chunk_type": "HEADER"}
+
+    @timed("jd.chunk")
+    def chunk_description(self, document: "Document", max_chunk_size: int = 500,
+                          packer: Optional["TokenBudgetPacker"] = None,
+                          sections: Optional[List[dict]] = None) -> List["JobDescriptionChunk"]:
+        """Chunk a job description document.
         
-        print(f"\n✓ Created {len(chunks)} chunks from {len(sections)} sections\n")
+        - Consecutive empty sections are combined into a single chunk with their titles
+        - Sections with content are split into chunks of max_chunk_size characters,
+          or of at most ``packer.max_tokens`` tokens when a ``TokenBudgetPacker`` is given
+        - Each content chunk includes the section title
+
+        ``sections`` are the document's sections when the caller already built
+        them (e.g. to display them), so the document is not sectioned again.
+
+        Returns the chunks, in document order.
+        """
+        from interview_prep.schemas.cv_schema import JobDescriptionChunk
+
+        if sections is None:
+            sections = self._create_sections(document)
+        chunks = [JobDescriptionChunk(**row) for row in self._iter_chunk_rows(sections, max_chunk_size, packer)]
         
-        for chunk in chunks:
-            print(f"Chunk {chunk.id}: Section='{chunk.section}', Type={chunk.chunk_type}, Length={len(chunk.text)} chars")
-            print(f"Preview: {chunk.text[:100]}...")
-            print()
+        increment("jd.chunks", len(chunks))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Created %d chunks from %d sections", len(chunks), len(sections))
+            for chunk in chunks:
+                logger.debug("Chunk %d: Section='%s', Type=%s, Length=%d chars | Preview: %s...",
+                             chunk.id, chunk.section, chunk.chunk_type, len(chunk.text), chunk.text[:100])
         
-        self.chunks = chunks
+        return chunks
+
+    @timed("jd.chunk")
+    def chunk_description_batch(self, document: "Document", max_chunk_size: int = 500,
+                                packer: Optional["TokenBudgetPacker"] = None) -> "ChunkBatch":
+        """Chunk a job description like ``chunk_description``, into a columnar ``ChunkBatch``.
+
+        No pydantic model is built until a chunk is accessed or exported.
+        """
+        from interview_prep.schemas.chunk_batch import ChunkBatchBuilder
+
+        builder = ChunkBatchBuilder(kind="Job Description")
+        for row in self._iter_chunk_rows(self._create_sections(document), max_chunk_size, packer):
+            builder.append(chunk_id=row.pop("id"), **row)
+        batch = builder.build()
+        increment("jd.chunks", len(batch))
+        return batch
     
-    def select_relevant_chunks(self):
-        """Select the most relevant chunks for the job description.
+    @timed("jd.score")
+    def select_relevant_chunks(self, chunks: List["JobDescriptionChunk"],
+                               extractor: Optional["SkillExtractor"] = None) -> List[dict]:
+        """Select the most relevant chunks of a job description, see ``chunk_description``.
         
         Scores chunks based on:
         - Presence of requirements keywords from config
@@ -186,56 +333,161 @@ class JobDescriptionParser:
         - Presence of technical skills from config
         - Absence of exclude keywords from config
         
+        Keywords are matched with a single pass of the keyword automaton over
+        each chunk; the hits (keyword start positions per category) are returned
+        along with the score. With a ``SkillExtractor`` (see ``get_skill_extractor``),
+        keywords only match whole tokens and all chunks are matched in batches.
+
         Returns chunks sorted by relevance score.
         """
         scored_chunks = []
-        
-        for chunk in self.chunks:
-            score = 0
-            text_lower = chunk.text.lower()
-            
-            # Check for requirements keywords (weight: 2)
-            for keyword in REQUIREMENT_KEYWORDS:
-                if keyword.lower() in text_lower:
-                    score += 2
-            
-            # Check for task verbs (weight: 3)
-            for task in TASKS:
-                if task.lower() in text_lower:
-                    score += 3
-            
-            # Check for technical skills (weight: 5)
-            for skill in TECHNICAL_SKILLS:
-                if skill.lower() in text_lower:
-                    score += 5
-            
-            # Penalize for exclude keywords (weight: -10)
-            for exclude_word in EXCLUDE:
-                if exclude_word.lower() in text_lower:
-                    score -= 5
-            
-            # Boost score if chunk type is already marked as relevant
-            
+        if extractor is not None:
+            results = extractor.score_texts([chunk.text for chunk in chunks], KEYWORD_WEIGHTS)
+        else:
+            matcher = get_keyword_matcher()
+            results = (matcher.score(chunk.text, KEYWORD_WEIGHTS) for chunk in chunks)
+
+        for chunk, (score, hits) in zip(chunks, results):
+            # requirements (2), task verbs (3), technical skills (5), exclude keywords (-5)
+            if get_sink().enabled:
+                increment("jd.keyword_hits", sum(len(found) for found in hits.values()))
+
             scored_chunks.append({
                 "chunk": chunk,
-                "score": score
+                "score": score,
+                "hits": hits,
             })
         
         # Sort by score descending
         scored_chunks.sort(key=lambda x: x["score"], reverse=True)
         
-        # Print summary
-        print(f"\n✓ Scored {len(scored_chunks)} chunks:\n")
-        for item in scored_chunks:
-            chunk = item["chunk"]
-            score = item["score"]
-            print(f"Chunk {chunk.id} | Score: {score:3d} | Type: {chunk.chunk_type} | Section: {chunk.section}")
-            print(f"Preview: {chunk.text[:80]}...")
-            print()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Scored %d chunks", len(scored_chunks))
+            for item in scored_chunks:
+                chunk = item["chunk"]
+                logger.debug("Chunk %d | Score: %3d | Type: %s | Section: %s | Preview: %s...",
+                             chunk.id, item["score"], chunk.chunk_type, chunk.section, chunk.text[:80])
         
         return scored_chunks
-            
 
+    def process(self, document: "Document", max_chunk_size: int = 500,
+                packer: Optional["TokenBudgetPacker"] = None,
+                extractor: Optional["SkillExtractor"] = None,
+                sections: Optional[List[dict]] = None) -> Tuple[List["JobDescriptionChunk"], List[dict]]:
+        """Chunk and score a parsed job description.
 
-            
+        Args:
+            sections (List[dict], optional): The sections of the document if already built, see ``chunk_description``.
+        Return:
+            Tuple[List[JobDescriptionChunk], List[dict]]: The chunks, and the
+            output of ``select_relevant_chunks``.
+        """
+        chunks = self.chunk_description(document, max_chunk_size=max_chunk_size, packer=packer, sections=sections)
+        return chunks, self.select_relevant_chunks(chunks, extractor=extractor)
+
+    def process_many(self,
+                     documents: Iterable[Union["Document", str]],
+                     workers: Optional[int] = None,
+                     max_chunk_size: int = 500,
+                     packer: Optional["TokenBudgetPacker"] = None,
+                     extractor: Optional["SkillExtractor"] = None,
+                     deduplicate: Optional["NearDuplicateIndex"] = None,
+                     max_in_flight: Optional[int] = None,
+                     ) -> Iterator[Tuple["Document", List["JobDescriptionChunk"], List[dict]]]:
+        """Parse, chunk and score many job descriptions over a thread pool.
+
+        All threads share this parser and the process-wide resources, so nothing
+        is rebuilt per thread or per document. Results are yielded in input
+        order, each one as soon as it and the ones before it are done. At most
+        ``max_in_flight`` documents are submitted but not yet yielded, so the
+        input is read lazily and memory stays flat whatever its size. Threads
+        pay off when parsing overlaps with I/O (file reads, a tokenizer
+        releasing the GIL) or on a free-threaded Python build; for CPU-bound
+        work under the GIL, ``CVReader.read_many``'s process pool is the tool.
+
+        An exception raised while parsing or processing a document is raised
+        by the iterator in that document's place, after the results of the
+        documents before it, and ends the iteration. The documents in flight
+        that have not started are then cancelled, as they are when the
+        iteration is stopped early; the ones already running finish first.
 
+        With a ``NearDuplicateIndex``, every parsed document is looked up by its
+        source before it is chunked: a near-duplicate of a document of the same
+        call is not processed again and gets the canonical document's chunks and
+        scores (the same objects). ``deduplicate.duplicates`` maps its source to
+        the canonical source and their similarity.
+
+        Args:
+            documents (Iterable[Union[Document, str]]): Parsed documents, or paths of
+                job description text files.
+            workers (int, optional): Number of threads. Defaults to the executor's default.
+            max_chunk_size (int): See ``chunk_description``.
+            packer (TokenBudgetPacker, optional): See ``chunk_description``.
+            extractor (SkillExtractor, optional): See ``select_relevant_chunks``.
+            deduplicate (NearDuplicateIndex, optional): Index of the canonical documents.
+            max_in_flight (int, optional): Maximum number of pending documents. Defaults to twice
+                the number of threads.
+        Return:
+            Iterator[Tuple[Document, List[JobDescriptionChunk], List[dict]]]: The document,
+            its chunks and its scored chunks.
+        """
+        def parse(document: Union["Document", str]) -> "Document":
+            if isinstance(document, (str, Path)):
+                return self.parse_description(str(document))
+            return document
+
+        def run(document: "Document") -> Tuple[List["JobDescriptionChunk"], List[dict]]:
+            return self.process(document, max_chunk_size=max_chunk_size, packer=packer, extractor=extractor)
+
+        # the default of ThreadPoolExecutor
+        workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        max_in_flight = max(max_in_flight or 2 * workers, 1)
+        pending_documents = iter(documents)
+
+        # build the shared resources once, before the threads race for them
+        get_keyword_matcher()
+        get_job_description_header_index()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # input order: documents being parsed, then parsed documents being processed
+            parsing: Deque[Future] = deque()
+            running: Deque[Tuple["Document", Future]] = deque()
+            canonical = {}
+
+            def submit_next() -> bool:
+                for document in pending_documents:
+                    parsing.append(executor.submit(parse, document))
+                    return True
+                return False
+
+            def fill() -> None:
+                while len(parsing) + len(running) < max_in_flight and submit_next():
+                    pass
+
+            def start_next() -> None:
+                # deduplicate in input order, so a canonical document is always seen first
+                document = parsing.popleft().result()
+                match = deduplicate.add(document.source, document.normalized_text) if deduplicate is not None else None
+                if match is not None and match[0] in canonical:
+                    increment("jd.duplicates")
+                    future = canonical[match[0]]
+                else:
+                    future = executor.submit(run, document)
+                    if deduplicate is not None:
+                        canonical.setdefault(document.source, future)
+                running.append((document, future))
+
+            try:
+                fill()
+                while parsing or running:
+                    if parsing and (parsing[0].done() or not running):
+                        start_next()
+                    elif running[0][1].done():
+                        document, future = running.popleft()
+                        fill()
+                        yield document, *future.result()
+                    else:
+                        wait([running[0][1], *([parsing[0]] if parsing else [])], return_when=FIRST_COMPLETED)
+            finally:
+                # on an error or an early stop, do not wait for documents nobody will read
+                for future in [*parsing, *(future for _, future in running)]:
+                    future.cancel()
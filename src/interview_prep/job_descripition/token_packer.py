@@ -0,0 +1,173 @@
+"""Token budget aware splitting of job description sections."""
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from interview_prep.utils.text_tools import normalize_chunk_text
+
+
+DEFAULT_TOKENIZER_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class TokenBudgetPacker:
+    """Split section contents into chunks of at most ``max_tokens`` tokens.
+
+    Texts are tokenized in batches by a transformers fast tokenizer and their
+    token offsets are cached, so a section is tokenized once however many
+    chunks it is split into. Chunks are cut between words at token boundaries
+    of the whole section, and the section title and the special tokens the
+    model adds are counted in the budget. Every emitted chunk text is then
+    tokenized as it is and split again if it is still over. The cache and the
+    tokenizer calls are guarded by a lock, so a packer can be shared by threads.
+    """
+
+    def __init__(self,
+                 tokenizer_name: str = DEFAULT_TOKENIZER_NAME,
+                 max_tokens: int = 256,
+                 overlap: int = 0,
+                 tokenizer: Optional[Any] = None,
+                 cache_size: int = 4096):
+        """Create a packer.
+
+        Args:
+            tokenizer_name (str): Name of the transformers tokenizer, usually the one of the embedding model.
+            max_tokens (int): Maximum number of tokens of a chunk.
+            overlap (int): Number of tokens a chunk repeats from the end of the previous one.
+            tokenizer (Any, optional): Already loaded fast tokenizer. Loaded on first use otherwise.
+            cache_size (int): Number of tokenized texts kept in memory.
+        """
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if not 0 <= overlap < max_tokens:
+            raise ValueError("overlap must be between 0 and max_tokens - 1")
+        self.tokenizer_name = tokenizer_name
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+        self.cache_size = cache_size
+        self._tokenizer = tokenizer
+        self._offsets: "OrderedDict[str, List[Tuple[int, int]]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def tokenizer(self) -> Any:
+        if self._tokenizer is None:
+            from transformers import AutoTokenizer
+            self._tokenizer = AutoTokenizer.from_pretrained(self.tokenizer_name, use_fast=True)
+        if not getattr(self._tokenizer, "is_fast", False):
+            raise ValueError(f"{self.tokenizer_name} has no fast tokenizer, token offsets are needed")
+        return self._tokenizer
+
+    def prepare(self, texts: Iterable[str]) -> None:
+        """Tokenize the texts missing from the cache in a single batch."""
+        with self._lock:
+            missing = list(dict.fromkeys(text for text in texts if text not in self._offsets))
+            if not missing:
+                return
+            encoded = self.tokenizer(missing,
+                                     add_special_tokens=False,
+                                     return_offsets_mapping=True,
+                                     return_attention_mask=False,
+                                     return_token_type_ids=False)
+            for text, offsets in zip(missing, encoded["offset_mapping"]):
+                self._offsets[text] = [tuple(offset) for offset in offsets]
+            while len(self._offsets) > self.cache_size:
+                self._offsets.popitem(last=False)
+
+    def _token_offsets(self, text: str) -> List[Tuple[int, int]]:
+        with self._lock:
+            offsets = self._offsets.get(text)
+            if offsets is None:
+                self.prepare([text])
+                offsets = self._offsets[text]
+            else:
+                self._offsets.move_to_end(text)
+            return offsets
+
+    def count_tokens(self, texts: Sequence[str]) -> List[int]:
+        """Number of tokens of every text, special tokens excluded."""
+        self.prepare(texts)
+        return [len(self._token_offsets(text)) for text in texts]
+
+    def content_budget(self, title: str) -> int:
+        """Tokens left for the content of a chunk once the title, separator and special tokens are counted.
+
+        A title leaving no more than ``overlap`` tokens raises a ``ValueError``: its chunks could not
+        make progress within ``max_tokens``.
+        """
+        used = len(self._token_offsets(normalize_chunk_text(title))) + self._special_tokens()
+        budget = self.max_tokens - used
+        if budget <= self.overlap:
+            raise ValueError(f"Section title {title!r} leaves {budget} tokens of the {self.max_tokens} token "
+                             f"budget, more than the overlap of {self.overlap} are needed")
+        return budget
+
+    def _special_tokens(self) -> int:
+        return self.tokenizer.num_special_tokens_to_add(pair=False)
+
+    def pack(self, title: str, content: str) -> List[str]:
+        """Split a section into chunk texts ``"{title} {content part}"`` within the token budget.
+
+        The parts are first sized with the tokens of the whole content. The
+        emitted texts are normalized, which changes their whitespace and so
+        possibly their tokens, so every emitted text is tokenized again and
+        its part split further if it is over ``max_tokens``.
+
+        Args:
+            title (str): The section title, repeated in every chunk.
+            content (str): The section content.
+        Return:
+            List[str]: The normalized chunk texts.
+        """
+        offsets = self._token_offsets(content)
+        budget = self.content_budget(title)
+        if not offsets:
+            return [normalize_chunk_text(f"{title}\n\n{content}")]
+
+        def render(start: int, end: int) -> str:
+            return normalize_chunk_text(f"{title}\n\n{content[offsets[start][0]:offsets[end - 1][1]]}")
+
+        def fit(start: int, end: int) -> Iterator[str]:
+            text = render(start, end)
+            excess = len(self._token_offsets(text)) + self._special_tokens() - self.max_tokens
+            if excess <= 0 or end - start == 1:
+                yield text
+                return
+            for sub_start, sub_end in self._spans(offsets, start, end, max(end - start - excess, 1)):
+                yield from fit(sub_start, sub_end)
+
+        spans = list(self._spans(offsets, 0, len(offsets), budget))
+        # the emitted texts are checked in one tokenizer batch
+        self.prepare(render(start, end) for start, end in spans)
+        return [text for start, end in spans for text in fit(start, end)]
+
+    def _spans(self, offsets: List[Tuple[int, int]], start: int, stop: int, budget: int) -> Iterator[Tuple[int, int]]:
+        """Token ranges of at most ``budget`` tokens covering ``[start, stop)``, overlapping by ``overlap``."""
+        def glued(i: int) -> bool:
+            # token i continues the word of token i - 1 (a subword or trailing punctuation)
+            return offsets[i][0] == offsets[i - 1][1]
+
+        while True:
+            end = min(start + budget, stop)
+            if end < stop:
+                # cut between words, unless a single word fills the budget
+                cut = end
+                while cut > start + 1 and glued(cut):
+                    cut -= 1
+                if not glued(cut):
+                    end = cut
+            yield start, end
+            if end == stop:
+                return
+            next_start = max(end - self.overlap, start + 1)
+            while next_start < end and glued(next_start):
+                next_start += 1
+            start = next_start
+
+
+@lru_cache(maxsize=8)
+def get_token_packer(tokenizer_name: str = DEFAULT_TOKENIZER_NAME, max_tokens: int = 256,
+                     overlap: int = 0) -> TokenBudgetPacker:
+    """Return a packer shared by every call with the same settings, so the tokenizer loads once per process."""
+    return TokenBudgetPacker(tokenizer_name=tokenizer_name, max_tokens=max_tokens, overlap=overlap)
@@ -0,0 +1,117 @@
+"""End-to-end processing of CVs and job descriptions into JSON records.
+
+Every function here returns plain, JSON serializable dictionaries so it can
+run in a worker process and its result can be written as one JSONL record.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from interview_prep.CV.chunker import CVChunker
+from interview_prep.job_descripition.job_parser import JobDescriptionParser, get_skill_extractor
+from interview_prep.job_descripition.token_packer import DEFAULT_TOKENIZER_NAME, get_token_packer
+
+
+# how job description keywords are matched: "substring" (KeywordMatcher) or "spacy" (SkillExtractor)
+SKILL_MATCHERS = ("substring", "spacy")
+
+
+def skill_extractor(skills: str):
+    """The ``SkillExtractor`` of a ``SKILL_MATCHERS`` name, ``None`` for substring matching."""
+    if skills not in SKILL_MATCHERS:
+        raise ValueError(f"Unknown skill matcher: {skills!r}, expected one of {SKILL_MATCHERS}")
+    return get_skill_extractor() if skills == "spacy" else None
+
+
+def cv_record(document) -> dict:
+    """Section and chunk a read CV ``Document``."""
+    chunker = CVChunker()
+    sections = chunker._retrieve_sections(document)
+    chunks = chunker.chunk_sections(sections)
+    return {"source": document.source,
+            "category": document.category,
+            "document": document.model_dump(),
+            "sections": sections,
+            "chunks": [chunk.model_dump() for chunk in chunks]}
+
+
+def job_description_record(document, max_chunk_size: int = 500, packer=None, skills: str = "substring") -> dict:
+    """Chunk and score a parsed job description ``Document``, to a token budget if a ``packer`` is given.
+
+    ``skills="spacy"`` matches keywords on whole tokens, see ``SKILL_MATCHERS``.
+    """
+    chunks, scored_chunks = JobDescriptionParser().process(document, max_chunk_size=max_chunk_size, packer=packer,
+                                                           extractor=skill_extractor(skills))
+    return {"source": document.source,
+            "category": document.category,
+            "document": document.model_dump(),
+            "chunks": [chunk.model_dump() for chunk in chunks],
+            "scored_chunks": [{"chunk_id": item["chunk"].id,
+                               "score": item["score"],
+                               "hits": item["hits"]}
+                              for item in scored_chunks]}
+
+
+def duplicate_job_description_record(record: dict, file_path: str, similarity: float) -> dict:
+    """Record of a near-duplicate job description file, reusing the chunks and scores of its canonical ``record``."""
+    document = JobDescriptionParser().parse_description(file_path)
+    return {**record,
+            "source": document.source,
+            "document": document.model_dump(),
+            "duplicate_of": record["source"],
+            "similarity": similarity}
+
+
+def process_cv_file(file_path: str, use_cache: bool = True) -> dict:
+    """Read → normalize → section → chunk a CV PDF file."""
+    from interview_prep.CV.cv_reader import CVReader
+
+    return cv_record(CVReader(use_cache=use_cache).read_cv(file_path))
+
+
+def process_job_description_file(file_path: str,
+                                 max_chunk_size: Optional[int] = None,
+                                 max_tokens: Optional[int] = None,
+                                 token_overlap: int = 0,
+                                 tokenizer_name: str = DEFAULT_TOKENIZER_NAME,
+                                 skills: str = "substring") -> dict:
+    """Read → normalize → section → chunk → score a job description text file.
+
+    With ``max_tokens``, sections are split to that token budget by ``tokenizer_name``
+    instead of to ``max_chunk_size`` characters. ``skills`` picks the keyword matching,
+    see ``SKILL_MATCHERS``.
+    """
+    document = JobDescriptionParser().parse_description(file_path)
+    packer = get_token_packer(tokenizer_name, max_tokens, token_overlap) if max_tokens else None
+    return job_description_record(document, max_chunk_size=max_chunk_size or 500, packer=packer, skills=skills)
+
+
+def find_duplicate_job_descriptions(file_paths: Iterable[str],
+                                    threshold: float = 0.85) -> Tuple[List[str], Dict[str, List[Tuple[str, float]]]]:
+    """Split job description files into canonical ones and their near-duplicates.
+
+    Files are read and normalized once more for their MinHash signature, which
+    is much cheaper than chunking and scoring them. The first file of each group
+    of near-duplicates, in input order, is the canonical one; a file that cannot
+    be read is kept canonical so that processing it reports the error.
+
+    Return:
+        Tuple[List[str], Dict[str, List[Tuple[str, float]]]]: The canonical files, and the
+        near-duplicates of each canonical file with their estimated similarity.
+    """
+    from interview_prep.job_descripition.dedup import NearDuplicateIndex
+
+    index = NearDuplicateIndex(threshold=threshold)
+    parser = JobDescriptionParser()
+    canonical, duplicates = [], {}
+    for file_path in file_paths:
+        try:
+            text = parser.parse_description(file_path).normalized_text
+        except Exception:
+            canonical.append(file_path)
+            continue
+        match = index.add(file_path, text)
+        if match is None:
+            canonical.append(file_path)
+        else:
+            duplicates.setdefault(match[0], []).append((file_path, match[1]))
+    return canonical, duplicates
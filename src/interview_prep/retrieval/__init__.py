@@ -0,0 +1 @@
+"""Lexical retrieval of CV evidence for job description chunks."""
@@ -0,0 +1,270 @@
+"""BM25 inverted index over the CV chunks of many candidates.
+
+Every CV chunk (see ``CVChunker.chunk_sections``) is one document of the
+index. A term's posting list is two typed arrays, the chunk rows holding it
+(4 bytes each) and its frequency in them (2 bytes each), read as numpy views
+at query time, so scoring a query touches only the postings of its terms.
+
+CVs are added and removed as a whole. A removed CV leaves its rows in the
+posting lists, masked out of the results, until more than ``compact_ratio`` of
+the rows are dead and the postings are rewritten without them.
+"""
+
+import json
+import math
+import re
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from interview_prep.schemas.cv_schema import CVChunk
+from interview_prep.utils.instrumentation import increment, stage
+
+
+# words, keeping skills such as "c++", "c#" and "node.js" in one token
+_TOKEN_RE = re.compile(r"\w[\w+#]*(?:\.\w[\w+#]*)*")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the their this to was were will "
+    "with you your we our".split())
+
+_MAX_FREQUENCY = (1 << 16) - 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Case folded word tokens of a text, stop words removed."""
+    return [token for token in _TOKEN_RE.findall(text.casefold()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 ranking of CV chunks, with CVs added and removed incrementally.
+
+    The document frequencies and the average chunk length only count the live
+    chunks, so the scores after removing a CV are those of an index built
+    without it.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, compact_ratio: float = 0.25):
+        """Create an empty index.
+
+        Args:
+            k1 (float): Term frequency saturation.
+            b (float): Strength of the chunk length normalization, between 0 and 1.
+            compact_ratio (float): Fraction of dead rows triggering the rewrite of the posting lists.
+        """
+        self.k1 = k1
+        self.b = b
+        self.compact_ratio = compact_ratio
+
+        self._terms: Dict[str, int] = {}
+        self._postings: List[array] = []
+        self._frequencies: List[array] = []
+        self._document_frequencies = array("I")
+
+        # one row per chunk ever added since the last compaction
+        self._chunks: List[CVChunk] = []
+        self._row_sources: List[str] = []
+        self._lengths = array("I")
+        self._live = bytearray()
+        self._rows: Dict[str, Tuple[int, int]] = {}
+
+        self._live_count = 0
+        self._total_length = 0
+        self._normalizers: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    def __contains__(self, source: str) -> bool:
+        return source in self._rows
+
+    @property
+    def sources(self) -> List[str]:
+        """Sources of the indexed CVs, in insertion order."""
+        return list(self._rows)
+
+    def add(self, source: str, chunks: Sequence[CVChunk]) -> None:
+        """Index the chunks of one CV, replacing those already indexed for the same source.
+
+        Args:
+            source (str): Source of the CV, e.g. its file path.
+            chunks (Sequence[CVChunk]): The chunks of the CV, as returned by ``CVChunker.chunk_sections``.
+        """
+        if source in self._rows:
+            self.remove(source)
+        start = len(self._chunks)
+        for row, chunk in enumerate(chunks, start=start):
+            tokens = tokenize(chunk.text)
+            for term, frequency in Counter(tokens).items():
+                term_id = self._terms.get(term)
+                if term_id is None:
+                    term_id = self._terms[term] = len(self._postings)
+                    self._postings.append(array("I"))
+                    self._frequencies.append(array("H"))
+                    self._document_frequencies.append(0)
+                self._postings[term_id].append(row)
+                self._frequencies[term_id].append(min(frequency, _MAX_FREQUENCY))
+                self._document_frequencies[term_id] += 1
+            self._chunks.append(chunk)
+            self._row_sources.append(source)
+            self._lengths.append(len(tokens))
+            self._total_length += len(tokens)
+        count = len(self._chunks) - start
+        self._live.extend(b"\x01" * count)
+        self._rows[source] = (start, start + count)
+        self._live_count += count
+        self._normalizers = None
+        increment("retrieval.indexed_chunks", count)
+
+    def remove(self, source: str) -> bool:
+        """Remove the chunks of a CV from the index.
+
+        Return:
+            bool: Whether the CV was indexed.
+        """
+        rows = self._rows.pop(source, None)
+        if rows is None:
+            return False
+        for row in range(*rows):
+            self._live[row] = 0
+            for term in set(tokenize(self._chunks[row].text)):
+                self._document_frequencies[self._terms[term]] -= 1
+            self._total_length -= self._lengths[row]
+        self._live_count -= rows[1] - rows[0]
+        self._normalizers = None
+        if len(self._chunks) - self._live_count > self.compact_ratio * len(self._chunks):
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Rewrite the posting lists without the rows of removed CVs."""
+        live = np.frombuffer(self._live, dtype=np.uint8).astype(bool)
+        if live.all():
+            return
+        new_rows = (np.cumsum(live) - 1).astype(np.uint32)
+        for term_id, postings in enumerate(self._postings):
+            rows = np.frombuffer(postings, dtype=np.uint32)
+            keep = live[rows]
+            if not keep.all():
+                frequencies = np.frombuffer(self._frequencies[term_id], dtype=np.uint16)[keep]
+                self._frequencies[term_id] = _to_array("H", frequencies)
+                rows = rows[keep]
+            self._postings[term_id] = _to_array("I", new_rows[rows])
+
+        kept = np.flatnonzero(live).tolist()
+        self._chunks = [self._chunks[row] for row in kept]
+        self._row_sources = [self._row_sources[row] for row in kept]
+        self._lengths = array("I", (self._lengths[row] for row in kept))
+        self._live = bytearray(b"\x01" * len(kept))
+        # shift the rows of every CV, including those without chunks, which have no row to rebuild them from
+        live_before = np.concatenate(([0], np.cumsum(live))).tolist()
+        self._rows = {source: (live_before[start], live_before[stop]) for source, (start, stop) in self._rows.items()}
+        self._normalizers = None
+        increment("retrieval.compactions")
+
+    def _length_normalizers(self) -> np.ndarray:
+        # k1 * (1 - b + b * length / average length) of every row, until the next change
+        if self._normalizers is None:
+            lengths = np.array(self._lengths, dtype=np.float64)
+            average = self._total_length / self._live_count if self._live_count else 1.0
+            self._normalizers = self.k1 * (1 - self.b + self.b * lengths / max(average, 1e-9))
+        return self._normalizers
+
+    def _scores(self, query: str) -> np.ndarray:
+        """BM25 score of every row for a query, 0 for the rows of removed CVs."""
+        scores = np.zeros(len(self._chunks), dtype=np.float64)
+        if not self._live_count:
+            return scores
+        normalizers = self._length_normalizers()
+        for term, query_frequency in Counter(tokenize(query)).items():
+            term_id = self._terms.get(term)
+            if term_id is None or not self._document_frequencies[term_id]:
+                continue
+            document_frequency = self._document_frequencies[term_id]
+            idf = math.log(1 + (self._live_count - document_frequency + 0.5) / (document_frequency + 0.5))
+            rows = np.frombuffer(self._postings[term_id], dtype=np.uint32)
+            frequencies = np.frombuffer(self._frequencies[term_id], dtype=np.uint16).astype(np.float64)
+            # the rows of a posting list are distinct, so the fancy indexed add is exact
+            scores[rows] += (query_frequency * idf * (self.k1 + 1)) * frequencies / (frequencies + normalizers[rows])
+        if self._live_count < len(self._chunks):
+            scores[~np.frombuffer(self._live, dtype=np.uint8).astype(bool)] = 0
+        return scores
+
+    def search(self, query: str, k: int = 10, max_per_source: Optional[int] = None) -> List[dict]:
+        """Best matching CV chunks for a query.
+
+        Args:
+            query (str): The query text, e.g. a job description chunk.
+            k (int): Maximum number of results.
+            max_per_source (int, optional): Maximum number of results from the same CV.
+        Return:
+            List[dict]: ``source``, ``chunk`` and ``score`` of every result, best first.
+        """
+        scores = self._scores(query)
+        candidates = np.flatnonzero(scores > 0)
+        if max_per_source is None and len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        # by decreasing score, then insertion order
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+
+        results = []
+        per_source: Counter = Counter()
+        for row in candidates.tolist():
+            source = self._row_sources[row]
+            if max_per_source is not None:
+                if per_source[source] >= max_per_source:
+                    continue
+                per_source[source] += 1
+            results.append({"source": source, "chunk": self._chunks[row], "score": float(scores[row])})
+            if len(results) == k:
+                break
+        return results
+
+    def evidence(self, scored_chunks: Sequence[dict], top_k: int = 10, k: int = 5,
+                 max_per_source: Optional[int] = None) -> List[dict]:
+        """Ranked CV evidence for the best scored job description chunks.
+
+        Args:
+            scored_chunks (Sequence[dict]): Output of ``select_relevant_chunks``, best first.
+            top_k (int): Number of job description chunks to query.
+            k (int): Number of CV chunks per job description chunk.
+            max_per_source (int, optional): Maximum number of CV chunks from the same CV.
+        Return:
+            List[dict]: ``jd_chunk_id`` and ``evidence``, the ``search`` results, of every job description chunk.
+        """
+        with stage("retrieval.evidence"):
+            increment("retrieval.queries", min(top_k, len(scored_chunks)))
+            return [{"jd_chunk_id": item["chunk"].id,
+                     "evidence": self.search(item["chunk"].text, k=k, max_per_source=max_per_source)}
+                    for item in scored_chunks[:top_k]]
+
+    def add_records(self, records: Iterable[dict]) -> int:
+        """Index CV records, as written by ``interview-prep cv``; failed records are skipped.
+
+        Return:
+            int: Number of CVs indexed.
+        """
+        added = 0
+        for record in records:
+            if "chunks" not in record:
+                continue
+            self.add(record["source"], [CVChunk(**chunk) for chunk in record["chunks"]])
+            added += 1
+        return added
+
+    @classmethod
+    def from_jsonl(cls, path: Union[str, Path], **kwargs) -> "BM25Index":
+        """Index the CV records of a JSONL output file of ``interview-prep cv``."""
+        index = cls(**kwargs)
+        with Path(path).open("r", encoding="utf-8") as f:
+            index.add_records(json.loads(line) for line in f if line.strip())
+        return index
+
+
+def _to_array(typecode: str, values: np.ndarray) -> array:
+    packed = array(typecode)
+    packed.frombytes(values.astype(np.dtype(typecode)).tobytes())
+    return packed
@@ -0,0 +1,144 @@
+"""Columnar representation of a list of chunks."""
+
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from interview_prep.schemas.cv_schema import CVChunk, JobDescriptionChunk
+
+
+class ChunkBatch:
+    """Chunks stored as parallel arrays over one shared text buffer.
+
+    Every chunk is a row: integer ids, offsets into ``text_buffer`` and codes
+    into the ``sections`` and ``chunk_types`` string tables. ``CVChunk`` or
+    ``JobDescriptionChunk`` models are only built when a chunk is accessed or
+    exported, and without re-running validation on data the chunker produced.
+    """
+
+    def __init__(self,
+                 kind: str,
+                 text_buffer: str,
+                 text_offsets: np.ndarray,
+                 chunk_ids: np.ndarray,
+                 section_ids: np.ndarray,
+                 locations: np.ndarray,
+                 section_codes: np.ndarray,
+                 type_codes: np.ndarray,
+                 sections: List[str],
+                 chunk_types: List[str]):
+        self.kind = kind
+        self.text_buffer = text_buffer
+        # chunk i spans text_buffer[text_offsets[i]:text_offsets[i + 1]]
+        self.text_offsets = text_offsets
+        self.chunk_ids = chunk_ids
+        self.section_ids = section_ids
+        self.locations = locations
+        self.section_codes = section_codes
+        self.type_codes = type_codes
+        self.sections = sections
+        self.chunk_types = chunk_types
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def text(self, index: int) -> str:
+        """Text of the chunk at a given index."""
+        return self.text_buffer[self.text_offsets[index]:self.text_offsets[index + 1]]
+
+    def texts(self) -> List[str]:
+        """Text of every chunk."""
+        offsets = self.text_offsets.tolist()
+        return [self.text_buffer[start:end] for start, end in zip(offsets, offsets[1:])]
+
+    def __getitem__(self, index: int) -> Union[CVChunk, JobDescriptionChunk]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Chunk index {index} out of range.")
+
+        section = self.sections[self.section_codes[index]]
+        chunk_type = self.chunk_types[self.type_codes[index]]
+        if self.kind == "CV":
+            return CVChunk.model_construct(section_id=int(self.section_ids[index]),
+                                           chunk_id=int(self.chunk_ids[index]),
+                                           text=self.text(index),
+                                           section=section,
+                                           chunk_type=chunk_type,
+                                           location=int(self.locations[index]))
+        return JobDescriptionChunk.model_construct(id=int(self.chunk_ids[index]),
+                                                   text=self.text(index),
+                                                   section=section,
+                                                   chunk_type=chunk_type)
+
+    def __iter__(self) -> Iterator[Union[CVChunk, JobDescriptionChunk]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_models(self) -> List[Union[CVChunk, JobDescriptionChunk]]:
+        """Materialize every chunk as a pydantic model."""
+        return list(self)
+
+    def to_records(self) -> List[dict]:
+        """Export every chunk as a plain dictionary, without building models."""
+        sections = [self.sections[code] for code in self.section_codes.tolist()]
+        chunk_types = [self.chunk_types[code] for code in self.type_codes.tolist()]
+        if self.kind == "CV":
+            return [{"section_id": section_id, "chunk_id": chunk_id, "text": text,
+                     "section": section, "chunk_type": chunk_type, "location": location}
+                    for section_id, chunk_id, text, section, chunk_type, location
+                    in zip(self.section_ids.tolist(), self.chunk_ids.tolist(), self.texts(),
+                           sections, chunk_types, self.locations.tolist())]
+        return [{"id": chunk_id, "text": text, "section": section, "chunk_type": chunk_type}
+                for chunk_id, text, section, chunk_type
+                in zip(self.chunk_ids.tolist(), self.texts(), sections, chunk_types)]
+
+
+class ChunkBatchBuilder:
+    """Accumulate chunk fields row by row and build a ``ChunkBatch``."""
+
+    def __init__(self, kind: str):
+        """Create a builder.
+
+        Args:
+            kind (str): ``CV`` to materialize ``CVChunk`` models, anything else for ``JobDescriptionChunk``.
+        """
+        self.kind = kind
+        self._texts: List[str] = []
+        self._chunk_ids: List[int] = []
+        self._section_ids: List[int] = []
+        self._locations: List[int] = []
+        self._section_codes: List[int] = []
+        self._type_codes: List[int] = []
+        self._sections: Dict[str, int] = {}
+        self._chunk_types: Dict[str, int] = {}
+
+    def append(self,
+               chunk_id: int,
+               text: str,
+               chunk_type: str,
+               section: Optional[str] = "UNKNOWN",
+               section_id: int = -1,
+               location: int = -1) -> None:
+        """Add one chunk."""
+        self._texts.append(text)
+        self._chunk_ids.append(chunk_id)
+        self._section_ids.append(section_id)
+        self._locations.append(location)
+        self._section_codes.append(self._sections.setdefault(section, len(self._sections)))
+        self._type_codes.append(self._chunk_types.setdefault(chunk_type, len(self._chunk_types)))
+
+    def build(self) -> ChunkBatch:
+        """Build the batch; the builder should not be used afterwards."""
+        text_offsets = np.zeros(len(self._texts) + 1, dtype=np.int64)
+        np.cumsum([len(text) for text in self._texts], out=text_offsets[1:])
+        return ChunkBatch(kind=self.kind,
+                          text_buffer="".join(self._texts),
+                          text_offsets=text_offsets,
+                          chunk_ids=np.asarray(self._chunk_ids, dtype=np.int32),
+                          section_ids=np.asarray(self._section_ids, dtype=np.int32),
+                          locations=np.asarray(self._locations, dtype=np.int32),
+                          section_codes=np.asarray(self._section_codes, dtype=np.int32),
+                          type_codes=np.asarray(self._type_codes, dtype=np.int8),
+                          sections=list(self._sections),
+                          chunk_types=list(self._chunk_types))
@@ -6,6 +6,7 @@ class Document(BaseModel):
     raw_text: str
     normalized_text: str
     source: str
+    page_offsets: List[int] = []
 
 class CVChunk(BaseModel):
     section_id: int
@@ -0,0 +1,107 @@
+"""Size-capped on-disk cache of one file per entry, shared by the caches of the package."""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+
+class DiskCache:
+    """Directory of cache entry files with a size cap and least recently used eviction.
+
+    Entries are written to a temporary file and renamed, so concurrent readers,
+    in this or another process, never see a partial entry. When the directory
+    grows past ``max_bytes`` the least recently used entries (by modification
+    time, refreshed on every hit) are deleted until it is below 90% of the cap.
+
+    Subclasses set ``suffix`` and ``sharded`` and encode their payload to bytes
+    around ``_read`` and ``_write``.
+    """
+
+    # file extension of the entries, e.g. ".json"
+    suffix = ".bin"
+    # whether entries go in a subdirectory named after the first two characters of their key
+    sharded = False
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+
+    def __getstate__(self) -> dict:
+        # other processes write to the same directory, so a copy sent to a
+        # worker must rescan instead of trusting this process' size estimate
+        state = self.__dict__.copy()
+        state["_size"] = None
+        return state
+
+    def _entry_path(self, key: str) -> Path:
+        if self.sharded:
+            return self.cache_dir / key[:2] / f"{key}{self.suffix}"
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def _read(self, key: str) -> Optional[bytes]:
+        """Content of the entry of a key, marked as recently used, or None if there is none."""
+        path = self._entry_path(key)
+        try:
+            payload = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return payload
+
+    def _write(self, key: str, payload: bytes) -> None:
+        """Store the entry of a key and evict old entries if over the cap."""
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write then rename so concurrent readers never see a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += len(payload)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        for entry in self._entries():
+            entry.unlink(missing_ok=True)
+        self._size = 0
+
+    def _entries(self) -> list[Path]:
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob(f"*/*{self.suffix}" if self.sharded else f"*{self.suffix}"))
+
+    def _scan_size(self) -> int:
+        size = 0
+        for entry in self._entries():
+            try:
+                size += entry.stat().st_size
+            except FileNotFoundError:
+                continue
+        return size
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache is below 90% of the cap."""
+        stats = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            stats.append((stat.st_mtime, stat.st_size, entry))
+        stats.sort(key=lambda x: x[0])
+
+        size = sum(s[1] for s in stats)
+        target = int(self.max_bytes * 0.9)
+        for _, entry_size, entry in stats:
+            if size <= target:
+                break
+            entry.unlink(missing_ok=True)
+            size -= entry_size
+        self._size = size
@@ -0,0 +1,174 @@
+"""Constant time lookup of section headers, tolerant to case, punctuation and typos."""
+
+import hashlib
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from config import config
+from constants import CV_SECTION_HEADERS, JOB_DESCRIPTION_SECTION_HEADERS
+
+
+# decoration around headers: "WORK EXPERIENCE:", "— Skills —", "# Projects", "Education."
+_STRIP_CHARS = " \t:;.,-–—|*•#>=_"
+
+# a list item, not a header: "• Skills", "- Python", "* Teamwork"
+_BULLET_RE = re.compile(r"\s*[•\-*–]\s")
+
+# bump when header_key changes, it is part of the fingerprint of every index
+_KEY_FORMAT = "2"
+
+
+def header_key(text: str) -> str:
+    """Normalized key of a header: case folded, decoration stripped and whitespace collapsed.
+
+    A leading bullet marker followed by a space is kept, so list items never
+    match a header.
+    """
+    if _BULLET_RE.match(text):
+        return " ".join(text.rstrip(_STRIP_CHARS).casefold().split())
+    return " ".join(text.strip(_STRIP_CHARS).casefold().split())
+
+
+def _deletions(key: str) -> Iterator[str]:
+    for i in range(len(key)):
+        yield key[:i] + key[i + 1:]
+
+
+class HeaderIndex:
+    """Prebuilt index of section headers.
+
+    Lines are looked up by their ``header_key`` in a hash table. Variants one
+    typo away (an inserted, missing or replaced character) in a capitalized line
+    are found through a second table of the keys with one character deleted, so
+    "Experiance" or "Educaton" still match. Both lookups cost the same whatever
+    the vocabulary size, and lines longer than the longest header are rejected
+    without being normalized. The index is never modified after it is built,
+    so it can be shared between threads.
+    """
+
+    def __init__(self, headers: Iterable[str], fuzzy: bool = True, min_fuzzy_length: int = 6):
+        """Build the index.
+
+        Args:
+            headers (Iterable[str]): The header vocabulary.
+            fuzzy (bool): Also match headers one typo away.
+            min_fuzzy_length (int): Shorter keys only match exactly, short words are too
+                easily one typo away from each other.
+        """
+        self.fuzzy = fuzzy
+        self.min_fuzzy_length = min_fuzzy_length
+        self.headers: Dict[str, str] = {}
+        for header in headers:
+            key = header_key(header)
+            if key:
+                self.headers.setdefault(key, header)
+
+        # deletion neighbourhood: key with one character deleted -> header
+        self._variants: Dict[str, str] = {}
+        # one typo leaves the first or the last three characters of a key intact,
+        # so a line can only be a variant if it shares them and has a close length
+        self._heads: Dict[str, set] = {}
+        self._tails: Dict[str, set] = {}
+        if fuzzy:
+            for key, header in self.headers.items():
+                if len(key) < min_fuzzy_length:
+                    continue
+                lengths = (len(key) - 1, len(key), len(key) + 1)
+                self._heads.setdefault(key[:3], set()).update(lengths)
+                self._tails.setdefault(key[-3:], set()).update(lengths)
+                self._variants.setdefault(key, header)
+                for variant in _deletions(key):
+                    self._variants.setdefault(variant, header)
+
+        longest = max((len(key) for key in self.headers), default=0)
+        # decoration and spacing around a header, then room for one inserted character
+        self._max_line_length = 2 * longest + 16
+        self._max_key_length = longest + 1
+
+    @classmethod
+    def from_file(cls, path: Path, headers: Iterable[str] = (), **kwargs) -> "HeaderIndex":
+        """Build an index from a vocabulary file with one header per line, ``#`` starts a comment.
+
+        Args:
+            path (Path): The vocabulary file.
+            headers (Iterable[str]): Headers added to the ones of the file.
+        """
+        with Path(path).open("r", encoding="utf-8") as f:
+            loaded = [line.split("#", 1)[0].strip() for line in f]
+        return cls([*headers, *(header for header in loaded if header)], **kwargs)
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of the vocabulary and settings, changes whenever lookups could."""
+        content = "\n".join(sorted(self.headers)) + f"\n{self.fuzzy}:{self.min_fuzzy_length}:{_KEY_FORMAT}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+    def lookup(self, line: str) -> Optional[str]:
+        """Return the header a line matches, ``None`` if it is not a header."""
+        if len(line) > self._max_line_length:
+            return None
+        key = header_key(line)
+        if not key or len(key) > self._max_key_length:
+            return None
+
+        header = self.headers.get(key)
+        if header is not None or not self.fuzzy:
+            return header
+        length = len(key)
+        if length not in self._heads.get(key[:3], ()) and length not in self._tails.get(key[-3:], ()):
+            return None
+        # typos are only forgiven in capitalized lines, lowercase ones are running text
+        if not line.lstrip(_STRIP_CHARS)[:1].isupper():
+            return None
+
+        variants = self._variants
+        # a missing character or the key itself with one more
+        header = variants.get(key)
+        if header is not None:
+            return header
+        # an inserted or replaced character
+        for variant in _deletions(key):
+            header = variants.get(variant)
+            if header is not None:
+                return header
+        return None
+
+    def __contains__(self, line: str) -> bool:
+        return self.lookup(line) is not None
+
+    def __len__(self) -> int:
+        return len(self.headers)
+
+
+_index_lock = threading.Lock()
+_cv_header_index = None
+_job_description_header_index = None
+
+
+def _build_index(headers: Iterable[str], vocabulary_file: Optional[Path]) -> HeaderIndex:
+    if vocabulary_file is None:
+        return HeaderIndex(headers)
+    return HeaderIndex.from_file(vocabulary_file, headers=headers)
+
+
+def get_cv_header_index() -> HeaderIndex:
+    """Return the CV header index, built on first use from the constants and ``CV_SECTION_HEADERS_FILE``."""
+    global _cv_header_index
+    if _cv_header_index is None:
+        with _index_lock:
+            if _cv_header_index is None:
+                _cv_header_index = _build_index(CV_SECTION_HEADERS, config.cv_section_headers_file)
+    return _cv_header_index
+
+
+def get_job_description_header_index() -> HeaderIndex:
+    """Return the job description header index, built on first use from the constants and ``JD_SECTION_HEADERS_FILE``."""
+    global _job_description_header_index
+    if _job_description_header_index is None:
+        with _index_lock:
+            if _job_description_header_index is None:
+                _job_description_header_index = _build_index(JOB_DESCRIPTION_SECTION_HEADERS,
+                                                             config.job_description_section_headers_file)
+    return _job_description_header_index
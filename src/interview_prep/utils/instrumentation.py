@@ -0,0 +1,151 @@
+"""Stage timers, counters and latency histograms for the parsing pipeline.
+
+Instrumentation is reported to a process-wide sink. The default sink is
+disabled, in which case ``stage`` returns a shared no-op context manager and
+``increment`` returns immediately, so instrumented code pays one attribute
+lookup per call. Install an ``InMemorySink`` (or any ``StatsSink`` subclass)
+with ``set_sink`` to collect statistics:
+
+    sink = InMemorySink()
+    set_sink(sink)
+    ...
+    print(sink.summary())
+
+Sinks are per process: statistics gathered in worker processes stay there.
+Within a process they are shared by all threads; CPU time is measured per
+thread, so concurrent stages do not count each other's work.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+
+# upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = [0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, float("inf")]
+
+
+class StatsSink:
+    """Receiver of pipeline statistics. The base class drops everything."""
+
+    enabled = False
+
+    def record_timing(self, stage: str, wall_seconds: float, cpu_seconds: float) -> None:
+        """Record one execution of a stage."""
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        """Add to a counter."""
+
+
+class InMemorySink(StatsSink):
+    """Aggregate statistics in memory, safe to share between threads."""
+
+    enabled = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.wall_seconds: Dict[str, float] = defaultdict(float)
+        self.cpu_seconds: Dict[str, float] = defaultdict(float)
+        self.histograms: Dict[str, List[int]] = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+
+    def record_timing(self, stage: str, wall_seconds: float, cpu_seconds: float) -> None:
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, wall_seconds)
+        with self._lock:
+            self.calls[stage] += 1
+            self.wall_seconds[stage] += wall_seconds
+            self.cpu_seconds[stage] += cpu_seconds
+            self.histograms[stage][bucket] += 1
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += value
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        # cleared in place under the lock, so threads recording meanwhile keep the same lock and dicts
+        with self._lock:
+            self.counters.clear()
+            self.calls.clear()
+            self.wall_seconds.clear()
+            self.cpu_seconds.clear()
+            self.histograms.clear()
+
+    def summary(self) -> dict:
+        """Statistics as a JSON serializable dictionary."""
+        with self._lock:
+            stages = {stage: {"calls": calls,
+                              "wall_seconds": self.wall_seconds[stage],
+                              "cpu_seconds": self.cpu_seconds[stage],
+                              "mean_wall_seconds": self.wall_seconds[stage] / calls,
+                              "histogram": {f"<={bound}": n for bound, n
+                                            in zip(LATENCY_BUCKETS, self.histograms[stage]) if n}}
+                      for stage, calls in self.calls.items()}
+            counters = dict(self.counters)
+        return {"stages": stages, "counters": counters}
+
+
+_sink: StatsSink = StatsSink()
+
+
+def set_sink(sink: StatsSink) -> None:
+    """Install the sink receiving statistics from now on."""
+    global _sink
+    _sink = sink
+
+
+def get_sink() -> StatsSink:
+    """Return the current sink."""
+    return _sink
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+@contextmanager
+def _timed_stage(sink: StatsSink, name: str) -> Iterator[None]:
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        sink.record_timing(name, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+
+
+def stage(name: str):
+    """Context manager timing a pipeline stage (wall and CPU time)."""
+    if not _sink.enabled:
+        return _NULL_STAGE
+    return _timed_stage(_sink, name)
+
+
+def increment(counter: str, value: int = 1) -> None:
+    """Add to a pipeline counter."""
+    if _sink.enabled:
+        _sink.increment(counter, value)
+
+
+def timed(name: str) -> Callable:
+    """Decorator timing every call of a function as the stage ``name``."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sink.enabled:
+                return func(*args, **kwargs)
+            with _timed_stage(_sink, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
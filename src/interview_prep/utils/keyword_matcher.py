@@ -0,0 +1,174 @@
+"""Aho-Corasick automaton to match many keyword vocabularies in a single pass."""
+
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# below this many distinct keywords, the substring tests of the original loop
+# beat the per character Python loop of the automaton (see bench_keyword_matcher.py)
+AUTOMATON_MIN_KEYWORDS = 150
+
+
+class KeywordMatcher:
+    """Multi-keyword substring matcher compiled once from categorized vocabularies.
+
+    Matching is case insensitive and reports every occurrence, including
+    overlapping ones, so a keyword is found wherever ``keyword.lower() in
+    text.lower()`` would find it. With the automaton, scanning a text costs
+    about one transition per character whatever the vocabulary size; small
+    vocabularies are scanned with one ``in`` test per keyword instead, like the
+    original loop, and ``str.find`` collects the positions of the keywords found.
+    Both give the same hits.
+    """
+
+    def __init__(self, vocabularies: Dict[str, Iterable[str]], use_automaton: Optional[bool] = None):
+        """Compile the matcher.
+
+        Args:
+            vocabularies (Dict[str, Iterable[str]]): Keywords per category. A keyword
+                listed several times in a category counts several times.
+            use_automaton (bool, optional): Force or disable the automaton. By default it is
+                used from ``AUTOMATON_MIN_KEYWORDS`` distinct keywords.
+        """
+        self.multiplicity: Dict[str, Counter] = {
+            category: Counter(keyword.lower() for keyword in keywords)
+            for category, keywords in vocabularies.items()
+        }
+
+        # keyword -> categories it belongs to
+        self._categories: Dict[str, List[str]] = {}
+        for category, counts in self.multiplicity.items():
+            for keyword in counts:
+                self._categories.setdefault(keyword, []).append(category)
+
+        self._keywords = [keyword for keyword in self._categories if keyword]
+        # keyword -> its first category and the others, for the substring scan
+        self._split_categories = {keyword: (categories[0], tuple(categories[1:]))
+                                  for keyword, categories in self._categories.items()}
+        if use_automaton is None:
+            use_automaton = len(self._keywords) >= AUTOMATON_MIN_KEYWORDS
+        self.use_automaton = use_automaton
+        if use_automaton:
+            self._build(self._keywords)
+
+    def _build(self, keywords: Iterable[str]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[str]] = [[]]
+
+        for keyword in keywords:
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(keyword)
+
+        # breadth first: fail links and merged outputs; transitions missing from a
+        # state are found by following its fail links while scanning, which keeps
+        # the memory linear in the number of states
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char, next_state in goto[state].items():
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                queue.append(next_state)
+
+        # bound lookups keep the scanning loop to one call per transition
+        self._transitions = [transitions.get for transitions in goto]
+        self._fail = fail
+        self._outputs = [tuple((keyword, len(keyword)) for keyword in out) for out in outputs]
+
+    def scan(self, text: str) -> Dict[str, Dict[str, List[int]]]:
+        """Find every keyword occurrence in a text.
+
+        Args:
+            text (str): The text to scan. It is lowercased before matching.
+        Return:
+            Dict[str, Dict[str, List[int]]]: For each category, the start positions
+            (in the lowercased text) of every keyword found.
+        """
+        if not self.use_automaton:
+            return self._scan_substrings(text.lower())
+
+        hits: Dict[str, Dict[str, List[int]]] = {category: {} for category in self.multiplicity}
+        transitions = self._transitions
+        fail = self._fail
+        outputs = self._outputs
+        categories = self._categories
+
+        state = 0
+        for end, char in enumerate(text.lower(), 1):
+            next_state = transitions[state](char)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = transitions[state](char)
+            # no transition leads back to the root, so None means restart there
+            state = next_state or 0
+            if outputs[state]:
+                for keyword, length in outputs[state]:
+                    for category in categories[keyword]:
+                        hits[category].setdefault(keyword, []).append(end - length)
+        return hits
+
+    def _scan_substrings(self, text: str) -> Dict[str, Dict[str, List[int]]]:
+        find = text.find
+        found = []
+        # the presence test of the original loop; most keywords are absent from
+        # a chunk, so positions are only searched for the ones it finds
+        for keyword in [keyword for keyword in self._keywords if keyword in text]:
+            start = find(keyword)
+            positions = [start]
+            while (start := find(keyword, start + 1)) >= 0:
+                positions.append(start)
+            length = len(keyword)
+            found.append((positions[0] + length, -length, keyword, positions))
+
+        # keywords in the order the automaton reports them: by the end of their
+        # first occurrence, the longest first when several end at the same place
+        found.sort()
+        hits: Dict[str, Dict[str, List[int]]] = {category: {} for category in self.multiplicity}
+        categories = self._split_categories
+        for _, _, keyword, positions in found:
+            first, others = categories[keyword]
+            hits[first][keyword] = positions
+            for category in others:
+                hits[category][keyword] = list(positions)
+        return hits
+
+    def count(self, hits: Dict[str, Dict[str, List[int]]]) -> Dict[str, int]:
+        """Number of distinct keyword entries found per category, counting repeated entries.
+
+        Args:
+            hits (Dict[str, Dict[str, List[int]]]): The output of ``scan``.
+        Return:
+            Dict[str, int]: The hit count of each category.
+        """
+        return {category: sum(map(self.multiplicity[category].__getitem__, found))
+                for category, found in hits.items()}
+
+    def score(self, text: str, weights: Dict[str, int]) -> Tuple[int, Dict[str, Dict[str, List[int]]]]:
+        """Score a text as the weighted sum of the keywords it contains.
+
+        Args:
+            text (str): The text to score.
+            weights (Dict[str, int]): Weight of a keyword hit for each category.
+        Return:
+            Tuple[int, Dict[str, Dict[str, List[int]]]]: The score and the hits it is based on.
+        """
+        hits = self.scan(text)
+        score = 0
+        for category, found in hits.items():
+            if found:
+                score += weights.get(category, 0) * sum(map(self.multiplicity[category].__getitem__, found))
+        return score, hits
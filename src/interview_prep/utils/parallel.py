@@ -0,0 +1,54 @@
+"""Bounded parallel map over a process pool."""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+
+def map_unordered(func: Callable,
+                  items: Iterable[Any],
+                  *args: Any,
+                  workers: Optional[int] = None,
+                  max_in_flight: Optional[int] = None,
+                  ) -> Iterator[Tuple[Any, Any, Optional[BaseException]]]:
+    """Apply ``func(item, *args)`` to every item in a process pool.
+
+    At most ``max_in_flight`` items are submitted but not yet consumed, so the
+    input is read lazily and memory stays flat whatever its size. Results are
+    yielded in completion order; an exception raised for one item is returned
+    with it instead of aborting the others.
+
+    Args:
+        func (Callable): Picklable function run in the worker processes.
+        items (Iterable[Any]): Items to process.
+        *args: Extra arguments passed to every call.
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        max_in_flight (int, optional): Maximum number of pending items. Defaults to twice
+            the number of workers.
+    Return:
+        Iterator[Tuple[Any, Any, Optional[BaseException]]]: ``(item, result, error)`` tuples,
+        where ``result`` is ``None`` if ``error`` is set.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max(max_in_flight or 2 * workers, 1)
+    pending_items = iter(items)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = {}
+
+        def submit_next() -> bool:
+            for item in pending_items:
+                in_flight[executor.submit(func, item, *args)] = item
+                return True
+            return False
+
+        while len(in_flight) < max_in_flight and submit_next():
+            pass
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = in_flight.pop(future)
+                error = future.exception()
+                yield item, (None if error is not None else future.result()), error
+                submit_next()
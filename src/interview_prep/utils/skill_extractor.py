@@ -0,0 +1,199 @@
+"""Token aware skill and keyword extraction with a spaCy ``PhraseMatcher``."""
+
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# pipeline components needed to match on each token attribute, everything else is excluded
+_COMPONENTS_FOR_ATTR = {
+    "ORTH": (),
+    "LOWER": (),
+    "NORM": (),
+    "LEMMA": ("tok2vec", "tagger", "attribute_ruler", "lemmatizer"),
+}
+
+# extra infixes, so "c++17", "c#8", "c++/java" and "java/c++" split around the keyword
+_KEYWORD_INFIXES = [r"(?<=[+#])(?=[^\W_])", r"(?<=[\w+#])/(?=[\w.+#])"]
+
+
+class SkillExtractor:
+    """Find keywords of categorized vocabularies at token boundaries.
+
+    Unlike substring matching, "git" is not found inside "digital" and "java"
+    not inside "javascript". Texts go through ``nlp.pipe`` in batches, optionally
+    in several processes, and the phrase matcher costs the same per token
+    whatever the vocabulary size. Hits have the shape of
+    ``KeywordMatcher.scan``, so they score the same way.
+
+    spaCy adds the strings of unseen words to the shared vocabulary while it
+    tokenizes, so concurrent ``extract`` calls from several threads run one at
+    a time.
+    """
+
+    def __init__(self,
+                 vocabularies: Dict[str, Iterable[str]],
+                 model: str = "blank:en",
+                 attr: str = "LOWER",
+                 batch_size: int = 256,
+                 n_process: int = 1,
+                 nlp: Optional[Any] = None):
+        """Create an extractor.
+
+        Args:
+            vocabularies (Dict[str, Iterable[str]]): Keywords per category. A keyword
+                listed several times in a category counts several times.
+            model (str): ``"blank:<lang>"`` for a tokenizer only pipeline, or the name of
+                an installed spaCy pipeline.
+            attr (str): Token attribute matched, e.g. ``"LOWER"`` or ``"LEMMA"``.
+            batch_size (int): Number of texts per ``nlp.pipe`` batch.
+            n_process (int): Number of processes of ``nlp.pipe``.
+            nlp (Any, optional): Already loaded spaCy pipeline, used as is. Loaded on first use
+                otherwise, with tokenizer rules keeping keywords such as "c++" in one token.
+        """
+        if attr not in _COMPONENTS_FOR_ATTR:
+            raise ValueError(f"Unsupported token attribute: {attr!r}")
+        self.multiplicity: Dict[str, Counter] = {
+            category: Counter(keyword.lower() for keyword in keywords)
+            for category, keywords in vocabularies.items()
+        }
+        self._categories: Dict[str, List[str]] = {}
+        for category, counts in self.multiplicity.items():
+            for keyword in counts:
+                self._categories.setdefault(keyword, []).append(category)
+
+        self.model = model
+        self.attr = attr
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self._nlp = nlp
+        self._matcher = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_file(cls, path: Path, category: str = "skill",
+                  vocabularies: Optional[Dict[str, Iterable[str]]] = None, **kwargs) -> "SkillExtractor":
+        """Build an extractor from a vocabulary file with one keyword per line, ``#`` starts a comment.
+
+        Args:
+            path (Path): The vocabulary file.
+            category (str): Category of the keywords of the file.
+            vocabularies (Dict[str, Iterable[str]], optional): Vocabularies the file is added to.
+        """
+        with Path(path).open("r", encoding="utf-8") as f:
+            loaded = [line.split("#", 1)[0].strip() for line in f]
+        merged = {name: list(keywords) for name, keywords in (vocabularies or {}).items()}
+        merged.setdefault(category, []).extend(keyword for keyword in loaded if keyword)
+        return cls(merged, **kwargs)
+
+    @property
+    def nlp(self) -> Any:
+        with self._lock:
+            return self._load_nlp()
+
+    def _load_nlp(self) -> Any:
+        if self._nlp is None:
+            import spacy
+
+            if self.model.startswith("blank:"):
+                self._nlp = spacy.blank(self.model.split(":", 1)[1])
+            else:
+                needed = _COMPONENTS_FOR_ATTR[self.attr]
+                info = spacy.info(self.model)
+                self._nlp = spacy.load(self.model,
+                                       exclude=[name for name in info.get("pipeline", []) if name not in needed])
+            self._add_keyword_rules(self._nlp)
+        return self._nlp
+
+    def _add_keyword_rules(self, nlp: Any) -> None:
+        """Keep keywords such as "c++" and "c#" in one token wherever they appear in a text."""
+        from spacy.attrs import ORTH
+        from spacy.util import compile_infix_regex
+
+        nlp.tokenizer.infix_finditer = compile_infix_regex([*nlp.Defaults.infixes, *_KEYWORD_INFIXES]).finditer
+        # without a special case "c#" is one token in "c#8" but two in "c# and java"
+        for keyword in self._categories:
+            if ("+" in keyword or "#" in keyword) and not any(char.isspace() for char in keyword):
+                for variant in {keyword, keyword.upper(), keyword.capitalize()}:
+                    nlp.tokenizer.add_special_case(variant, [{ORTH: variant}])
+
+    @property
+    def matcher(self) -> Any:
+        with self._lock:
+            return self._build_matcher()
+
+    def _build_matcher(self) -> Any:
+        if self._matcher is None:
+            from spacy.matcher import PhraseMatcher
+
+            nlp = self.nlp
+            matcher = PhraseMatcher(nlp.vocab, attr=self.attr)
+            keywords = list(self._categories)
+            # the patterns only need the attribute matched, tokenizing is enough unless it is a lemma
+            make_docs = nlp.pipe if self.attr == "LEMMA" else nlp.tokenizer.pipe
+            for keyword, pattern in zip(keywords, make_docs(keywords, batch_size=self.batch_size)):
+                matcher.add(keyword, [pattern])
+            self._matcher = matcher
+        return self._matcher
+
+    def __getstate__(self) -> dict:
+        # the pipeline and matcher are rebuilt from ``model`` in the receiving process
+        state = self.__dict__.copy()
+        state["_nlp"] = None
+        state["_matcher"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def extract(self, texts: Sequence[str]) -> List[Dict[str, Dict[str, List[int]]]]:
+        """Find the keywords of every text.
+
+        Args:
+            texts (Sequence[str]): The texts, processed in batches of ``batch_size``.
+        Return:
+            List[Dict[str, Dict[str, List[int]]]]: For each text and category, the
+            character offsets of every keyword found.
+        """
+        with self._lock:
+            matcher = self.matcher
+            strings = self.nlp.vocab.strings
+            categories = self._categories
+
+            results = []
+            for doc in self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process):
+                hits: Dict[str, Dict[str, List[int]]] = {category: {} for category in self.multiplicity}
+                for match_id, start, _ in matcher(doc):
+                    keyword = strings[match_id]
+                    for category in categories[keyword]:
+                        hits[category].setdefault(keyword, []).append(doc[start].idx)
+                for found in hits.values():
+                    for positions in found.values():
+                        positions.sort()
+                results.append(hits)
+        return results
+
+    def count(self, hits: Dict[str, Dict[str, List[int]]]) -> Dict[str, int]:
+        """Number of distinct keyword entries found per category, counting repeated entries."""
+        return {category: sum(self.multiplicity[category][keyword] for keyword in found)
+                for category, found in hits.items()}
+
+    def score_texts(self, texts: Sequence[str],
+                    weights: Dict[str, int]) -> List[Tuple[int, Dict[str, Dict[str, List[int]]]]]:
+        """Score texts as the weighted sum of the keywords they contain, like ``KeywordMatcher.score``.
+
+        Return:
+            List[Tuple[int, Dict[str, Dict[str, List[int]]]]]: The score and hits of every text.
+        """
+        scored = []
+        for hits in self.extract(texts):
+            counts = self.count(hits)
+            scored.append((sum(weights.get(category, 0) * n for category, n in counts.items()), hits))
+        return scored
+
+    def extract_chunks(self, chunks: Sequence[Any]) -> List[Dict[str, Dict[str, List[int]]]]:
+        """Hits of CV or job description chunks, anything with a ``text``."""
+        return self.extract([chunk.text for chunk in chunks])
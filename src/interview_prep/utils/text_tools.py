@@ -1,30 +1,38 @@
 """Utilities for text processing."""
 
 import re
+import sys
+import threading
 import unicodedata
 from config import config
 
 
+CONTRACTIONS = {
+    "can't": "cannot",
+    "won't": "will not",
+    "n't": " not",
+    "'re": " are",
+    "'s": " is",
+    "'d": " would",
+    "'ll": " will",
+    "'t": " not",
+    "'ve": " have",
+    "'m": " am"
+}
+_CONTRACTIONS_RE = re.compile('(%s)' % '|'.join(CONTRACTIONS.keys()))
+_HYPHEN_BREAK_RE = re.compile(r"(\w)-\n(\w)")
+_COMMA_BREAK_RE = re.compile(r"(\w),\n(\w)")
+_MULTIPLE_NEWLINES_RE = re.compile(r'\n{3,}')
+_SPACING_ACCENTS = ("´", "¨")
+
+
+def _replace_contraction(match: re.Match) -> str:
+    return CONTRACTIONS[match.group(0)]
+
+
 def expand_contractions(text: str) -> str:
     """Function to expand common English contractions in the text."""
-    contractions_dict = {
-        "can't": "cannot",
-        "won't": "will not",
-        "n't": " not",
-        "'re": " are",
-        "'s": " is",
-        "'d": " would",
-        "'ll": " will",
-        "'t": " not",
-        "'ve": " have",
-        "'m": " am"
-    }
-    contractions_re = re.compile('(%s)' % '|'.join(contractions_dict.keys()))
-
-    def replace(match):
-        return contractions_dict[match.group(0)]
-
-    return contractions_re.sub(replace, text)
+    return _CONTRACTIONS_RE.sub(_replace_contraction, text)
 
 def remove_extra_whitespace(text:str) -> str:
     """Function to remove extra whitespace from text."""
@@ -33,36 +41,88 @@ def remove_extra_whitespace(text:str) -> str:
 
 def remove_accents(text: str)->str:
     """Function to remove accents from characters in the text."""
-    text = re.sub(r'´', '', text)
-    text = re.sub(r'¨', '', text)
+    for accent in _SPACING_ACCENTS:
+        text = text.replace(accent, "")
     nfkd_form = unicodedata.normalize('NFKD', text)
     return ''.join([c for c in nfkd_form if not unicodedata.combining(c)])
 
 def fix_hyphenation(text: str) -> str:
     """Function to fix hyphenation issues in the text."""
     # Repair hyphenation at line breaks
-    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
-    text = re.sub(r"(\w),\n(\w)", r"\1, \2", text)
+    text = _HYPHEN_BREAK_RE.sub(r"\1\2", text)
+    text = _COMMA_BREAK_RE.sub(r"\1, \2", text)
     return text
 
 
-def normalize_text(text: str) -> str:
-    """Function to normalize text"""
-
-    normalized_text = expand_contractions(text)
-
-    #Hyphenation repair (e.g., "exam-\nple" -> "example")
-    normalized_text = fix_hyphenation(normalized_text)
-
-    #Unicode normalization
-    normalized_text = remove_accents(normalized_text)
+class TextNormalizer:
+    """Precompiled text normalizer.
+
+    Produces exactly the same output as chaining ``expand_contractions``,
+    ``fix_hyphenation``, ``remove_accents``, ``remove_extra_whitespace`` and the
+    multiple newline collapse, but every pattern and translation table is built
+    once, passes that cannot change the text are skipped, and the per character
+    Python loop of ``remove_accents`` only runs ``str.translate`` over the
+    non-ascii runs of the text.
+    """
+
+    def __init__(self):
+        self._contractions_re = _CONTRACTIONS_RE
+        self._hyphen_break_re = _HYPHEN_BREAK_RE
+        self._comma_break_re = _COMMA_BREAK_RE
+        self._multiple_newlines_re = _MULTIPLE_NEWLINES_RE
+        self._spacing_accents = _SPACING_ACCENTS
+        # every combining code point mapped to None, i.e. deleted by str.translate
+        self._combining = dict.fromkeys(cp for cp in range(sys.maxunicode + 1)
+                                        if unicodedata.combining(chr(cp)))
+        self._non_ascii_re = re.compile(r'[^\x00-\x7f]+')
+
+    def _drop_combining(self, match: re.Match) -> str:
+        return match.group(0).translate(self._combining)
+
+    def __call__(self, text: str) -> str:
+        """Normalize a text."""
+        # every contraction contains an apostrophe
+        if "'" in text:
+            text = self._contractions_re.sub(_replace_contraction, text)
+
+        if "-\n" in text:
+            text = self._hyphen_break_re.sub(r"\1\2", text)
+        if ",\n" in text:
+            text = self._comma_break_re.sub(r"\1, \2", text)
+
+        # ascii text has neither accents nor anything NFKD would decompose
+        if not text.isascii():
+            for accent in self._spacing_accents:
+                if accent in text:
+                    text = text.replace(accent, "")
+            if not unicodedata.is_normalized('NFKD', text):
+                text = unicodedata.normalize('NFKD', text)
+            text = self._non_ascii_re.sub(self._drop_combining, text)
+
+        text = "\n".join(map(str.rstrip, text.splitlines()))
+
+        if "\n\n\n" in text:
+            text = self._multiple_newlines_re.sub('\n\n', text)
+        return text
+
+
+_normalizer = None
+_normalizer_lock = threading.Lock()
+
+
+def get_normalizer() -> TextNormalizer:
+    """Return the shared ``TextNormalizer``, building it on first use; it is read-only and thread safe."""
+    global _normalizer
+    if _normalizer is None:
+        with _normalizer_lock:
+            if _normalizer is None:
+                _normalizer = TextNormalizer()
+    return _normalizer
 
-    normalized_text = remove_extra_whitespace(normalized_text)
 
-    #Remove multiple newlines
-    normalized_text = re.sub(r'\n{3,}', '\n\n', normalized_text)
-
-    return normalized_text
+def normalize_text(text: str) -> str:
+    """Function to normalize text"""
+    return get_normalizer()(text)
 
 ### chunking util functions
 def normalize_chunk_text(text: str) -> str:
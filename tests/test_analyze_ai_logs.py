@@ -0,0 +1,133 @@
+"""scripts/analyze_ai_logs.py on small workbooks, in both row orders and merged across worker processes."""
+
+import importlib.util
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "analyze_ai_logs.py"
+
+
+@pytest.fixture(scope="module")
+def analyze_ai_logs():
+    spec = importlib.util.spec_from_file_location("analyze_ai_logs", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    # worker processes unpickle the analysis function by its module name
+    sys.modules["analyze_ai_logs"] = module
+    spec.loader.exec_module(module)
+    yield module
+    del sys.modules["analyze_ai_logs"]
+
+
+START = datetime(2026, 3, 2, 10, 0, 0)
+
+# (seconds after START, session, message), oldest first
+EVENTS = [
+    (0, "s1", "User question: How do I reset my password?"),
+    (5, "s1", "Calling tool: search_docs"),
+    (20, "s2", "Answer: You are welcome!"),
+    (90, "s1", "Answer: Open the settings page and choose reset."),
+    (100, "s2", "Question: What is the refund policy?"),
+    (300, "s1", "Question: Can you help me?"),
+    (310, "s1", "Response: Could you please clarify what you need help with?"),
+    (320, "s3", "healthcheck ok"),
+]
+
+
+def write_workbook(path: Path, events, order: str = "asc", sheet: str = "logs") -> Path:
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = sheet
+    worksheet.append(["TimeGenerated", "Message", "session_id"])
+    rows = [(START + timedelta(seconds=seconds), message, session) for seconds, session, message in events]
+    for row in (rows if order == "asc" else reversed(rows)):
+        worksheet.append(list(row))
+    workbook.save(path)
+    return path
+
+
+def analyzer(module, order: str = "asc"):
+    issues = module.ClientIssueIndex([{"question": "reset my password", "ticket": 42}])
+    return module.LogAnalyzer(slow_seconds=60, order=order, client_issues=issues)
+
+
+def run(module, tmp_path: Path, paths, analyzer_, workers: int = 1) -> dict:
+    output = tmp_path / "report.json"
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir(exist_ok=True)
+    reports = module.analyze_files([str(path) for path in paths], analyzer_, spool_dir, workers=workers)
+    module.write_report(output, [str(path) for path in paths], reports)
+    return json.loads(output.read_text(encoding="utf-8"))
+
+
+def by_question(entries: list) -> list:
+    return sorted(entries, key=lambda entry: entry["question"])
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_report_pairs_questions_and_answers(analyze_ai_logs, tmp_path, order):
+    path = write_workbook(tmp_path / f"{order}.xlsx", EVENTS, order=order)
+    report = run(analyze_ai_logs, tmp_path, [path], analyzer(analyze_ai_logs, order))
+
+    summary = report["summary"]
+    assert report["source_file"] == str(path)
+    assert summary["total_log_entries"] == len(EVENTS)
+    assert summary["total_questions"] == 3
+    assert summary["orphan_answers"] == 1
+    assert summary["slow_responses_count"] == 1
+    assert summary["issues"] == {"clarification_request": 1, "no_tools_used": 1, "unanswered": 1}
+    assert summary["response_times"]["count"] == 2
+    assert summary["response_times"]["max_seconds"] == 90
+
+    slow, = report["slow_responses"]
+    assert slow["question"] == "How do I reset my password?"
+    assert slow["answer"] == "Open the settings page and choose reset."
+    assert (slow["duration_seconds"], slow["session"], slow["tools_used"]) == (90, "s1", ["search_docs"])
+    assert slow["timestamp"].startswith("2026-03-02T10:00:00")
+
+    problematic = by_question(report["problematic_qa_pairs"])
+    assert [(entry["question"], entry["issues"]) for entry in problematic] == [
+        ("Can you help me?", ["clarification_request", "no_tools_used"]),
+        ("What is the refund policy?", ["unanswered"]),
+    ]
+    assert problematic[1]["answer"] is None and problematic[1]["duration_seconds"] is None
+
+    matched, = report["client_reported_issues"]
+    assert matched["client_issue"] == {"question": "reset my password", "ticket": 42}
+    assert matched["similarity"] == 1.0 and matched["source_file"] == str(path)
+
+
+def test_both_orders_give_the_same_report(analyze_ai_logs, tmp_path):
+    reports = {}
+    for order in ("asc", "desc"):
+        path = write_workbook(tmp_path / f"{order}.xlsx", EVENTS, order=order)
+        reports[order] = run(analyze_ai_logs, tmp_path, [path], analyzer(analyze_ai_logs, order))
+    assert reports["asc"]["summary"] == reports["desc"]["summary"]
+    for section in ("slow_responses", "problematic_qa_pairs", "client_reported_issues"):
+        strip = [{**entry, "source_file": None} for entry in by_question(reports["asc"][section])]
+        assert strip == [{**entry, "source_file": None} for entry in by_question(reports["desc"][section])]
+
+
+def test_reports_of_worker_processes_are_merged(analyze_ai_logs, tmp_path):
+    later = [(seconds + 3600, session, message) for seconds, session, message in EVENTS[:4]]
+    paths = [write_workbook(tmp_path / "a.xlsx", EVENTS),
+             write_workbook(tmp_path / "b.xlsx", later, sheet="more logs")]
+    single = {path: run(analyze_ai_logs, tmp_path, [path], analyzer(analyze_ai_logs)) for path in paths}
+    sequential = run(analyze_ai_logs, tmp_path, paths, analyzer(analyze_ai_logs))
+    merged = run(analyze_ai_logs, tmp_path, paths, analyzer(analyze_ai_logs), workers=2)
+
+    assert merged["source_file"] == [str(path) for path in paths]
+    assert merged["summary"] == sequential["summary"]
+    summary, parts = merged["summary"], [single[path]["summary"] for path in paths]
+    for key in ("total_log_entries", "total_questions", "slow_responses_count", "problematic_qa_count",
+                "matched_client_issues_count", "orphan_answers"):
+        assert summary[key] == sum(part[key] for part in parts)
+    assert summary["response_times"]["count"] == sum(part["response_times"]["count"] for part in parts)
+    for section in ("slow_responses", "problematic_qa_pairs", "client_reported_issues"):
+        # entries of every file, in input order
+        assert merged[section] == sequential[section] == [entry for path in paths for entry in single[path][section]]
@@ -0,0 +1,91 @@
+"""The parsing service: status codes, upload limit and the concurrency slots of timed out jobs."""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from interview_prep.api import app as api
+from interview_prep.api import workers
+from interview_prep.job_descripition import job_parser
+
+
+PARSE_JOB_DESCRIPTION = workers.parse_job_description
+
+
+def slow_job_description(text: str, source: str, max_chunk_size: int, skills: str) -> dict:
+    time.sleep(float(text))
+    return {"source": source}
+
+
+def failing_job_description(text: str, source: str, max_chunk_size: int, skills: str) -> dict:
+    raise RuntimeError("bug in the parser")
+
+
+@pytest.fixture
+def client_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(api.config, "data_dir", tmp_path)
+    clients = []
+
+    def factory(**kwargs):
+        client = TestClient(api.create_app(num_workers=1, **kwargs), raise_server_exceptions=False)
+        clients.append(client.__enter__())
+        return client
+
+    yield factory
+    for client in clients:
+        client.__exit__(None, None, None)
+
+
+def test_parse_requests(client_factory):
+    client = client_factory(max_upload_bytes=1000)
+    assert client.get("/health").json() == {"status": "ok"}
+
+    response = client.post("/job-description", json={"text": "Skills\nPython and SQL", "source": "jd"})
+    assert response.status_code == 200 and response.json()["source"] == "jd"
+    assert client.post("/job-description", json={"text": "Python", "skills": "regex"}).status_code == 422
+
+    assert client.post("/cv", files={"file": ("cv.pdf", b"")}).status_code == 400
+    response = client.post("/cv", files={"file": ("cv.pdf", b"not a pdf")})
+    assert response.status_code == 422 and response.json()["detail"].startswith("Could not parse CV")
+    assert client.post("/cv", files={"file": ("cv.pdf", b"x" * 1001)}).status_code == 413
+    assert client.post("/job-description", json={"text": "é" * 501}).status_code == 413
+
+
+def test_unexpected_errors_are_not_parse_errors(client_factory, monkeypatch):
+    monkeypatch.setattr(workers, "parse_job_description", failing_job_description)
+    client = client_factory()
+    assert client.post("/job-description", json={"text": "Python"}).status_code == 500
+
+
+def test_timed_out_job_keeps_its_slot_until_done(client_factory, monkeypatch):
+    monkeypatch.setattr(workers, "parse_job_description", slow_job_description)
+    client = client_factory(max_concurrency=1, timeout=0.2)
+
+    start = time.perf_counter()
+    assert client.post("/job-description", json={"text": "1.0"}).status_code == 504
+    # the slot is only freed when the first job is done, so the second one is
+    # submitted to an idle worker then, instead of timing out in the pool's queue
+    response = client.post("/job-description", json={"text": "0", "source": "second"})
+    assert response.status_code == 200 and response.json() == {"source": "second"}
+    assert time.perf_counter() - start >= 0.9
+
+
+def job_description_after_warm_up(text: str, source: str, max_chunk_size: int, skills: str) -> dict:
+    # runs in the worker: the skill extractor must be ready before the first request reaches it
+    extractor = job_parser._skill_extractor
+    if extractor is None or extractor._nlp is None or extractor._matcher is None:
+        raise RuntimeError("the skill extractor was not warmed up")
+    return PARSE_JOB_DESCRIPTION(text, source, max_chunk_size, skills)
+
+
+def test_warm_up_loads_the_skill_extractor(client_factory, monkeypatch):
+    pytest.importorskip("spacy")
+    # the worker is forked from this process, which may have built the extractor already
+    monkeypatch.setattr(job_parser, "_skill_extractor", None)
+    monkeypatch.setattr(workers, "parse_job_description", job_description_after_warm_up)
+    client = client_factory()
+
+    response = client.post("/job-description", json={"text": "Skills\nPython and SQL", "skills": "spacy"})
+    assert response.status_code == 200
+    assert set(response.json()["scored_chunks"][0]["hits"]["skill"]) == {"python", "sql"}
@@ -0,0 +1,74 @@
+"""BatchScorer against the per-chunk scoring of select_relevant_chunks."""
+
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+
+from interview_prep.job_descripition.batch_scorer import BatchScorer
+from interview_prep.job_descripition.job_parser import (KEYWORD_CATEGORIES, KEYWORD_WEIGHTS, JobDescriptionParser,
+                                                        get_keyword_matcher)
+from interview_prep.schemas.cv_schema import JobDescriptionChunk
+
+
+KEYWORDS = [keyword for keywords in KEYWORD_CATEGORIES.values() for keyword in keywords]
+FILLER = ["the", "our", "people", "will", "work", "on", "new", "products", "every", "day"]
+
+
+def random_corpus(seed: int) -> list:
+    """Documents of chunks with repeated texts (tied scores), keyword-free chunks and empty documents."""
+    rng = random.Random(seed)
+    repeated = " ".join(rng.choice(KEYWORDS) for _ in range(5))
+    documents = []
+    for _ in range(40):
+        chunks = []
+        for chunk_id in range(rng.choice([0, 1, 3, 8])):
+            kind = rng.random()
+            if kind < 0.2:
+                text = repeated
+            elif kind < 0.4:
+                text = " ".join(rng.choice(FILLER) for _ in range(12))
+            else:
+                text = " ".join(rng.choice(KEYWORDS + FILLER) for _ in range(rng.randint(1, 20)))
+            chunks.append(JobDescriptionChunk(id=chunk_id, text=text, section="S", chunk_type="paragraph"))
+        documents.append(chunks)
+    return documents
+
+
+@pytest.fixture(params=range(5))
+def corpus(request):
+    return random_corpus(request.param)
+
+
+WEIGHTS = [None, {"requirement": 1, "task": 1, "skill": 1, "exclude": 0}, {"skill": 7, "exclude": -1}]
+
+
+@pytest.mark.parametrize("weights", WEIGHTS)
+def test_scores_match_the_keyword_matcher(corpus, weights):
+    matcher = get_keyword_matcher()
+    expected = [matcher.score(chunk.text, KEYWORD_WEIGHTS if weights is None else weights)[0]
+                for chunks in corpus for chunk in chunks]
+    assert BatchScorer(corpus).score(weights).tolist() == expected
+
+
+@pytest.mark.parametrize("k", [1, 2, 5, 10])
+def test_top_k_matches_select_relevant_chunks(corpus, k):
+    scorer = BatchScorer(corpus)
+    doc_index, chunk_index, scores = scorer.top_k(k)
+
+    parser = JobDescriptionParser()
+    expected = []
+    for d, chunks in enumerate(corpus):
+        for item in parser.select_relevant_chunks(chunks)[:k]:
+            expected.append((d, item["chunk"].id, item["score"]))
+    assert list(zip(doc_index.tolist(), chunk_index.tolist(), scores.tolist())) == expected
+    assert scorer.chunks(doc_index, chunk_index) == [corpus[d][c] for d, c, _ in expected]
+
+
+def test_corpus_has_ties_and_zero_hits(corpus):
+    scores = BatchScorer(corpus).score()
+    assert (scores == 0).any()
+    assert len(np.unique(scores)) < len(scores)
+    assert any(not chunks for chunks in corpus)
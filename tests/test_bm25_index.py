@@ -0,0 +1,146 @@
+"""BM25Index against BM25 computed over every chunk, before and after CVs are removed and added back."""
+
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from interview_prep.retrieval.bm25_index import BM25Index, tokenize
+from interview_prep.schemas.cv_schema import CVChunk
+
+
+WORDS = ["python", "sql", "docker", "kubernetes", "c++", "c#", "node.js", "Python", "SQL", "led", "built",
+         "data", "pipelines", "team", "of", "the", "and", "with", "5", "years", "aws", "ml", "engineer",
+         "react", "testing", "migration", "dashboards", "kafka", "spark", "airflow"]
+
+
+def random_cvs(count: int, seed: int = 0) -> list:
+    """(source, chunks) of CVs of various sizes, some with empty or stop word only chunks."""
+    rng = random.Random(seed)
+    cvs = []
+    for cv in range(count):
+        chunks = []
+        for chunk_id in range(rng.randint(0, 8)):
+            if rng.random() < 0.1:
+                text = rng.choice(["", "the and of", "-"])
+            else:
+                text = " ".join(rng.choice(WORDS[:rng.randint(8, len(WORDS))]) for _ in range(rng.randint(1, 30)))
+            chunks.append(CVChunk(section_id=chunk_id % 3, chunk_id=chunk_id, text=text,
+                                  section="Experience", chunk_type="bullet", location=chunk_id))
+        cvs.append((f"cv_{cv}", chunks))
+    return cvs
+
+
+def brute_force_scores(cvs: list, query: str, k1: float = 1.2, b: float = 0.75) -> dict:
+    """BM25 of every chunk with a positive score, computed chunk by chunk from its term counts."""
+    counts = [(source, chunk, Counter(tokenize(chunk.text))) for source, chunks in cvs for chunk in chunks]
+    if not counts:
+        return {}
+    lengths = [sum(terms.values()) for _, _, terms in counts]
+    frequencies = Counter(term for _, _, terms in counts for term in terms)
+    average = sum(lengths) / len(lengths)
+    scores = {}
+    for (source, chunk, terms), length in zip(counts, lengths):
+        score = 0.0
+        for term, query_frequency in Counter(tokenize(query)).items():
+            if term in terms:
+                idf = math.log(1 + (len(counts) - frequencies[term] + 0.5) / (frequencies[term] + 0.5))
+                score += query_frequency * idf * terms[term] * (k1 + 1) / (
+                    terms[term] + k1 * (1 - b + b * length / max(average, 1e-9)))
+        if score > 0:
+            scores[(source, chunk.chunk_id)] = score
+    return scores
+
+
+def index_scores(index: BM25Index, query: str) -> dict:
+    return {(result["source"], result["chunk"].chunk_id): result["score"]
+            for result in index.search(query, k=max(len(index), 1))}
+
+
+def random_queries(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS + ["unknown", "golang"]) for _ in range(rng.randint(1, 12)))
+            for _ in range(count)]
+
+
+def build(cvs: list, **kwargs) -> BM25Index:
+    index = BM25Index(**kwargs)
+    for source, chunks in cvs:
+        index.add(source, chunks)
+    return index
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_scores_match_brute_force(seed):
+    cvs = random_cvs(40, seed)
+    index = build(cvs)
+    assert len(index) == sum(len(chunks) for _, chunks in cvs)
+    for query in random_queries(15, seed):
+        expected = brute_force_scores(cvs, query)
+        actual = index_scores(index, query)
+        assert actual.keys() == expected.keys()
+        assert actual == pytest.approx(expected, rel=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("k", [1, 5, 20])
+def test_search_returns_the_best_k_by_score_then_insertion_order(seed, k):
+    cvs = random_cvs(30, seed)
+    index = build(cvs)
+    rows = {(source, chunk.chunk_id): row for row, (source, chunk) in
+            enumerate((source, chunk) for source, chunks in cvs for chunk in chunks)}
+    for query in random_queries(10, seed):
+        results = index.search(query, k=k)
+        everything = index.search(query, k=len(index))
+        assert results == everything[:k]
+        keys = [(result["score"], rows[(result["source"], result["chunk"].chunk_id)]) for result in everything]
+        assert keys == sorted(keys, key=lambda key: (-key[0], key[1]))
+
+        best_per_source = {}
+        for result in everything:
+            best_per_source.setdefault(result["source"], result)
+        assert index.search(query, k=k, max_per_source=1) == list(best_per_source.values())[:k]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("compact_ratio", [0.0, 0.25, 1.0])
+def test_scores_after_remove_and_add_again_match_a_fresh_index(seed, compact_ratio):
+    cvs = random_cvs(30, seed)
+    index = build(cvs, compact_ratio=compact_ratio)
+
+    # remove a third of the CVs, put half of them back, replace one with other chunks
+    rng = random.Random(seed)
+    removed = rng.sample(range(len(cvs)), len(cvs) // 3)
+    for i in removed:
+        assert index.remove(cvs[i][0])
+    assert not index.remove(cvs[removed[0]][0])
+    for i in removed[::2]:
+        index.add(*cvs[i])
+    replaced = sorted(set(range(len(cvs))) - set(removed))[0]
+    index.add(cvs[replaced][0], random_cvs(1, seed + 100)[0][1])
+
+    kept = sorted(set(range(len(cvs))) - set(removed[1::2]))
+    live = [(cvs[i][0], random_cvs(1, seed + 100)[0][1]) if i == replaced else cvs[i] for i in kept]
+    # a fresh index holds the re-added CVs last, as the updated one does
+    order = [i for i in kept if i not in removed and i != replaced] + removed[::2] + [replaced]
+    fresh = build([live[kept.index(i)] for i in order])
+    assert len(index) == len(fresh) == sum(len(chunks) for _, chunks in live)
+    assert sorted(index.sources) == sorted(source for source, _ in live)
+
+    for query in random_queries(15, seed):
+        expected = brute_force_scores(live, query)
+        assert index_scores(index, query) == pytest.approx(expected, rel=1e-9)
+        assert index_scores(fresh, query) == pytest.approx(expected, rel=1e-9)
+        assert [(r["source"], r["chunk"].chunk_id) for r in index.search(query, k=10)] == \
+            [(r["source"], r["chunk"].chunk_id) for r in fresh.search(query, k=10)]
+
+
+def test_empty_index_and_everything_removed():
+    index = BM25Index()
+    assert index.search("python") == []
+    cvs = random_cvs(3, seed=7)
+    index = build(cvs)
+    for source, _ in cvs:
+        index.remove(source)
+    assert len(index) == 0 and index.search("python sql") == []
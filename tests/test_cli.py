@@ -0,0 +1,60 @@
+"""Batch runs of the CLI: resuming, retrying failed documents and the argument defaults."""
+
+import json
+
+from interview_prep.cli import build_parser, completed_sources, run_batch
+from interview_prep.job_descripition.token_packer import DEFAULT_TOKENIZER_NAME
+
+
+def read_records(output):
+    return [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+
+
+def make_process(failing):
+    def process(file_path):
+        if file_path in failing:
+            raise ValueError(f"cannot parse {file_path}")
+        return {"source": file_path, "chunks": []}
+    return process
+
+
+def test_resume_retries_failed_documents_and_drops_their_errors(tmp_path):
+    output = tmp_path / "out.jsonl"
+    inputs = ["a", "b", "c"]
+
+    stats = run_batch(make_process({"b", "c"}), inputs, output, jobs=1)
+    assert (stats["processed"], stats["failed"]) == (1, 2)
+    assert [record["source"] for record in read_records(output)] == ["a", "b", "c"]
+
+    # b fails again, c succeeds: one record left per document
+    stats = run_batch(make_process({"b"}), inputs, output, jobs=1)
+    assert (stats["processed"], stats["failed"], stats["skipped"]) == (1, 1, 1)
+    records = read_records(output)
+    assert [(record["source"], "error" in record) for record in records] == \
+        [("a", False), ("b", True), ("c", False)]
+
+    stats = run_batch(make_process(set()), inputs, output, jobs=1)
+    assert (stats["processed"], stats["skipped"]) == (1, 2)
+    assert [record["source"] for record in read_records(output)] == ["a", "c", "b"]
+    assert completed_sources(output) == {"a", "b", "c"}
+
+
+def test_errors_of_documents_not_retried_are_kept(tmp_path):
+    output = tmp_path / "out.jsonl"
+    run_batch(make_process({"b"}), ["a", "b"], output, jobs=1)
+    # an interrupted run left half a record
+    with output.open("a", encoding="utf-8") as f:
+        f.write('{"source": "c", "chu')
+
+    stats = run_batch(make_process(set()), ["c"], output, jobs=1)
+    assert stats["processed"] == 1
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert lines[2] == '{"source": "c", "chu'
+    assert [json.loads(line)["source"] for line in lines[:2] + lines[3:]] == ["a", "b", "c"]
+
+
+def test_jd_defaults():
+    args = build_parser().parse_args(["jd", "x.txt", "-o", "out.jsonl"])
+    assert args.tokenizer == DEFAULT_TOKENIZER_NAME
+    assert args.skills == "substring"
+    assert build_parser().parse_args(["jd", "x.txt", "-o", "out.jsonl", "--skills", "spacy"]).skills == "spacy"
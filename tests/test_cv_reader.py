@@ -0,0 +1,53 @@
+"""CVReader from memory: every input type gives the file's document and consumes streams alike."""
+
+import io
+import mmap
+
+import pytest
+
+pymupdf = pytest.importorskip("pymupdf")
+
+from interview_prep.CV.cv_reader import CVReader
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("cv") / "cv.pdf"
+    with pymupdf.open() as doc:
+        for page in range(2):
+            doc.new_page().insert_text((72, 72), f"Education\nMSc page {page}\nExperience\n- built things-\nand more")
+        doc.save(path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def reader():
+    return CVReader(use_cache=False)
+
+
+def test_buffers_give_the_document_of_the_file(reader, pdf_path):
+    expected = reader.read_cv(str(pdf_path))
+    data = pdf_path.read_bytes()
+    with pdf_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        inputs = [data, bytearray(data), memoryview(data), mapped]
+        for pdf_data in inputs:
+            document = reader.read_cv_bytes(pdf_data, source=str(pdf_path))
+            assert (document.raw_text, document.normalized_text, document.page_offsets) == \
+                (expected.raw_text, expected.normalized_text, expected.page_offsets)
+
+
+@pytest.mark.parametrize("make_stream", [io.BytesIO, lambda data: io.BufferedReader(io.BytesIO(data))],
+                         ids=["BytesIO", "file object"])
+def test_streams_are_read_from_their_position_to_their_end(reader, pdf_path, make_stream):
+    data = pdf_path.read_bytes()
+    stream = make_stream(b"header" + data)
+    stream.seek(len(b"header"))
+    document = reader.read_cv_bytes(stream, source="upload")
+    assert document.normalized_text == reader.read_cv_bytes(data).normalized_text
+    assert stream.tell() == len(b"header" + data)
+    assert stream.read() == b""
+
+
+def test_empty_input_is_rejected(reader):
+    with pytest.raises(ValueError):
+        reader.read_cv_bytes(io.BytesIO(b""))
@@ -0,0 +1,93 @@
+"""The dashboard's cached parse functions, with streamlit stubbed out."""
+
+import importlib
+import sys
+import types
+
+import pytest
+
+pymupdf = pytest.importorskip("pymupdf")
+
+from config import config
+from interview_prep.job_descripition.job_parser import JobDescriptionParser
+
+
+JOB_DESCRIPTION = """Senior Data Engineer
+
+About us
+We build data products for retailers.
+
+Requirements
+- 5 years of experience with Python and SQL
+- Experience with Docker and Kubernetes
+
+Responsibilities
+- Design and build data pipelines
+- Mentor the team
+"""
+
+CV_TEXT = "Experience\n- Built data pipelines in Python and SQL\n- Deployed services with Docker\nEducation\nMSc"
+
+
+def cache(function=None, **kwargs):
+    """``st.cache_data`` / ``st.cache_resource`` without caching, used bare or with options."""
+    return cache if function is None else function
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    streamlit = types.ModuleType("streamlit")
+    streamlit.cache_data = streamlit.cache_resource = cache
+    monkeypatch.setitem(sys.modules, "streamlit", streamlit)
+    monkeypatch.delitem(sys.modules, "interview_prep.dashboard.app", raising=False)
+    # the CV reader's extraction cache lives under the data directory
+    monkeypatch.setattr(config, "data_dir", tmp_path)
+    module = importlib.import_module("interview_prep.dashboard.app")
+    yield module
+    sys.modules.pop("interview_prep.dashboard.app", None)
+
+
+def cv_pdf() -> bytes:
+    with pymupdf.open() as doc:
+        doc.new_page().insert_text((72, 72), CV_TEXT)
+        return doc.tobytes()
+
+
+@pytest.mark.parametrize("extractor", [None, "spacy"])
+def test_parse_job_description_sections_once(app, monkeypatch, extractor):
+    if extractor:
+        pytest.importorskip("spacy")
+    calls = []
+    create_sections = JobDescriptionParser._create_sections
+
+    def counting(self, document):
+        calls.append(document.source)
+        return create_sections(self, document)
+
+    monkeypatch.setattr(JobDescriptionParser, "_create_sections", counting)
+    document, sections, chunks, scored_chunks = app.parse_job_description(
+        "digest", "jd.txt", 200, extractor, JOB_DESCRIPTION.encode("utf-8"))
+    assert calls == ["jd.txt"]
+
+    parser = JobDescriptionParser()
+    expected_document = parser.parse_text(JOB_DESCRIPTION, source="jd.txt")
+    assert document.normalized_text == expected_document.normalized_text
+    assert sections == create_sections(parser, expected_document)
+    assert {section["section"] for section in sections} >= {"Requirements", "Responsibilities"}
+    assert chunks == parser.chunk_description(expected_document, max_chunk_size=200)
+    assert sorted(item["chunk"].id for item in scored_chunks) == [chunk.id for chunk in chunks]
+    assert [item["score"] for item in scored_chunks] == sorted((item["score"] for item in scored_chunks),
+                                                              reverse=True)
+
+
+def test_parse_cv_and_rank_evidence(app):
+    document, sections, chunks = app.parse_cv("cv_digest", "cv.pdf", cv_pdf())
+    assert document.source == "cv.pdf" and "Docker" in document.normalized_text
+    assert sections and chunks
+    assert any("pipelines" in chunk.text for chunk in chunks)
+
+    *_, scored_chunks = app.parse_job_description("jd_digest", "jd.txt", 200, None, JOB_DESCRIPTION.encode("utf-8"))
+    evidence = app.rank_evidence("cv_digest", "jd_digest", 200, None, 3, 2, chunks, scored_chunks)
+    assert [item["jd_chunk_id"] for item in evidence] == [item["chunk"].id for item in scored_chunks[:3]]
+    assert all(len(item["evidence"]) <= 2 for item in evidence)
+    assert any(item["evidence"] for item in evidence)
@@ -0,0 +1,121 @@
+"""NearDuplicateIndex: reposts with small edits, distinct postings, the threshold edge and removal."""
+
+import random
+
+import numpy as np
+import pytest
+
+from interview_prep.job_descripition.dedup import NearDuplicateIndex, shingle_hashes
+
+
+VOCABULARY = ["python", "sql", "docker", "kubernetes", "team", "build", "data", "pipelines", "and", "with",
+              "experience", "senior", "engineer", "we", "our", "customers", "remote", "years", "cloud", "design",
+              "reliable", "services", "the", "of", "to", "in", "for", "product", "owner", "testing"]
+
+
+def posting(seed: int, words: int = 200) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def edit(text: str, seed: int, substitutions: int) -> str:
+    """A repost: a few words replaced, another case and line breaks."""
+    rng = random.Random(seed)
+    words = text.split()
+    for position in rng.sample(range(len(words)), substitutions):
+        words[position] = "edited"
+    return "\n".join(" ".join(words[i:i + 12]) for i in range(0, len(words), 12)).upper()
+
+
+def jaccard(a: str, b: str, index: NearDuplicateIndex) -> float:
+    a_set, b_set = (set(shingle_hashes(text, index.shingle_size, index.seed).tolist()) for text in (a, b))
+    return len(a_set & b_set) / len(a_set | b_set)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_repost_with_small_edits_is_found(seed):
+    index = NearDuplicateIndex(threshold=0.8)
+    original = posting(seed)
+    assert index.add("original", original) is None
+    for other in range(5):
+        assert index.add(f"other_{other}", posting(1000 + 10 * seed + other)) is None
+
+    repost = edit(original, seed, substitutions=2)
+    match = index.add("repost", repost)
+    assert match is not None and match[0] == "original"
+    assert match[1] == pytest.approx(jaccard(original, repost, index), abs=0.15)
+    assert index.duplicates == {"repost": match}
+    assert len(index) == 6
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_distinct_posting_is_not_merged(seed):
+    index = NearDuplicateIndex()
+    original = posting(seed)
+    index.add("original", original)
+
+    # the same company boilerplate around another role
+    boilerplate = " ".join(original.split()[:60])
+    assert index.add("same_company", boilerplate + " " + posting(500 + seed, words=140)) is None
+    assert index.add("heavily_edited", edit(original, seed, substitutions=40)) is None
+    assert index.add("other", posting(900 + seed)) is None
+    assert index.duplicates == {}
+    assert len(index) == 4
+
+
+def test_add_query_and_remove():
+    index = NearDuplicateIndex()
+    first, second = posting(1), posting(2)
+    assert index.add("first", first) is None
+    assert index.add("second", second) is None
+    assert index.query(index.signature(first)) == [("first", 1.0)]
+    assert index.add("first_again", first) == ("first", 1.0)
+    assert len(index) == 2
+
+    assert index.remove("first_again") and "first_again" not in index.duplicates
+    assert index.remove("first")
+    assert not index.remove("first") and not index.remove("missing")
+    assert index.query(index.signature(first)) == []
+    assert len(index) == 1
+
+    # once the canonical posting is gone, a repost of it is new
+    assert index.add("repost", edit(first, 0, substitutions=1)) is None
+    assert index.query(index.signature(second)) == [("second", 1.0)]
+    assert len(index) == 2
+
+
+def test_indexing_a_key_again_replaces_its_signature():
+    index = NearDuplicateIndex()
+    index.insert("doc", index.signature(posting(1)))
+    index.insert("doc", index.signature(posting(2)))
+    assert index.query(index.signature(posting(1))) == []
+    assert index.query(index.signature(posting(2))) == [("doc", 1.0)]
+    assert index.remove("doc") and len(index) == 0
+    assert all(not buckets for buckets in index._buckets)
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.75, 1.0])
+def test_threshold_is_inclusive(threshold):
+    index = NearDuplicateIndex(threshold=threshold, num_perm=128)
+    signature = index.signature(posting(3))
+    index.insert("doc", signature)
+
+    # change the last values of the signature only, so the first bands still make it a candidate
+    differing = round((1 - threshold) * index.num_perm)
+    at_threshold = signature.copy()
+    at_threshold[index.num_perm - differing:] += np.uint32(1)
+    assert index.query(at_threshold) == [("doc", threshold)]
+
+    below = signature.copy()
+    below[index.num_perm - differing - 1:] += np.uint32(1)
+    assert index.query(below) == []
+
+
+def test_empty_text_and_invalid_threshold():
+    index = NearDuplicateIndex()
+    assert index.add("empty", "") is None
+    assert index.add("blank", " \n ") == ("empty", 1.0)
+    assert index.add("text", posting(4)) is None
+    for threshold in (0, 1.5):
+        with pytest.raises(ValueError, match="threshold"):
+            NearDuplicateIndex(threshold=threshold)
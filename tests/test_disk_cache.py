@@ -0,0 +1,113 @@
+"""The on-disk caches: round trips, eviction and sharing between instances."""
+
+import json
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from interview_prep.CV.text_cache import ExtractionCache
+from interview_prep.embeddings.embedder import ChunkEmbedder
+from interview_prep.embeddings.embedding_cache import EmbeddingCache, embedding_key
+from interview_prep.generation.response_cache import ResponseCache, response_key
+
+
+class CountingModel:
+    """Stand-in for a sentence-transformers model, encoding a text as its character counts."""
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts, **kwargs):
+        self.encoded += len(texts)
+        return np.array([[len(text), text.count("a"), text.count(" ")] for text in texts], dtype=np.float32)
+
+
+def age(paths, seconds):
+    for path in paths:
+        stat = path.stat()
+        os.utime(path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+
+def test_extraction_cache_round_trip(tmp_path):
+    cache = ExtractionCache(tmp_path)
+    key = cache.key(b"%PDF")
+    assert cache.get(key) is None
+    cache.put(key, "raw", "normalized", [0, 3])
+    assert cache.get(key) == {"raw_text": "raw", "normalized_text": "normalized", "page_offsets": [0, 3]}
+    assert ExtractionCache(tmp_path).get(key) == cache.get(key)
+    (tmp_path / f"{key}.json").write_text("{")
+    assert cache.get(key) is None
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    keys = [response_key("model", f"prompt {i}") for i in range(8)]
+    response = {"questions": ["x" * 150]}
+    cache = ResponseCache(tmp_path, max_bytes=7 * len(json.dumps({"response": response})) + 10)
+    for key in keys[:5]:
+        cache.put(key, response)
+    age(cache._entries(), 100)
+    assert cache.get(keys[0]) == response
+    for key in keys[5:]:
+        cache.put(key, response)
+
+    # the cap holds 7 entries, eviction brings it under 90% of it: 6 are left,
+    # the oldest ones are evicted, but not the one read since
+    assert len(cache._entries()) == 6
+    assert cache.get(keys[1]) is None and cache.get(keys[2]) is None
+    assert all(cache.get(key) == response for key in [keys[0]] + keys[3:])
+    cache.clear()
+    assert cache._entries() == []
+
+
+def test_embedding_cache_packs_and_shares_vectors(tmp_path):
+    cache = EmbeddingCache(tmp_path)
+    keys = [embedding_key("model", str(i)) for i in range(20)]
+    vectors = np.arange(60, dtype=np.float32).reshape(20, 3)
+    cache.put_many(keys[:12], vectors[:12])
+    cache.put_many(keys[12:], vectors[12:])
+    assert len(cache._entries()) == 2
+
+    # a fresh instance, e.g. in another process, indexes the packs of the first one
+    other = pickle.loads(pickle.dumps(cache))
+    assert not other._memory
+    found = other.get_many(keys + ["missing"])
+    assert list(found) == keys
+    np.testing.assert_array_equal(np.stack([found[key] for key in keys]), vectors)
+
+    cache.put("late", np.ones(3, dtype=np.float32))
+    np.testing.assert_array_equal(other.get("late"), np.ones(3))
+    for pack in cache._entries():
+        pack.unlink()
+    other._memory.clear()
+    assert other.get(keys[0]) is None and other._packs.get(keys[0]) is None
+
+
+def test_embedding_cache_memory_tier(tmp_path):
+    cache = EmbeddingCache(tmp_path, max_entries=2, use_disk=False)
+    for i in range(3):
+        cache.put(str(i), np.full(3, i, dtype=np.float32))
+    assert list(cache._memory) == ["1", "2"] and cache.get("0") is None
+    assert not tmp_path.exists() or cache._entries() == []
+
+
+def test_embedder_encodes_only_missing_texts(tmp_path):
+    model = CountingModel()
+    embedder = ChunkEmbedder(batch_size=4, cache=EmbeddingCache(tmp_path), model=model)
+    texts = [f"text {i} {'a' * i}" for i in range(10)]
+    first = embedder.embed_texts(texts + texts[:3])
+    assert model.encoded == 10
+    assert len(embedder.cache._entries()) == 3
+
+    embedder = ChunkEmbedder(batch_size=4, cache=EmbeddingCache(tmp_path), model=model)
+    np.testing.assert_array_equal(embedder.embed_texts(texts + ["new"] + texts[:3]),
+                                  np.insert(first, 10, model.encode(["new"])[0], axis=0))
+    assert model.encoded == 12
+
+
+@pytest.mark.parametrize("cache_class", [ExtractionCache, ResponseCache, EmbeddingCache])
+def test_pickled_cache_rescans_size(tmp_path, cache_class):
+    cache = cache_class(tmp_path)
+    cache._size = 123
+    assert pickle.loads(pickle.dumps(cache))._size is None
@@ -0,0 +1,41 @@
+"""HeaderIndex lookups: decoration, typos and list items."""
+
+import pytest
+
+from interview_prep.CV.chunker import CVChunker
+from interview_prep.schemas.cv_schema import Document
+from interview_prep.utils.header_index import HeaderIndex
+
+
+@pytest.fixture(scope="module")
+def index():
+    return HeaderIndex(["Skills", "Education", "Work Experience", "Projects"])
+
+
+@pytest.mark.parametrize("line, header", [
+    ("Skills", "Skills"),
+    ("WORK EXPERIENCE:", "Work Experience"),
+    ("— Skills —", "Skills"),
+    ("# Projects", "Projects"),
+    ("**Education**", "Education"),
+    ("Educaton", "Education"),
+    ("Work  Experiance", "Work Experience"),
+    ("• Skills", None),
+    ("- Education", None),
+    ("* Projects", None),
+    ("  – Skills", None),
+    ("educaton", None),
+    ("Skills in python and docker", None),
+])
+def test_lookup(index, line, header):
+    assert index.lookup(line) == header
+
+
+def test_bullet_lines_do_not_start_sections():
+    text = "Jane Doe\nSkills\n• Python\n• Teamwork\nEducation\n• Skills\nMSc Computer Science"
+    sections = CVChunker()._retrieve_sections(Document(category="CV", raw_text=text, normalized_text=text, source="cv"))
+    assert [(section["section"], section["content"]) for section in sections] == [
+        ("Introduction", ["Jane Doe"]),
+        ("Skills", ["• Python", "• Teamwork"]),
+        ("Education", ["• Skills", "MSc Computer Science"]),
+    ]
@@ -0,0 +1,33 @@
+"""The CLI and the parsers import none of the heavy backends."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+HEAVY_MODULES = ["pymupdf", "spacy", "transformers", "sentence_transformers", "torch", "scipy", "numpy",
+                 "fastapi", "streamlit"]
+
+
+def loaded_heavy_modules(code: str) -> list:
+    """Heavy modules in ``sys.modules`` after running ``code`` in a fresh interpreter."""
+    script = f"{code}\nimport json, sys\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)})
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("code", [
+    "import interview_prep",
+    "import interview_prep.CV",
+    "from interview_prep.CV.chunker import CVChunker",
+    "from interview_prep.CV.cv_reader import CVReader",
+    "from interview_prep.job_descripition.job_parser import JobDescriptionParser",
+    "import sys; sys.argv = ['interview-prep', '--help']\n"
+    "from interview_prep import main\ntry:\n    main()\nexcept SystemExit:\n    pass",
+])
+def test_no_heavy_module_is_imported(code):
+    assert loaded_heavy_modules(code) == []
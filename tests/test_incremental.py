@@ -0,0 +1,154 @@
+"""IncrementalChunker against full re-chunking, after random edits of CVs and job descriptions."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from constants import CV_SECTION_HEADERS, JOB_DESCRIPTION_SECTION_HEADERS
+from interview_prep.incremental import CV, JOB_DESCRIPTION, IncrementalChunker, watch
+from interview_prep.pipeline import cv_record, job_description_record
+from interview_prep.schemas.cv_schema import Document
+from interview_prep.utils.text_tools import normalize_text
+
+
+WORDS = ("python docker kubernetes team built led data pipeline sql aws design system service users "
+         "machine learning api tests reliability cloud analytics product growth senior engineer").split()
+EDIT_LINES = ["• New bullet about python and docker.", "continued text that ends.", "Short line",
+              "Key: value here", "x " * 20]
+
+
+def sentence(rng: random.Random, low: int = 6, high: int = 20) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize() + "."
+
+
+def cv_text(rng: random.Random) -> str:
+    lines = ["Jane Doe", "Munich, Germany | jane@example.com"]
+    for header in rng.sample(CV_SECTION_HEADERS, rng.randint(1, 5)):
+        lines.append(header)
+        for _ in range(rng.randint(1, 3)):
+            lines += ["Example Company", "Munich, Germany", "Jan 2020 - Present"]
+            lines += [f"• {sentence(rng)}" for _ in range(rng.randint(1, 3))]
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def job_description_text(rng: random.Random) -> str:
+    lines = []
+    for header in rng.sample(JOB_DESCRIPTION_SECTION_HEADERS, rng.randint(1, 6)):
+        lines.append(header)
+        lines += [" ".join(sentence(rng) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 4))]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def edit(lines: list, rng: random.Random, headers: list) -> list:
+    """One to three random line deletions, insertions (headers, blank lines, text) or changes."""
+    lines = list(lines)
+    for _ in range(rng.randint(1, 3)):
+        operation = rng.random()
+        i = rng.randrange(len(lines) + 1)
+        if operation < 0.25 and lines:
+            del lines[min(i, len(lines) - 1)]
+        elif operation < 0.45:
+            lines.insert(i, rng.choice(headers))
+        elif operation < 0.6:
+            lines.insert(i, "")
+        elif operation < 0.75:
+            lines.insert(i, rng.choice(EDIT_LINES))
+        elif lines:
+            j = min(i, len(lines) - 1)
+            lines[j] += " edited"
+    return lines
+
+
+def without(chunks: list, key: str) -> list:
+    return [{name: value for name, value in chunk.items() if name != key} for chunk in chunks]
+
+
+def content(chunk: dict) -> tuple:
+    return chunk["section"], chunk["chunk_type"], chunk["text"]
+
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("kind", [CV, JOB_DESCRIPTION])
+def test_random_edits_match_full_chunking_with_stable_ids(tmp_path, kind, seed):
+    rng = random.Random(seed)
+    chunker = IncrementalChunker(state_dir=tmp_path)
+    id_key = "chunk_id" if kind == CV else "id"
+    text = normalize_text(cv_text(rng) if kind == CV else job_description_text(rng))
+    lines = text.split("\n")
+
+    previous = chunker.update(Document(category="test", raw_text="", normalized_text=text, source="doc"), kind)
+    issued = {chunk[id_key] for chunk in previous["chunks"]}
+    for _ in range(5):
+        lines = edit(lines, rng, CV_SECTION_HEADERS if kind == CV else JOB_DESCRIPTION_SECTION_HEADERS)
+        document = Document(category="test", raw_text="", normalized_text="\n".join(lines), source="doc")
+        record = chunker.update(document, kind)
+
+        # (a) the chunks of a full run, but for their ids
+        if kind == CV:
+            full = cv_record(document)
+            assert [(s["section"], s["content"], s["lines"]) for s in record["sections"]] == \
+                [(s["section"], s["content"], s["lines"]) for s in full["sections"]]
+        else:
+            full = job_description_record(document, max_chunk_size=500)
+            assert sorted(item["score"] for item in record["scored_chunks"]) == \
+                sorted(item["score"] for item in full["scored_chunks"])
+        assert without(record["chunks"], id_key) == without(full["chunks"], id_key)
+
+        # (b) an id names the same content across versions, unique unchanged chunks keep theirs,
+        # new ids were never used, and the changed and removed ids are exactly the difference
+        old = {chunk[id_key]: chunk for chunk in previous["chunks"]}
+        ids = [chunk[id_key] for chunk in record["chunks"]]
+        assert record["changed_chunk_ids"] == [chunk_id for chunk_id in ids if chunk_id not in old]
+        assert record["removed_chunk_ids"] == sorted(set(old) - set(ids))
+        assert not issued & set(record["changed_chunk_ids"])
+        old_counts = Counter(content(chunk) for chunk in previous["chunks"])
+        new_counts = Counter(content(chunk) for chunk in record["chunks"])
+        old_ids = {content(chunk): chunk[id_key] for chunk in previous["chunks"]}
+        for chunk in record["chunks"]:
+            if chunk[id_key] in old:
+                assert content(old[chunk[id_key]]) == content(chunk)
+            elif old_counts[content(chunk)] == 1 and new_counts[content(chunk)] == 1:
+                pytest.fail(f"Unchanged chunk {old_ids[content(chunk)]} got the new id {chunk[id_key]}")
+
+        issued.update(ids)
+        previous = record
+
+
+def test_unchanged_document_reports_no_change(tmp_path):
+    chunker = IncrementalChunker(state_dir=tmp_path)
+    text = normalize_text(job_description_text(random.Random(0)))
+    document = Document(category="test", raw_text="", normalized_text=text, source="doc")
+    first = chunker.update(document, JOB_DESCRIPTION)
+    again = IncrementalChunker(state_dir=tmp_path).update(document, JOB_DESCRIPTION)
+    assert first["changed_chunk_ids"] == [chunk["id"] for chunk in first["chunks"]]
+    assert (again["changed_chunk_ids"], again["removed_chunk_ids"]) == ([], [])
+    assert again["chunks"] == first["chunks"]
+
+
+def test_watch_retries_failed_files_until_they_succeed(tmp_path):
+    good, flaky = tmp_path / "good.txt", tmp_path / "flaky.txt"
+    good.write_text("a")
+    flaky.write_text("b")
+    failures = {str(flaky): 2}
+    removed, polls = [], []
+
+    def process(path):
+        if failures.get(path, 0):
+            failures[path] -= 1
+            raise OSError("not ready")
+        return {"source": path}
+
+    def list_files():
+        if len(polls) == 4:
+            flaky.unlink()
+        polls.append(None)
+        return [str(path) for path in (good, flaky)]
+
+    events = [(path, record is not None) for path, record, _ in
+              watch(list_files, process, interval=0, on_removed=removed.append, max_polls=5)]
+    # the unchanged good file is processed once, the flaky one until it succeeds
+    assert events == [(str(good), True), (str(flaky), False), (str(flaky), False), (str(flaky), True)]
+    assert removed == [str(flaky)]
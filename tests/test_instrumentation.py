@@ -0,0 +1,51 @@
+"""InMemorySink aggregation and its thread safety."""
+
+import threading
+
+from interview_prep.utils import instrumentation
+from interview_prep.utils.instrumentation import InMemorySink, increment, set_sink, stage
+
+
+def test_stages_and_counters_are_aggregated():
+    sink = InMemorySink()
+    set_sink(sink)
+    try:
+        for _ in range(3):
+            with stage("parse"):
+                increment("documents")
+        increment("documents", 2)
+    finally:
+        set_sink(instrumentation.StatsSink())
+
+    summary = sink.summary()
+    assert summary["counters"] == {"documents": 5}
+    assert summary["stages"]["parse"]["calls"] == 3
+    assert sum(summary["stages"]["parse"]["histogram"].values()) == 3
+
+
+def test_reset_and_summary_while_threads_record():
+    sink = InMemorySink()
+    lock = sink._lock
+    stop = threading.Event()
+
+    def record():
+        while not stop.is_set():
+            sink.record_timing(f"stage{threading.get_ident() % 3}", 0.001, 0.001)
+            sink.increment("events")
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(200):
+            for stats in sink.summary()["stages"].values():
+                assert stats["calls"] == sum(stats["histogram"].values())
+            sink.reset()
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    assert sink._lock is lock
+    sink.reset()
+    assert sink.summary() == {"stages": {}, "counters": {}}
@@ -0,0 +1,66 @@
+"""Both KeywordMatcher strategies against a per-keyword substring search."""
+
+import random
+
+import pytest
+
+from interview_prep.job_descripition.job_parser import KEYWORD_CATEGORIES, KEYWORD_WEIGHTS
+from interview_prep.utils.keyword_matcher import KeywordMatcher
+
+
+VOCABULARIES = {**KEYWORD_CATEGORIES, "extra": ["java", "JavaScript", "script", "c++", "c", "ava", "java"]}
+
+
+def reference_scan(vocabularies: dict, text: str) -> dict:
+    """Start positions of every (overlapping) keyword occurrence, one search per keyword."""
+    text = text.lower()
+    hits = {}
+    for category, keywords in vocabularies.items():
+        hits[category] = {}
+        for keyword in dict.fromkeys(keyword.lower() for keyword in keywords):
+            positions = [i for i in range(len(text)) if keyword and text.startswith(keyword, i)]
+            if positions:
+                hits[category][keyword] = positions
+    return hits
+
+
+def reference_score(vocabularies: dict, weights: dict, text: str) -> int:
+    """The original loop: a weight per listed keyword contained in the text."""
+    text = text.lower()
+    return sum(weights.get(category, 0) for category, keywords in vocabularies.items()
+               for keyword in keywords if keyword.lower() in text)
+
+
+def random_texts(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    words = [keyword for keywords in VOCABULARIES.values() for keyword in keywords]
+    words += ["the", "team", "builds", "JAVA", "Javascripting", "c++17", "(", ")", "\n", ",", "-"]
+    return ["".join(rng.choice(words) + rng.choice(["", " ", " ", "-"]) for _ in range(rng.randint(0, 40)))
+            for _ in range(count)]
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["substrings", "automaton"])
+def matcher(request):
+    return KeywordMatcher(VOCABULARIES, use_automaton=request.param)
+
+
+def test_default_strategy_follows_vocabulary_size():
+    assert not KeywordMatcher(KEYWORD_CATEGORIES).use_automaton
+    assert KeywordMatcher({"skill": [f"skill{i}" for i in range(200)]}).use_automaton
+
+
+@pytest.mark.parametrize("text", random_texts(300))
+def test_scan_and_score_match_reference(matcher, text):
+    hits = matcher.scan(text)
+    expected = reference_scan(VOCABULARIES, text)
+    assert {category: dict(sorted(found.items())) for category, found in hits.items()} == \
+        {category: dict(sorted(found.items())) for category, found in expected.items()}
+    assert matcher.score(text, KEYWORD_WEIGHTS)[0] == reference_score(VOCABULARIES, KEYWORD_WEIGHTS, text)
+
+
+def test_strategies_report_hits_in_the_same_order():
+    substrings = KeywordMatcher(VOCABULARIES, use_automaton=False)
+    automaton = KeywordMatcher(VOCABULARIES, use_automaton=True)
+    for text in random_texts(100, seed=1):
+        assert [list(found.items()) for found in substrings.scan(text).values()] == \
+            [list(found.items()) for found in automaton.scan(text).values()]
@@ -0,0 +1,98 @@
+"""JobDescriptionParser.process_many against processing the documents one by one."""
+
+import itertools
+import random
+import time
+
+import pytest
+
+from interview_prep.job_descripition.dedup import NearDuplicateIndex
+from interview_prep.job_descripition.job_parser import JobDescriptionParser
+from interview_prep.schemas.cv_schema import Document
+from interview_prep.utils.text_tools import normalize_text
+
+
+WORDS = "python sql docker team build data pipelines cloud aws testing design lead mentor product".split()
+
+
+def job_description(rng: random.Random, source: str) -> Document:
+    lines = []
+    for header in rng.sample(["Requirements", "Responsibilities", "About us", "Benefits"], 3):
+        lines.append(header)
+        lines += [" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))) + "." for _ in range(2)]
+    text = "\n".join(lines)
+    return Document(category="Job Description", raw_text=text, normalized_text=normalize_text(text), source=source)
+
+
+def key(chunks, scored_chunks):
+    return [chunk.model_dump() for chunk in chunks], [(item["chunk"].id, item["score"]) for item in scored_chunks]
+
+
+def test_results_in_input_order_like_sequential_processing():
+    rng = random.Random(0)
+    documents = [job_description(rng, f"jd_{i}") for i in range(60)]
+    parser = JobDescriptionParser()
+    results = list(parser.process_many(documents, workers=4, max_in_flight=3))
+    assert [document.source for document, *_ in results] == [document.source for document in documents]
+    for document, chunks, scored_chunks in results:
+        assert key(chunks, scored_chunks) == key(*parser.process(document))
+
+
+def test_input_is_read_lazily():
+    rng = random.Random(1)
+    pulled = []
+
+    def documents():
+        for i in itertools.count():
+            pulled.append(i)
+            yield job_description(rng, f"jd_{i}")
+
+    results = JobDescriptionParser().process_many(documents(), workers=2, max_in_flight=4)
+    for consumed, _ in enumerate(itertools.islice(results, 10), start=1):
+        # the window, plus one document read ahead when a result is taken out of it
+        assert len(pulled) <= consumed + 4
+
+
+def test_duplicates_reuse_the_canonical_results():
+    rng = random.Random(2)
+    originals = [job_description(rng, f"jd_{i}") for i in range(5)]
+    copies = [document.model_copy(update={"source": f"copy_{document.source}"}) for document in originals]
+    index = NearDuplicateIndex()
+    results = list(JobDescriptionParser().process_many(originals + copies, workers=3, deduplicate=index,
+                                                       max_in_flight=2))
+    by_source = {document.source: (chunks, scored_chunks) for document, chunks, scored_chunks in results}
+    for document in originals:
+        assert by_source[f"copy_{document.source}"][0] is by_source[document.source][0]
+        assert index.duplicates[f"copy_{document.source}"][0] == document.source
+
+
+def test_error_is_raised_in_place_of_its_document(tmp_path):
+    rng = random.Random(3)
+    documents = [job_description(rng, f"jd_{i}") for i in range(8)]
+    documents[3] = str(tmp_path / "missing.txt")
+    sources = []
+    with pytest.raises(FileNotFoundError):
+        for document, _, _ in JobDescriptionParser().process_many(documents, workers=2, max_in_flight=3):
+            sources.append(document.source)
+    assert sources == ["jd_0", "jd_1", "jd_2"]
+
+
+def test_error_cancels_the_documents_not_started():
+    rng = random.Random(4)
+    documents = [job_description(rng, f"jd_{i}") for i in range(10)]
+    parser = JobDescriptionParser()
+    processed = []
+
+    def process(document, **kwargs):
+        processed.append(document.source)
+        if document.source == "jd_1":
+            raise RuntimeError("bug in the parser")
+        time.sleep(0.05)
+        return [], []
+
+    parser.process = process
+    results = parser.process_many(documents, workers=1, max_in_flight=5)
+    with pytest.raises(RuntimeError):
+        list(results)
+    # jd_1 failed while jd_2 may have been running, the rest of the window never started
+    assert processed in (["jd_0", "jd_1"], ["jd_0", "jd_1", "jd_2"])
@@ -0,0 +1,46 @@
+"""SkillExtractor token matching and its use by the pipeline."""
+
+import pytest
+
+pytest.importorskip("spacy")
+
+from interview_prep.pipeline import job_description_record, skill_extractor
+from interview_prep.schemas.cv_schema import Document
+from interview_prep.utils.skill_extractor import SkillExtractor
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return SkillExtractor({"skill": ["c++", "c#", "java", "node.js", ".net", "git", "ci/cd"], "soft": ["Java"]})
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("c++17 and java", {"c++": [0], "java": [10]}),
+    ("(C++) developer", {"c++": [1]}),
+    ("C++/Java, c#8", {"c++": [0], "java": [4], "c#": [10]}),
+    ("java/c++ and c# daily", {"java": [0], "c++": [5], "c#": [13]}),
+    ("C#/.NET and Node.js, CI/CD", {"c#": [0], ".net": [3], "node.js": [12], "ci/cd": [21]}),
+    ("digital javascript", {}),
+])
+def test_keywords_match_whole_tokens(extractor, text, expected):
+    hits = extractor.extract([text])[0]
+    assert hits["skill"] == expected
+    assert hits["soft"] == ({"java": expected["java"]} if "java" in expected else {})
+
+
+def test_scores_count_repeated_entries(extractor):
+    [(score, hits)] = extractor.score_texts(["Java and git, java again"], {"skill": 2, "soft": 1})
+    assert hits["skill"] == {"java": [0, 14], "git": [9]}
+    assert score == 2 * 2 + 1
+
+
+def test_pipeline_scores_with_the_extractor():
+    text = "Requirements\nYou know javascript and digital tools, C++17 and git.\n"
+    document = Document(category="Job Description", raw_text=text, normalized_text=text, source="jd")
+    substring = job_description_record(document)["scored_chunks"]
+    tokens = job_description_record(document, skills="spacy")["scored_chunks"]
+    found = {keyword for found in tokens[0]["hits"].values() for keyword in found}
+    assert {"c++", "git"} <= found and "java" not in found
+    assert "java" in {keyword for found in substring[0]["hits"].values() for keyword in found}
+    with pytest.raises(ValueError):
+        skill_extractor("regex")
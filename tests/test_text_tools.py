@@ -0,0 +1,68 @@
+"""Equivalence of the precompiled TextNormalizer with the original normalize_text chain."""
+
+import random
+import re
+import unicodedata
+
+import pytest
+
+from interview_prep.utils.text_tools import TextNormalizer, get_normalizer, normalize_text
+
+
+FUZZ_ALPHABET = (list("abcdefghijklmnopqrstuvwxyzABCDEZ0123456789 ")
+                 + ["'", "-", ",", "\n", "\n", "\r", "\t", "\x0c", " ", "\x85", "  "]
+                 + list("éèàüñçÉ´¨ß") + ["́", "̈", "ﬁ", "²", "Ⅻ"]
+                 + ["can't", "won't", "n't", "'s", "'ll", "'ve", "-\n", ",\n", "\n\n\n"])
+
+
+def reference_normalize_text(text: str) -> str:
+    """The original normalize_text: a chain of full passes."""
+    contractions = {"can't": "cannot", "won't": "will not", "n't": " not", "'re": " are", "'s": " is",
+                    "'d": " would", "'ll": " will", "'t": " not", "'ve": " have", "'m": " am"}
+    contractions_re = re.compile('(%s)' % '|'.join(contractions.keys()))
+    text = contractions_re.sub(lambda match: contractions[match.group(0)], text)
+
+    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+    text = re.sub(r"(\w),\n(\w)", r"\1, \2", text)
+
+    text = re.sub(r'´', '', text)
+    text = re.sub(r'¨', '', text)
+    nfkd_form = unicodedata.normalize('NFKD', text)
+    text = ''.join([c for c in nfkd_form if not unicodedata.combining(c)])
+
+    text = "\n".join(line.rstrip() for line in text.splitlines())
+    return re.sub(r'\n{3,}', '\n\n', text)
+
+
+@pytest.fixture(scope="module")
+def normalizer():
+    return TextNormalizer()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("a neural network optimisation tech-\nnique", "a neural network optimisation technique"),
+    ("Python,\nSQL", "Python, SQL"),
+    ("end -\nstart", "end -\nstart"),
+    ("I've led it and didn't stop, it's great", "I have led it and did not stop, it is great"),
+    ("can't won't", "cannot will not"),
+    ("Schlüsselbergstrasse, München", "Schlusselbergstrasse, Munchen"),
+    ("S´anchez Schl¨usselberg", "Sanchez Schlusselberg"),
+    ("école ﬁnance", "ecole finance"),
+    ("Education   \n\n\n\n\nExperience\t", "Education\n\nExperience"),
+    ("", ""),
+])
+def test_edge_cases(normalizer, text, expected):
+    assert normalizer(text) == expected
+    assert reference_normalize_text(text) == expected
+
+
+def test_matches_reference_on_fuzz_inputs(normalizer):
+    rng = random.Random(0)
+    for _ in range(3000):
+        text = "".join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 200)))
+        assert normalizer(text) == reference_normalize_text(text), repr(text)
+
+
+def test_normalize_text_uses_the_shared_normalizer():
+    assert get_normalizer() is get_normalizer()
+    assert normalize_text("tech-\nnique") == "technique"
@@ -0,0 +1,101 @@
+"""TokenBudgetPacker with a stub tokenizer: chunk budgets and round trips."""
+
+import random
+import re
+
+import pytest
+
+from interview_prep.job_descripition.token_packer import TokenBudgetPacker
+from interview_prep.utils.text_tools import normalize_chunk_text
+
+
+class StubTokenizer:
+    """Fast tokenizer stand-in: words in pieces of up to 4 characters, punctuation, and a space after a comma.
+
+    A space after a comma is a token but a newline is not, so normalizing a
+    text (newlines become spaces) can add tokens, as it can with real tokenizers.
+    """
+
+    is_fast = True
+
+    def __init__(self, special_tokens: int = 2):
+        self.special_tokens = special_tokens
+        self.calls = 0
+
+    def tokenize(self, text: str) -> list:
+        return [match.span() for match in re.finditer(r"\w{1,4}|(?<=,) |[^\w\s]", text)]
+
+    def __call__(self, texts, add_special_tokens=False, return_offsets_mapping=True, **kwargs):
+        self.calls += 1
+        return {"offset_mapping": [self.tokenize(text) for text in texts]}
+
+    def num_special_tokens_to_add(self, pair=False):
+        return self.special_tokens
+
+
+WORDS = ["python,", "sql", "docker", "kubernetes", "we", "build", "data,", "pipelines", "and", "c++",
+         "e.g.", "team-work", "(remote)", "reliability", "a"]
+
+
+def random_content(rng: random.Random) -> str:
+    lines = []
+    for _ in range(rng.randint(1, 12)):
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 15))) + rng.choice(["", ","]))
+    return rng.choice(["\n", "\n\n", "\n  "]).join(lines)
+
+
+def packer(max_tokens: int, overlap: int = 0) -> TokenBudgetPacker:
+    return TokenBudgetPacker(max_tokens=max_tokens, overlap=overlap, tokenizer=StubTokenizer())
+
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("max_tokens,overlap", [(16, 0), (24, 0), (40, 5), (64, 0), (64, 12)])
+def test_every_chunk_fits_the_budget(seed, max_tokens, overlap):
+    rng = random.Random(seed)
+    title, content = rng.choice(["Requirements", "What you will do:", "Skills"]), random_content(rng)
+    packer_ = packer(max_tokens, overlap)
+    chunks = packer_.pack(title, content)
+
+    tokenizer = packer_.tokenizer
+    assert chunks
+    for chunk in chunks:
+        assert len(tokenizer.tokenize(chunk)) + tokenizer.special_tokens <= max_tokens, chunk
+        assert chunk.startswith(normalize_chunk_text(title) + " ")
+
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("max_tokens", [16, 24, 64, 1000])
+def test_packed_text_round_trips(seed, max_tokens):
+    rng = random.Random(seed)
+    title, content = "Requirements", random_content(rng)
+    chunks = packer(max_tokens).pack(title, content)
+
+    parts = [chunk[len(title) + 1:] for chunk in chunks]
+    assert " ".join(parts) == normalize_chunk_text(content)
+    if max_tokens == 1000:
+        assert len(chunks) == 1
+
+
+def test_overlapping_chunks_repeat_the_end_of_the_previous_one():
+    content = " ".join(f"w{i}" for i in range(60))
+    chunks = packer(24, overlap=6).pack("Skills", content)
+    assert len(chunks) > 2
+    for previous, chunk in zip(chunks, chunks[1:]):
+        first_word = chunk.split()[1]
+        assert first_word in previous.split()[1:]
+    assert chunks[-1].endswith("w59")
+
+
+def test_title_without_room_for_content_raises():
+    with pytest.raises(ValueError, match="leaves"):
+        packer(8).pack("A very long section title", "python and sql")
+    with pytest.raises(ValueError, match="overlap"):
+        packer(12, overlap=6).content_budget("Three word title")
+
+
+def test_emitted_texts_are_checked_in_one_batch():
+    packer_ = packer(24)
+    packer_.prepare(["Skills", "python sql\ndocker\nkubernetes data pipelines\nand more"])
+    calls = packer_.tokenizer.calls
+    packer_.pack("Skills", "python sql\ndocker\nkubernetes data pipelines\nand more")
+    assert packer_.tokenizer.calls <= calls + 2
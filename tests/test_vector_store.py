@@ -0,0 +1,150 @@
+"""VectorStore: appends, reopening, brute-force search and recovery from interrupted writes."""
+
+import numpy as np
+import pytest
+
+from interview_prep.embeddings.vector_store import METADATA_DTYPE, VectorStore
+from interview_prep.schemas.cv_schema import CVChunk, JobDescriptionChunk
+
+
+DIM = 16
+
+
+def make_chunks(count: int, offset: int = 0) -> list:
+    chunks = []
+    for i in range(count):
+        if i % 3:
+            chunks.append(CVChunk(section_id=i % 4, chunk_id=offset + i, text=f"chunk {i}",
+                                  section=f"Section {i % 4}", chunk_type="bullet", location=10 * i))
+        else:
+            chunks.append(JobDescriptionChunk(id=offset + i, text=f"chunk {i}", section=None,
+                                              chunk_type="paragraph"))
+    return chunks
+
+
+def fill(store: VectorStore, rng: np.random.Generator, sizes=(5, 40, 1, 23)) -> tuple:
+    """Add one document per size, return the vectors and the (chunk, source) of every row."""
+    vectors, rows = [], []
+    for doc, size in enumerate(sizes):
+        doc_vectors = rng.normal(size=(size, DIM)).astype(np.float32)
+        chunks = make_chunks(size, offset=100 * doc)
+        store.add(doc_vectors, chunks, source=f"doc_{doc}.pdf")
+        vectors.append(doc_vectors)
+        rows += [(chunk, f"doc_{doc}.pdf") for chunk in chunks]
+    return np.concatenate(vectors), rows
+
+
+def brute_force(vectors: np.ndarray, queries: np.ndarray, dtype: str, k: int) -> tuple:
+    stored = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    stored = stored.astype(dtype).astype(np.float32)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    scores = queries @ stored.T
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return order, np.take_along_axis(scores, order, axis=1)
+
+
+def expected_metadata(chunk, source: str) -> dict:
+    return {"chunk_id": chunk.chunk_id if isinstance(chunk, CVChunk) else chunk.id,
+            "location": getattr(chunk, "location", -1),
+            "section": chunk.section,
+            "chunk_type": chunk.chunk_type,
+            "source": source}
+
+
+@pytest.mark.parametrize("dtype", ["float16", "float32"])
+@pytest.mark.parametrize("block_size", [7, 65536])
+@pytest.mark.parametrize("k", [1, 5, 100])
+def test_search_after_reopen_matches_brute_force(tmp_path, dtype, block_size, k):
+    rng = np.random.default_rng(0)
+    vectors, rows = fill(VectorStore(tmp_path / "store", dim=DIM, dtype=dtype), rng)
+    queries = rng.normal(size=(6, DIM)).astype(np.float32)
+
+    store = VectorStore(tmp_path / "store")
+    assert len(store) == len(rows) and store.dtype == np.dtype(dtype)
+    indices, scores = store.search(queries, k=k, block_size=block_size)
+    expected_indices, expected_scores = brute_force(vectors, queries, dtype, min(k, len(rows)))
+    np.testing.assert_array_equal(indices, expected_indices)
+    np.testing.assert_allclose(scores, expected_scores, rtol=1e-5, atol=1e-5)
+    for index in indices.ravel().tolist():
+        assert store.metadata(index) == expected_metadata(*rows[index])
+
+
+def test_single_query_and_empty_store(tmp_path):
+    store = VectorStore(tmp_path / "store", dim=DIM)
+    indices, scores = store.search(np.ones(DIM), k=3)
+    assert indices.shape == scores.shape == (1, 0)
+
+    store.add(np.eye(DIM)[:3], make_chunks(3), source="doc.pdf")
+    indices, scores = store.search(np.eye(DIM)[1], k=3)
+    assert indices[0, 0] == 1 and scores[0, 0] == pytest.approx(1.0)
+
+
+def test_several_adds_append(tmp_path):
+    rng = np.random.default_rng(1)
+    store = VectorStore(tmp_path / "store", dim=DIM, dtype="float32")
+    vectors, rows = fill(store, rng)
+
+    assert len(store) == len(rows)
+    assert (tmp_path / "store" / "vectors.bin").stat().st_size == len(rows) * DIM * 4
+    assert (tmp_path / "store" / "metadata.bin").stat().st_size == len(rows) * METADATA_DTYPE.itemsize
+    np.testing.assert_allclose(store.vectors, vectors / np.linalg.norm(vectors, axis=1, keepdims=True), rtol=1e-6)
+    assert [store.metadata(i) for i in range(len(rows))] == [expected_metadata(*row) for row in rows]
+
+    reopened = VectorStore(tmp_path / "store")
+    more, more_rows = fill(reopened, rng, sizes=(4,))
+    assert len(reopened) == len(rows) + 4
+    np.testing.assert_array_equal(reopened.vectors[:len(rows)], store.vectors)
+    assert reopened.metadata(len(rows) + 3) == expected_metadata(*more_rows[3])
+
+
+def test_dimension_and_dtype_mismatch(tmp_path):
+    VectorStore(tmp_path / "store", dim=DIM, dtype="float32")
+    with pytest.raises(ValueError, match="dimension"):
+        VectorStore(tmp_path / "store", dim=DIM + 1)
+    with pytest.raises(ValueError, match="dtype"):
+        VectorStore(tmp_path / "store", dtype="float16")
+    assert VectorStore(tmp_path / "store", dim=DIM, dtype="float32").dtype == np.float32
+
+    with pytest.raises(ValueError, match="no dimension"):
+        VectorStore(tmp_path / "missing")
+    with pytest.raises(ValueError, match="Unsupported dtype"):
+        VectorStore(tmp_path / "other", dim=DIM, dtype="int8")
+
+    store = VectorStore(tmp_path / "store")
+    with pytest.raises(ValueError, match="2 vectors for 3 chunks"):
+        store.add(np.ones((2, DIM)), make_chunks(3), source="doc.pdf")
+    with pytest.raises(ValueError):
+        store.add(np.ones((3, DIM + 1)), make_chunks(3), source="doc.pdf")
+
+
+def test_recovery_after_interrupted_add(tmp_path):
+    rng = np.random.default_rng(2)
+    path = tmp_path / "store"
+    vectors, rows = fill(VectorStore(path, dim=DIM), rng)
+    queries = rng.normal(size=(3, DIM)).astype(np.float32)
+    before = VectorStore(path).search(queries, k=10)
+
+    # an add interrupted after writing its vectors, part of its metadata and strings
+    with (path / "vectors.bin").open("ab") as f:
+        f.write(np.ones((5, DIM), dtype=np.float16).tobytes())
+    with (path / "metadata.bin").open("ab") as f:
+        f.write(b"\0" * (METADATA_DTYPE.itemsize + 3))
+    with (path / "strings.jsonl").open("ab") as f:
+        f.write(b'"lost section"\n"half a str')
+
+    store = VectorStore(path)
+    assert len(store) == len(rows)
+    for got, expected in zip(store.search(queries, k=10), before):
+        np.testing.assert_array_equal(got, expected)
+
+    more, more_rows = fill(store, rng, sizes=(6,))
+    assert (path / "vectors.bin").stat().st_size == (len(rows) + 6) * DIM * 2
+    assert (path / "metadata.bin").stat().st_size == (len(rows) + 6) * METADATA_DTYPE.itemsize
+
+    reopened = VectorStore(path)
+    all_rows = rows + more_rows
+    assert len(reopened) == len(all_rows)
+    assert [reopened.metadata(i) for i in range(len(all_rows))] == [expected_metadata(*row) for row in all_rows]
+    indices, _ = reopened.search(queries, k=10)
+    expected_indices, _ = brute_force(np.concatenate([vectors, more]), queries, "float16", 10)
+    np.testing.assert_array_equal(indices, expected_indices)